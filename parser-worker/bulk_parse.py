@@ -0,0 +1,272 @@
+"""Offline bulk parsing of catalog PDFs for backfills and SKU history.
+
+    python -m parser catalogs/ "archive/2025-*.pdf" --out items.jsonl --images-dir images/
+    python -m parser catalogs/ --out items.jsonl --images-dir images/ --load-cache
+
+PDFs are split into page ranges that run on every local core. Each JSONL line is
+one parsed item, and its image is written once to
+``<images-dir>/<sha256[:2]>/<sha256>.<ext>``. ``--load-cache`` also uploads the
+images and upserts the rows into ``item_parse_cache``, so the worker reuses them
+instead of heavy-parsing those SKUs again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+from parser import (
+    DEFAULT_EXTRACTION_BACKEND,
+    EXTRACTION_BACKENDS,
+    ParsedItem,
+    parse_catalog_pdf,
+    scan_catalog_fast,
+)
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+DEFAULT_PAGES_PER_TASK = 8
+CACHE_IMAGE_PREFIX = "parse-cache"
+
+
+@dataclass
+class BulkParseReport:
+    files: int
+    pages: int
+    items: int
+    errors: int
+    elapsed_seconds: float
+    items_per_second: float
+    cached_rows: int = 0
+
+
+def expand_inputs(inputs: Iterable[str]) -> list[Path]:
+    """Resolve files, directories (searched recursively) and glob patterns to PDF paths."""
+    paths: list[Path] = []
+    for entry in inputs:
+        if any(char in entry for char in "*?["):
+            matches = [Path(match) for match in sorted(glob.glob(entry, recursive=True))]
+        elif Path(entry).is_dir():
+            matches = sorted(path for path in Path(entry).rglob("*") if path.suffix.lower() == ".pdf")
+        else:
+            matches = [Path(entry)]
+        paths.extend(path for path in matches if path.is_file())
+    return list(dict.fromkeys(path.resolve() for path in paths))
+
+
+def plan_tasks(pdf_paths: list[Path], pages_per_task: int) -> list[tuple[str, list[int]]]:
+    from pypdf import PdfReader
+
+    tasks: list[tuple[str, list[int]]] = []
+    for pdf_path in pdf_paths:
+        page_count = len(PdfReader(str(pdf_path)).pages)
+        for first in range(1, page_count + 1, pages_per_task):
+            last = min(first + pages_per_task, page_count + 1)
+            tasks.append((str(pdf_path), list(range(first, last))))
+    return tasks
+
+
+def _write_image(images_dir: Path, item: ParsedItem) -> tuple[str, str]:
+    digest = hashlib.sha256(item.image_bytes or b"").hexdigest()
+    ext = "".join(char for char in (item.image_extension or "jpg") if char.isalnum()) or "jpg"
+    relative_path = f"{digest[:2]}/{digest}.{ext}"
+    target = images_dir / relative_path
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f".{target.name}.{os.getpid()}")
+        partial.write_bytes(item.image_bytes or b"")
+        os.replace(partial, target)
+    return digest, relative_path
+
+
+def parse_pages(pdf_path: str, page_numbers: list[int], images_dir: str, backend: str) -> list[dict]:
+    """Scan and heavy-parse one page range; runs in a pool process."""
+    pages = set(page_numbers)
+    candidates = scan_catalog_fast(pdf_path, page_numbers=pages, backend=backend)
+    parsed = parse_catalog_pdf(pdf_path, page_numbers=pages, backend=backend)
+    items = {item.sku: item for item in parsed}
+
+    records: list[dict] = []
+    seen: set[str] = set()
+    for candidate in candidates:
+        if candidate.sku in seen:
+            continue
+        seen.add(candidate.sku)
+        record: dict = {
+            "source": pdf_path,
+            "page_no": candidate.page_no,
+            "sku": candidate.sku,
+            "quick_fingerprint": candidate.quick_fingerprint,
+        }
+        item = items.get(candidate.sku)
+        if item is None:
+            record["error"] = "SKU not found in heavy parse output"
+            records.append(record)
+            continue
+
+        image_sha256 = image_path = None
+        image_hash = ""
+        if item.image_bytes:
+            image_sha256, image_path = _write_image(Path(images_dir), item)
+            # Same image hash the worker puts into the item signature.
+            image_hash = image_sha256
+        record.update(
+            {
+                "name": item.name,
+                "upc": item.upc,
+                "pack": item.pack,
+                "category": item.category,
+                "parse_issues": item.parse_issues,
+                "image_hash": image_hash,
+                "image_sha256": image_sha256,
+                "image_path": image_path,
+            }
+        )
+        records.append(record)
+    return records
+
+
+def _with_signature(record: dict) -> dict:
+    from worker import _item_signature
+
+    if "error" not in record:
+        record["signature"] = _item_signature(
+            sku=record["sku"],
+            name=record["name"],
+            upc=record["upc"],
+            pack=record["pack"],
+            category=record["category"],
+            image_hash=record["image_hash"],
+        )
+    return record
+
+
+def bulk_parse(
+    inputs: Iterable[str],
+    *,
+    out: Path,
+    images_dir: Path,
+    jobs: int | None = None,
+    pages_per_task: int = DEFAULT_PAGES_PER_TASK,
+    backend: str = DEFAULT_EXTRACTION_BACKEND,
+) -> tuple[BulkParseReport, list[dict]]:
+    started = time.monotonic()
+    pdf_paths = expand_inputs(inputs)
+    tasks = plan_tasks(pdf_paths, pages_per_task)
+    images_dir.mkdir(parents=True, exist_ok=True)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    records: list[dict] = []
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(tasks) or 1))
+    with (
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool,
+        out.open("w", encoding="utf-8") as handle,
+    ):
+        results = pool.map(
+            parse_pages,
+            [pdf_path for pdf_path, _ in tasks],
+            [pages for _, pages in tasks],
+            [str(images_dir)] * len(tasks),
+            [backend] * len(tasks),
+        )
+        # map() yields in task order, so lines come out in file and page order.
+        for task_records in results:
+            for record in task_records:
+                handle.write(json.dumps(_with_signature(record), ensure_ascii=False) + "\n")
+                records.append(record)
+
+    elapsed = time.monotonic() - started
+    items = sum(1 for record in records if "error" not in record)
+    report = BulkParseReport(
+        files=len(pdf_paths),
+        pages=sum(len(pages) for _, pages in tasks),
+        items=items,
+        errors=len(records) - items,
+        elapsed_seconds=round(elapsed, 3),
+        items_per_second=round(items / elapsed, 2) if elapsed else 0.0,
+    )
+    return report, records
+
+
+def load_cache(client: Client, records: Iterable[dict], *, images_dir: Path) -> int:
+    """Upload images and upsert parsed records into item_parse_cache; returns rows sent."""
+    from worker import PARSER_PERSIST_BATCH_SIZE, _chunks, _with_retry, now_iso
+
+    rows: dict[tuple[str, str], dict] = {}
+    uploaded: dict[str, str] = {}
+    for record in records:
+        key = (record["sku"], record["quick_fingerprint"])
+        if "error" in record or key in rows:
+            continue
+        storage_path = ""
+        if record.get("image_path"):
+            storage_path = uploaded.get(record["image_sha256"], "")
+            if not storage_path:
+                storage_path = f"{CACHE_IMAGE_PREFIX}/{Path(record['image_path']).name}"
+                image_bytes = (images_dir / record["image_path"]).read_bytes()
+                _with_retry(
+                    lambda: client.storage.from_("product-images").upload(
+                        storage_path, image_bytes, {"upsert": "true"}
+                    ),
+                    description=f"Upload {storage_path}",
+                )
+                uploaded[record["image_sha256"]] = storage_path
+        rows[key] = {
+            "sku": record["sku"],
+            "quick_fingerprint": record["quick_fingerprint"],
+            "strong_fingerprint": record["signature"],
+            "name": record["name"],
+            "upc": record["upc"],
+            "pack": record["pack"],
+            "category": record["category"],
+            "image_storage_path": storage_path,
+            "updated_at": now_iso(),
+        }
+
+    for chunk in _chunks(list(rows.values()), PARSER_PERSIST_BATCH_SIZE):
+        _with_retry(
+            lambda: client.table("item_parse_cache")
+            .upsert(chunk, on_conflict="sku,quick_fingerprint")
+            .execute(),
+            description="Bulk load item_parse_cache",
+        )
+    return len(rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m parser", description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or glob patterns")
+    parser.add_argument("--out", type=Path, default=Path("parsed-items.jsonl"))
+    parser.add_argument("--images-dir", type=Path, default=Path("parsed-images"))
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--pages-per-task", type=int, default=DEFAULT_PAGES_PER_TASK)
+    parser.add_argument(
+        "--backend", choices=sorted(EXTRACTION_BACKENDS), default=DEFAULT_EXTRACTION_BACKEND
+    )
+    parser.add_argument("--load-cache", action="store_true", help="upsert results into item_parse_cache")
+    args = parser.parse_args(argv)
+
+    report, records = bulk_parse(
+        args.inputs,
+        out=args.out,
+        images_dir=args.images_dir,
+        jobs=args.jobs,
+        pages_per_task=max(1, args.pages_per_task),
+        backend=args.backend,
+    )
+    if args.load_cache:
+        from worker import get_client
+
+        report.cached_rows = load_cache(get_client(), records, images_dir=args.images_dir)
+    print(json.dumps(asdict(report), indent=2))
+    return 0
@@ -0,0 +1,116 @@
+"""Per-catalog lookup index for barcode scans and product search.
+
+Built from the same rows as the catalog snapshot and stored next to it as
+``<snapshot path without .json.gz>.index.json.gz``. Postings are positions in the
+index's own ``skus`` list, so the client does not depend on product order:
+
+``upc``
+    EAN-13 key (see ``gtin_key``) to items; a scan is one lookup.
+``sku_prefix`` / ``name_prefix``
+    Lowercase SKU and name-word prefixes of up to ``SHORT_QUERY_CHARS`` characters.
+    These answer one- and two-character queries.
+``trigrams``
+    Lowercase trigrams of name, SKU, raw UPC and UPC barcode variants. A longer
+    query is narrowed to items that have all of its trigrams, and then checked
+    with the normal match.
+
+The client mirror is ``web/src/lib/catalog/lookup-index.ts``; keep the two in step.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+LOOKUP_INDEX_SCHEMA_VERSION = 1
+SHORT_QUERY_CHARS = 2
+_NON_DIGITS = re.compile(r"\D")
+_WORDS = re.compile(r"[0-9a-z]+")
+
+
+def _check_digit(body: str) -> str:
+    # GTIN check digit: weights 3, 1, 3, ... from the rightmost body digit.
+    total = sum(int(digit) * (3 if index % 2 == 0 else 1) for index, digit in enumerate(reversed(body)))
+    return str((10 - total % 10) % 10)
+
+
+def gtin_key(value: str | None) -> str:
+    """EAN-13 form of a UPC-A, EAN-13 or GTIN-14 code, or "" when it is not one.
+
+    An 11-digit value is a UPC-A that lost its leading zero, or its check digit
+    when the zero-padded form does not check.
+    """
+    digits = _NON_DIGITS.sub("", value or "")
+    if len(digits) == 14:
+        if not digits.startswith("0"):
+            return ""
+        digits = digits[1:]
+    if len(digits) == 11:
+        padded = f"0{digits}"
+        digits = padded if _check_digit(padded[:-1]) == padded[-1] else f"{digits}{_check_digit(digits)}"
+    if len(digits) == 12:
+        return f"0{digits}"
+    return digits if len(digits) == 13 else ""
+
+
+def barcode_candidates(value: str | None) -> list[str]:
+    """Same variants as ``buildBarcodeCandidates`` in web/src/lib/barcode.ts."""
+    digits = _NON_DIGITS.sub("", (value or "").strip())
+    if not digits:
+        return []
+    candidates = [digits]
+    if len(digits) == 13 and digits.startswith("0"):
+        candidates.append(digits[1:])
+    if len(digits) == 12:
+        candidates.append(f"0{digits}")
+    return list(dict.fromkeys(candidates))
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[index : index + 3] for index in range(len(text) - 2)}
+
+
+def _prefixes(text: str) -> set[str]:
+    return {text[:length] for length in range(1, min(len(text), SHORT_QUERY_CHARS) + 1)}
+
+
+def _add(postings: dict[str, list[int]], keys: Iterable[str], position: int) -> None:
+    for key in keys:
+        entries = postings.setdefault(key, [])
+        if not entries or entries[-1] != position:
+            entries.append(position)
+
+
+def build_lookup_index(catalog_id: str, rows: Iterable[dict]) -> dict:
+    skus: list[str] = []
+    upc: dict[str, list[int]] = {}
+    sku_prefix: dict[str, list[int]] = {}
+    name_prefix: dict[str, list[int]] = {}
+    trigrams: dict[str, list[int]] = {}
+
+    for row in rows:
+        sku = row.get("sku") or ""
+        if not sku:
+            continue
+        position = len(skus)
+        skus.append(sku)
+        name = (row.get("name") or "").lower()
+        raw_upc = row.get("upc") or ""
+
+        key = gtin_key(raw_upc)
+        if key:
+            _add(upc, [key], position)
+        _add(sku_prefix, _prefixes(sku.lower()), position)
+        _add(name_prefix, {prefix for word in _WORDS.findall(name) for prefix in _prefixes(word)}, position)
+        fields = [name, sku.lower(), raw_upc.lower(), *barcode_candidates(raw_upc)]
+        _add(trigrams, set().union(*(_trigrams(field) for field in fields)), position)
+
+    return {
+        "schema_version": LOOKUP_INDEX_SCHEMA_VERSION,
+        "catalog_id": catalog_id,
+        "skus": skus,
+        "upc": upc,
+        "sku_prefix": sku_prefix,
+        "name_prefix": name_prefix,
+        "trigrams": trigrams,
+    }
@@ -0,0 +1,249 @@
+"""Parse-cache compaction and orphaned product-image cleanup.
+
+    python maintenance.py                    # dry run: report what would be deleted
+    python maintenance.py --apply --keep 3   # delete it
+
+For every SKU, cache compaction keeps the ``item_parse_cache`` rows whose
+``(sku, quick_fingerprint)`` a live catalog or an active parser job still uses.
+It also keeps the ``--keep`` most recently updated rows, and deletes the rest.
+Image cleanup lists the worker's prefixes in ``product-images``. It deletes
+objects that no catalog item or kept cache row references and that are older
+than ``--min-age-hours``. The age check spares images a running job or an admin
+upload has not recorded yet. Each run works from the current database state, so
+an interrupted run is simply run again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable, Iterable
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+DEFAULT_KEEP_FINGERPRINTS = 3
+DEFAULT_MIN_IMAGE_AGE_HOURS = 24
+IMAGE_BUCKET = "product-images"
+IMAGE_PREFIXES = ("catalog-items", "parse-cache", "sprites")
+PAGE_SIZE = 1000
+LIST_PAGE_SIZE = 1000
+DELETE_BATCH_SIZE = 200
+REMOVE_BATCH_SIZE = 100
+REPORT_SAMPLE_SIZE = 20
+ACTIVE_JOB_STATUSES = ["queued", "processing"]
+
+
+@dataclass
+class MaintenanceReport:
+    dry_run: bool
+    keep: int
+    cache_rows: int = 0
+    cache_skus: int = 0
+    cache_rows_in_use: int = 0
+    cache_rows_stale: int = 0
+    cache_rows_deleted: int = 0
+    images_listed: int = 0
+    images_referenced: int = 0
+    images_too_new: int = 0
+    images_orphaned: int = 0
+    images_orphaned_bytes: int = 0
+    images_deleted: int = 0
+    stale_cache_sample: list[str] = field(default_factory=list)
+    orphaned_image_sample: list[str] = field(default_factory=list)
+
+
+def _paged(fetch: Callable[[int, int], list[dict]], page_size: int = PAGE_SIZE) -> list[dict]:
+    rows: list[dict] = []
+    while True:
+        page = fetch(len(rows), len(rows) + page_size - 1)
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+
+
+def _select_all(client: Client, table: str, columns: str, **filters: list[str]) -> list[dict]:
+    def fetch(start: int, end: int) -> list[dict]:
+        query = client.table(table).select(columns)
+        for column, values in filters.items():
+            query = query.in_(column, values)
+        return query.order("id").range(start, end).execute().data or []
+
+    return _paged(fetch)
+
+
+def plan_cache_compaction(
+    cache_rows: Iterable[dict],
+    in_use: set[tuple[str, str]],
+    *,
+    keep: int,
+) -> tuple[list[dict], list[dict]]:
+    """Split cache rows into (kept, stale): in-use rows plus the newest ``keep`` per SKU stay."""
+    by_sku: dict[str, list[dict]] = {}
+    for row in cache_rows:
+        by_sku.setdefault(row["sku"], []).append(row)
+
+    kept: list[dict] = []
+    stale: list[dict] = []
+    for rows in by_sku.values():
+        rows.sort(key=lambda row: (row.get("updated_at") or "", row["quick_fingerprint"]), reverse=True)
+        for rank, row in enumerate(rows):
+            if rank < keep or (row["sku"], row["quick_fingerprint"]) in in_use:
+                kept.append(row)
+            else:
+                stale.append(row)
+    return kept, stale
+
+
+def list_objects(client: Client, bucket: str, prefix: str) -> list[dict]:
+    """Every object under ``prefix``, recursively, with its path, size and created_at."""
+    objects: list[dict] = []
+    folders = [prefix]
+    while folders:
+        folder = folders.pop()
+        entries = _paged(
+            lambda start, end: client.storage.from_(bucket).list(
+                folder,
+                {"limit": end - start + 1, "offset": start, "sortBy": {"column": "name", "order": "asc"}},
+            )
+            or [],
+            LIST_PAGE_SIZE,
+        )
+        for entry in entries:
+            path = f"{folder}/{entry['name']}"
+            if entry.get("id") is None:
+                folders.append(path)
+            else:
+                objects.append(
+                    {
+                        "path": path,
+                        "created_at": entry.get("created_at") or "",
+                        "size": int((entry.get("metadata") or {}).get("size") or 0),
+                    }
+                )
+    return objects
+
+
+def plan_image_gc(objects: Iterable[dict], referenced: set[str], *, cutoff: datetime) -> tuple[list[dict], int]:
+    """Return (orphaned objects, how many were spared only for being newer than ``cutoff``)."""
+    orphaned: list[dict] = []
+    too_new = 0
+    for entry in objects:
+        if entry["path"] in referenced:
+            continue
+        created_at = datetime.fromisoformat(entry["created_at"].replace("Z", "+00:00")) if entry["created_at"] else None
+        if created_at is None or created_at > cutoff:
+            too_new += 1
+            continue
+        orphaned.append(entry)
+    return orphaned, too_new
+
+
+def run_maintenance(
+    client: Client,
+    *,
+    keep: int = DEFAULT_KEEP_FINGERPRINTS,
+    min_age_hours: float = DEFAULT_MIN_IMAGE_AGE_HOURS,
+    apply: bool = False,
+    now: datetime | None = None,
+) -> MaintenanceReport:
+    from worker import _chunks, _with_retry, logger
+
+    report = MaintenanceReport(dry_run=not apply, keep=keep)
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(hours=min_age_hours)
+
+    live_catalogs = {row["id"] for row in _select_all(client, "catalogs", "id,deleted_at") if not row.get("deleted_at")}
+    catalog_items = _select_all(client, "catalog_items", "id,catalog_id,sku,quick_fingerprint,image_storage_path,sprite_path")
+    active_jobs = [row["id"] for row in _select_all(client, "parser_jobs", "id", status=ACTIVE_JOB_STATUSES)]
+    in_use = {
+        (row["sku"], row["quick_fingerprint"])
+        for row in catalog_items
+        if row["catalog_id"] in live_catalogs and row.get("quick_fingerprint")
+    }
+    # Items an active job has scanned may be served from the cache before they reach catalog_items.
+    for job_ids in _chunks(active_jobs, DELETE_BATCH_SIZE):
+        in_use.update(
+            (row["sku"], row["quick_fingerprint"])
+            for row in _select_all(client, "parser_job_items", "id,sku,quick_fingerprint", parser_job_id=job_ids)
+        )
+
+    cache_rows = _select_all(client, "item_parse_cache", "id,sku,quick_fingerprint,updated_at,image_storage_path")
+    kept, stale = plan_cache_compaction(cache_rows, in_use, keep=keep)
+    report.cache_rows = len(cache_rows)
+    report.cache_skus = len({row["sku"] for row in cache_rows})
+    report.cache_rows_in_use = sum(1 for row in cache_rows if (row["sku"], row["quick_fingerprint"]) in in_use)
+    report.cache_rows_stale = len(stale)
+    report.stale_cache_sample = [f"{row['sku']}:{row['quick_fingerprint']}" for row in stale[:REPORT_SAMPLE_SIZE]]
+
+    # Every catalog item (archived catalogs included) keeps its images; stale cache rows do not.
+    referenced = {
+        path
+        for row in [*catalog_items, *kept]
+        for path in (row.get("image_storage_path"), row.get("sprite_path"))
+        if path
+    }
+    objects = [entry for prefix in IMAGE_PREFIXES for entry in list_objects(client, IMAGE_BUCKET, prefix)]
+    orphaned, report.images_too_new = plan_image_gc(objects, referenced, cutoff=cutoff)
+    report.images_listed = len(objects)
+    report.images_referenced = sum(1 for entry in objects if entry["path"] in referenced)
+    report.images_orphaned = len(orphaned)
+    report.images_orphaned_bytes = sum(entry["size"] for entry in orphaned)
+    report.orphaned_image_sample = [entry["path"] for entry in orphaned[:REPORT_SAMPLE_SIZE]]
+
+    if not apply:
+        return report
+
+    for batch in _chunks(stale, DELETE_BATCH_SIZE):
+        deleted = _with_retry(
+            lambda: client.table("item_parse_cache").delete().in_("id", [row["id"] for row in batch]).execute(),
+            description="Delete stale item_parse_cache rows",
+        )
+        report.cache_rows_deleted += len(deleted.data or [])
+    for batch in _chunks(orphaned, REMOVE_BATCH_SIZE):
+        removed = _with_retry(
+            lambda: client.storage.from_(IMAGE_BUCKET).remove([entry["path"] for entry in batch]),
+            description="Remove orphaned product images",
+        )
+        report.images_deleted += len(removed or [])
+    logger.info(
+        "Maintenance deleted %s cache rows and %s images",
+        report.cache_rows_deleted,
+        report.images_deleted,
+    )
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python maintenance.py", description=__doc__.splitlines()[0])
+    parser.add_argument("--apply", action="store_true", help="delete; without it only report")
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=DEFAULT_KEEP_FINGERPRINTS,
+        help="fingerprints kept per SKU besides those in use",
+    )
+    parser.add_argument(
+        "--min-age-hours",
+        type=float,
+        default=DEFAULT_MIN_IMAGE_AGE_HOURS,
+        help="only delete unreferenced images older than this",
+    )
+    args = parser.parse_args(argv)
+
+    from worker import get_client
+
+    report = run_maintenance(
+        get_client(),
+        keep=max(0, args.keep),
+        min_age_hours=max(0.0, args.min_age_hours),
+        apply=args.apply,
+    )
+    print(json.dumps(asdict(report), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
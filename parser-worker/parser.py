@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import hashlib
+import io
 import re
-from dataclasses import dataclass
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Iterable
-
-import pdfplumber
-from pypdf import PdfReader
+from typing import Any, Callable, Iterable, Iterator
 
 PREFIX_CATEGORY_MAP: dict[str, str] = {
     "BLK": "Misc",
@@ -52,6 +53,26 @@ SKU_RE = re.compile(r"^[A-Z][A-Z0-9\-/]{2,}\d+$")
 PACK_HINT_RE = re.compile(r"(\d+\s*/\s*[\w.\- ]+)|(oz|gr|g|lb|pc)", re.I)
 STRONG_PACK_RE = re.compile(r"\d+\s*[/-]\s*[\w.\- ]+", re.I)
 
+GRID_TEMPLATE_SAMPLE_PAGES = 2
+GRID_TEMPLATE_TOLERANCE = 2.0
+LAYOUT_TEMPLATE = "template"
+LAYOUT_HEURISTIC = "heuristic"
+
+DEFAULT_EXTRACTION_BACKEND = "pdfplumber"
+# pdfplumber's extract_words defaults.
+WORD_X_TOLERANCE = 3.0
+WORD_Y_TOLERANCE = 3.0
+DEFAULT_FONT_DESCENT = -200
+DEFAULT_GLYPH_WIDTH = 500
+
+# (sku_word, mapped_image, _cell_bounds(...), words inside the cell)
+PageCell = tuple[
+    dict[str, Any],
+    dict[str, Any] | None,
+    tuple[float, float, float, float, bool],
+    list[dict[str, Any]],
+]
+
 
 @dataclass
 class ParsedItem:
@@ -63,6 +84,7 @@ class ParsedItem:
     parse_issues: list[str]
     image_bytes: bytes | None
     image_extension: str | None
+    image_digest: str | None = None
 
 
 @dataclass
@@ -73,6 +95,40 @@ class QuickCandidate:
     image_bbox: dict[str, float] | None
     lines: list[str]
     quick_fingerprint: str
+    image_digest: str | None = None
+    layout: str = LAYOUT_HEURISTIC
+    # The grid the page was cut by (``layout == LAYOUT_TEMPLATE``); hand it to
+    # ``parse_catalog_pdf`` so the heavy parse cuts the page the same way.
+    template: GridTemplate | None = field(default=None, compare=False, repr=False)
+
+
+@dataclass
+class PageContent:
+    """What the parser needs from one page: word boxes and placed image boxes, top-down coordinates."""
+
+    page_no: int
+    width: float
+    height: float
+    words: list[dict[str, Any]]
+    images: list[dict[str, Any]]
+
+
+@dataclass
+class GridTemplate:
+    """Cell grid shared by a catalog's pages, inferred from its first well-formed pages.
+
+    SKU words and product images snap to ``(column, row)`` slots by their x0/top; each
+    slot remembers where its image sits. ``cell_lefts``/``cell_tops`` are the lower
+    edges of the (non-overlapping) cell columns and rows.
+    """
+
+    sku_columns: list[float]
+    sku_rows: list[float]
+    image_columns: list[float]
+    image_rows: list[float]
+    image_boxes: dict[tuple[int, int], tuple[float, float, float, float]]
+    cell_lefts: list[float] = field(default_factory=list)
+    cell_tops: list[float] = field(default_factory=list)
 
 
 def category_from_sku(sku: str) -> str | None:
@@ -247,11 +303,20 @@ def _collect_cell_words(
     ]
 
 
-def _image_signature(mapped_image: dict[str, Any] | None) -> str:
+def _image_digest(mapped_image: dict[str, Any] | None) -> str | None:
+    """sha256 of the image XObject's raw (still encoded) stream bytes; nothing is decoded."""
+    stream = mapped_image.get("stream") if mapped_image else None
+    rawdata = stream.get_rawdata() if stream is not None else None
+    if rawdata is None:
+        return None
+    return hashlib.sha256(rawdata).hexdigest()
+
+
+def _image_signature(mapped_image: dict[str, Any] | None, image_digest: str | None = None) -> str:
     if not mapped_image:
         return "no_image"
     return (
-        f"{mapped_image.get('name','')}:"
+        f"{image_digest or mapped_image.get('name','')}:"
         f"{round(mapped_image['x0'],1)}:{round(mapped_image['x1'],1)}:"
         f"{round(mapped_image['top'],1)}:{round(mapped_image['bottom'],1)}"
     )
@@ -267,129 +332,583 @@ def _quick_fingerprint(
     return _sha256(payload)
 
 
-def scan_catalog_fast(pdf_path: str | Path) -> list[QuickCandidate]:
+class _OpenDocument:
+    """One PDF read into memory, with its pdfplumber and pypdf documents opened on first use."""
+
+    def __init__(self, key: tuple[str, int, int], data: bytes) -> None:
+        self.key = key
+        self._data = data
+        self._plumber: Any = None
+        self._reader: Any = None
+
+    def plumber(self) -> Any:
+        if self._plumber is None:
+            import pdfplumber
+
+            self._plumber = pdfplumber.open(io.BytesIO(self._data))
+        return self._plumber
+
+    def reader(self) -> Any:
+        if self._reader is None:
+            from pypdf import PdfReader
+
+            self._reader = PdfReader(io.BytesIO(self._data))
+        return self._reader
+
+    def close(self) -> None:
+        if self._plumber is not None:
+            self._plumber.close()
+        self._plumber = self._reader = None
+
+
+_open_documents = threading.local()
+
+
+def _open_document(pdf_path: Path) -> _OpenDocument:
+    """``pdf_path`` opened once per thread, so a job's per-page parses share one document.
+
+    The file is read into memory, so no handle stays open on it. The document is kept
+    until the thread opens another PDF.
+    """
+    stat = pdf_path.stat()
+    key = (str(pdf_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    document: _OpenDocument | None = getattr(_open_documents, "document", None)
+    if document is not None and document.key == key:
+        return document
+    if document is not None:
+        document.close()
+    document = _open_documents.document = _OpenDocument(key, pdf_path.read_bytes())
+    return document
+
+
+def _page_indexes(page_count: int, page_numbers: set[int] | None) -> Iterable[int]:
+    if page_numbers is None:
+        return range(page_count)
+    return [page_no - 1 for page_no in sorted(page_numbers) if 1 <= page_no <= page_count]
+
+
+def _pdfplumber_pages(pdf_path: Path, page_numbers: set[int] | None = None) -> Iterator[PageContent]:
+    pages = _open_document(pdf_path).plumber().pages
+    for page_index in _page_indexes(len(pages), page_numbers):
+        page = pages[page_index]
+        content = PageContent(
+            page_no=page_index + 1,
+            width=page.width,
+            height=page.height,
+            words=page.extract_words() or [],
+            images=page.images,
+        )
+        # Drop the page's layout cache; the document stays open for the next page.
+        page.close()
+        yield content
+
+
+class _RawStream:
+    """Stands in for a pdfminer stream so _image_digest can hash pypdf XObjects too."""
+
+    def __init__(self, rawdata: bytes | None) -> None:
+        self._rawdata = rawdata
+
+    def get_rawdata(self) -> bytes | None:
+        return self._rawdata
+
+
+def _matrix_multiply(m: list[float], n: list[float]) -> list[float]:
+    return [
+        m[0] * n[0] + m[1] * n[2],
+        m[0] * n[1] + m[1] * n[3],
+        m[2] * n[0] + m[3] * n[2],
+        m[2] * n[1] + m[3] * n[3],
+        m[4] * n[0] + m[5] * n[2] + n[4],
+        m[4] * n[1] + m[5] * n[3] + n[5],
+    ]
+
+
+class _FontMetrics:
+    def __init__(self, font_dict: Any) -> None:
+        # Standard 14 AFM metrics; pdfminer ships them as plain data with pdfplumber.
+        from pdfminer.fontmetrics import FONT_METRICS
+
+        font_dict = font_dict or {}
+        base_font = str(font_dict.get("/BaseFont", "")).lstrip("/").split("+")[-1]
+        standard_descriptor, self._standard_widths = FONT_METRICS.get(base_font, ({}, {}))
+        self._widths = [float(width) for width in font_dict.get("/Widths", []) or []]
+        self._first_char = int(font_dict.get("/FirstChar", 0) or 0)
+        descriptor = font_dict.get("/FontDescriptor")
+        descriptor = descriptor.get_object() if descriptor is not None else {}
+        self.descent = float(
+            descriptor.get("/Descent", standard_descriptor.get("Descent", DEFAULT_FONT_DESCENT))
+        )
+
+    def width(self, char: str) -> float:
+        index = ord(char) - self._first_char
+        if 0 <= index < len(self._widths):
+            return self._widths[index]
+        return float(self._standard_widths.get(char, DEFAULT_GLYPH_WIDTH))
+
+
+def _group_words(chars: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    words: list[dict[str, Any]] = []
+    current: dict[str, Any] | None = None
+    for char in chars:
+        if char["text"].isspace():
+            current = None
+            continue
+        if (
+            current is not None
+            and abs(char["top"] - current["top"]) <= WORD_Y_TOLERANCE
+            and current["x1"] - WORD_X_TOLERANCE <= char["x0"] <= current["x1"] + WORD_X_TOLERANCE
+        ):
+            current["text"] += char["text"]
+            current["x1"] = char["x1"]
+            current["bottom"] = max(current["bottom"], char["bottom"])
+            continue
+        current = dict(char)
+        words.append(current)
+    return words
+
+
+def _pypdf_pages(pdf_path: Path, page_numbers: set[int] | None = None) -> Iterator[PageContent]:
+    """Word and image boxes from pypdf's content-stream visitor, without layout analysis.
+
+    Glyph widths come from the font's /Widths (or the standard 14 metrics); character
+    and word spacing operators are not applied.
+    """
+    pages = _open_document(pdf_path).reader().pages
+    for page_index in _page_indexes(len(pages), page_numbers):
+        page = pages[page_index]
+        mediabox = page.mediabox
+        page_top = float(mediabox.top)
+        xobjects = (page.get("/Resources") or {}).get("/XObject") or {}
+        chars: list[dict[str, Any]] = []
+        images: list[dict[str, Any]] = []
+        metrics_by_font: dict[int, _FontMetrics] = {}
+
+        def visit_text(text: str, cm: list[float], tm: list[float], font_dict: Any, font_size: float) -> None:
+            if not text or not text.strip():
+                return
+            metrics = metrics_by_font.get(id(font_dict))
+            if metrics is None:
+                metrics = metrics_by_font[id(font_dict)] = _FontMetrics(font_dict)
+            matrix = _matrix_multiply(tm, cm)
+            x, baseline = matrix[4], matrix[5]
+            size = font_size * matrix[3]
+            y0 = baseline + metrics.descent * size / 1000
+            for char in text:
+                advance = metrics.width(char) * font_size * matrix[0] / 1000
+                chars.append(
+                    {
+                        "text": char,
+                        "x0": x,
+                        "x1": x + advance,
+                        "top": page_top - (y0 + size),
+                        "bottom": page_top - y0,
+                    }
+                )
+                x += advance
+
+        def visit_operand(operator: bytes, operands: list[Any], cm: list[float], tm: list[float]) -> None:
+            if operator != b"Do" or not operands:
+                return
+            name = str(operands[0])
+            xobject = xobjects.get(name)
+            xobject = xobject.get_object() if xobject is not None else None
+            if xobject is None or xobject.get("/Subtype") != "/Image":
+                return
+            x0, x1 = sorted((cm[4], cm[4] + cm[0]))
+            y0, y1 = sorted((cm[5], cm[5] + cm[3]))
+            images.append(
+                {
+                    "name": name.lstrip("/"),
+                    "x0": x0,
+                    "x1": x1,
+                    "top": page_top - y1,
+                    "bottom": page_top - y0,
+                    # pypdf keeps the still-encoded stream bytes in _data.
+                    "stream": _RawStream(getattr(xobject, "_data", None)),
+                }
+            )
+
+        page.extract_text(visitor_text=visit_text, visitor_operand_before=visit_operand)
+        yield PageContent(
+            page_no=page_index + 1,
+            width=float(mediabox.width),
+            height=float(mediabox.height),
+            words=_group_words(chars),
+            images=images,
+        )
+
+
+def _timed_pages(pages: Iterator[PageContent], page_timings: list[dict] | None) -> Iterator[PageContent]:
+    """Record per-page extraction and total time into ``page_timings`` when it is given."""
+    if page_timings is None:
+        yield from pages
+        return
+    started = time.perf_counter()
+    for page in pages:
+        extracted = time.perf_counter()
+        yield page
+        finished = time.perf_counter()
+        page_timings.append(
+            {
+                "page_no": page.page_no,
+                "extract_seconds": round(extracted - started, 4),
+                "seconds": round(finished - started, 4),
+            }
+        )
+        started = time.perf_counter()
+
+
+EXTRACTION_BACKENDS: dict[str, Callable[[Path, set[int] | None], Iterator[PageContent]]] = {
+    "pdfplumber": _pdfplumber_pages,
+    "pypdf": _pypdf_pages,
+}
+
+
+def _extraction_backend(name: str) -> Callable[[Path, set[int] | None], Iterator[PageContent]]:
+    try:
+        return EXTRACTION_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown text extraction backend {name!r}; expected one of {sorted(EXTRACTION_BACKENDS)}"
+        ) from None
+
+
+def _cluster_positions(values: Iterable[float], tolerance: float) -> list[float]:
+    clusters: list[list[float]] = []
+    for value in sorted(values):
+        if clusters and value - clusters[-1][-1] <= tolerance:
+            clusters[-1].append(value)
+        else:
+            clusters.append([value])
+    return [sum(cluster) / len(cluster) for cluster in clusters]
+
+
+def _snap(value: float, anchors: list[float], tolerance: float) -> int | None:
+    index = bisect_right(anchors, value + tolerance) - 1
+    if index >= 0 and abs(anchors[index] - value) <= tolerance:
+        return index
+    return None
+
+
+def _ranges_are_disjoint(ranges: list[tuple[float, float]], margin: float) -> bool:
+    return all(left[1] + margin < right[0] for left, right in zip(ranges, ranges[1:]))
+
+
+def infer_grid_template(
+    assignments: list[tuple[dict[str, Any], dict[str, Any] | None]],
+    tolerance: float = GRID_TEMPLATE_TOLERANCE,
+) -> GridTemplate | None:
+    """Build a template from heuristic assignments of sample pages, or None if they are not a grid."""
+    if len(assignments) < 2 or any(image is None for _, image in assignments):
+        return None
+
+    template = GridTemplate(
+        sku_columns=_cluster_positions((word["x0"] for word, _ in assignments), tolerance),
+        sku_rows=_cluster_positions((word["top"] for word, _ in assignments), tolerance),
+        image_columns=_cluster_positions((image["x0"] for _, image in assignments), tolerance),
+        image_rows=_cluster_positions((image["top"] for _, image in assignments), tolerance),
+        image_boxes={},
+    )
+    if (len(template.image_columns), len(template.image_rows)) != (
+        len(template.sku_columns),
+        len(template.sku_rows),
+    ):
+        return None
+
+    column_ranges: dict[int, list[float]] = {}
+    row_ranges: dict[int, list[float]] = {}
+    for word, image in assignments:
+        slot = (
+            _snap(word["x0"], template.sku_columns, tolerance),
+            _snap(word["top"], template.sku_rows, tolerance),
+        )
+        image_slot = (
+            _snap(image["x0"], template.image_columns, tolerance),
+            _snap(image["top"], template.image_rows, tolerance),
+        )
+        if slot != image_slot:
+            return None
+        box = (image["x0"], image["x1"], image["top"], image["bottom"])
+        known = template.image_boxes.setdefault(slot, box)
+        if any(abs(a - b) > tolerance for a, b in zip(known, box)):
+            return None
+        column, row = slot
+        # Same extents as _cell_bounds for a mapped image.
+        column_ranges.setdefault(column, []).extend([image["x0"] - 8, image["x1"] + 8])
+        row_ranges.setdefault(row, []).extend([word["top"] - 4, image["bottom"] + 5])
+
+    columns = [(min(column_ranges[c]), max(column_ranges[c])) for c in sorted(column_ranges)]
+    rows = [(min(row_ranges[r]), max(row_ranges[r])) for r in sorted(row_ranges)]
+    if len(columns) != len(template.sku_columns) or len(rows) != len(template.sku_rows):
+        return None
+    # Cells must not overlap, so each word falls into at most one cell.
+    if not _ranges_are_disjoint(columns, 2 * tolerance) or not _ranges_are_disjoint(rows, 2 * tolerance):
+        return None
+    template.cell_lefts = [left - tolerance for left, _ in columns]
+    template.cell_tops = [top - tolerance for top, _ in rows]
+    return template
+
+
+def _cells_from_template(
+    page: Any,
+    words: list[dict[str, Any]],
+    images: list[dict[str, Any]],
+    template: GridTemplate,
+    tolerance: float = GRID_TEMPLATE_TOLERANCE,
+) -> list[PageCell] | None:
+    """Cut a page into cells by ``template``; None when the page does not fit it."""
+    sku_words = sorted(
+        [w for w in words if SKU_RE.fullmatch(w["text"]) and w["top"] > 120],
+        key=lambda row: (round(row["top"], 2), row["x0"]),
+    )
+    if not sku_words:
+        return None
+
+    image_by_slot: dict[tuple[int, int], dict[str, Any]] = {}
+    for image in images:
+        column = _snap(image["x0"], template.image_columns, tolerance)
+        row = _snap(image["top"], template.image_rows, tolerance)
+        expected = template.image_boxes.get((column, row))
+        if expected is None or (column, row) in image_by_slot:
+            continue
+        box = (image["x0"], image["x1"], image["top"], image["bottom"])
+        if all(abs(a - b) <= tolerance for a, b in zip(expected, box)):
+            image_by_slot[(column, row)] = image
+
+    slots: list[tuple[int, int]] = []
+    for word in sku_words:
+        slot = (
+            _snap(word["x0"], template.sku_columns, tolerance),
+            _snap(word["top"], template.sku_rows, tolerance),
+        )
+        if slot not in image_by_slot or slot in slots:
+            return None
+        slots.append(slot)
+
+    bounds_by_slot = {
+        slot: _cell_bounds(page, word, image_by_slot[slot]) for slot, word in zip(slots, sku_words)
+    }
+    words_by_slot: dict[tuple[int, int], list[dict[str, Any]]] = {slot: [] for slot in slots}
+    for word in words:
+        slot = (
+            bisect_right(template.cell_lefts, word["x0"]) - 1,
+            bisect_right(template.cell_tops, word["top"]) - 1,
+        )
+        bounds = bounds_by_slot.get(slot)
+        if bounds is None:
+            continue
+        x0, x1, y0, y1, _ = bounds
+        if word["x0"] >= x0 and word["x1"] <= x1 and word["top"] >= y0 and word["bottom"] <= y1:
+            words_by_slot[slot].append(word)
+
+    return [
+        (word, image_by_slot[slot], bounds_by_slot[slot], words_by_slot[slot])
+        for slot, word in zip(slots, sku_words)
+    ]
+
+
+class _PageCells:
+    """Splits pages into SKU cells, switching to a grid template once one is inferred."""
+
+    def __init__(self, use_template: bool = True, template: GridTemplate | None = None) -> None:
+        self.template = template
+        self._sampling = use_template and template is None
+        self._samples: list[tuple[dict[str, Any], dict[str, Any] | None]] = []
+        self._sampled_pages = 0
+
+    def cells(
+        self,
+        page: Any,
+        words: list[dict[str, Any]],
+        images: list[dict[str, Any]],
+    ) -> tuple[list[PageCell], str]:
+        if self.template is not None:
+            cells = _cells_from_template(page, words, images, self.template)
+            if cells is not None:
+                return cells, LAYOUT_TEMPLATE
+
+        assignments = _assign_images_to_skus(words, images)
+        if self._sampling and len(assignments) > 1 and all(image for _, image in assignments):
+            self._samples.extend(assignments)
+            self._sampled_pages += 1
+            if self._sampled_pages >= GRID_TEMPLATE_SAMPLE_PAGES:
+                self.template = infer_grid_template(self._samples)
+                self._sampling = False
+                self._samples = []
+
+        cells: list[PageCell] = []
+        for sku_word, mapped_image in assignments:
+            bounds = _cell_bounds(page, sku_word, mapped_image)
+            x0, x1, y0, y1, _ = bounds
+            cells.append((sku_word, mapped_image, bounds, _collect_cell_words(words, x0, x1, y0, y1)))
+        return cells, LAYOUT_HEURISTIC
+
+
+def scan_catalog_pages(
+    pdf_path: str | Path,
+    *,
+    page_numbers: set[int] | None = None,
+    grid_template: bool = True,
+    backend: str = DEFAULT_EXTRACTION_BACKEND,
+    page_timings: list[dict] | None = None,
+) -> Iterator[tuple[int, list[QuickCandidate]]]:
+    """Yield ``(page_no, candidates)`` as each page is scanned, pages without SKUs included."""
+    iter_pages = _extraction_backend(backend)
     pdf_path = Path(pdf_path)
-    candidates: list[QuickCandidate] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        for page_index, page in enumerate(pdf.pages):
-            words = page.extract_words() or []
-            images = [img for img in page.images if img["top"] > 120]
-            assignments = _assign_images_to_skus(words, images)
-
-            for sku_word, mapped_image in assignments:
-                x0, x1, y0, y1, _ = _cell_bounds(page, sku_word, mapped_image)
-                cell_words = _collect_cell_words(words, x0, x1, y0, y1)
-                lines = _line_text_from_words(cell_words)
-                quick_fp = _quick_fingerprint(
+    page_cells = _PageCells(use_template=grid_template)
+    for page in _timed_pages(iter_pages(pdf_path, page_numbers), page_timings):
+        images = [img for img in page.images if img["top"] > 120]
+        cells, layout = page_cells.cells(page, page.words, images)
+
+        candidates: list[QuickCandidate] = []
+        for sku_word, mapped_image, _, cell_words in cells:
+            lines = _line_text_from_words(cell_words)
+            image_digest = _image_digest(mapped_image)
+            quick_fp = _quick_fingerprint(
+                sku=sku_word["text"],
+                lines=lines,
+                image_signature=_image_signature(mapped_image, image_digest),
+            )
+
+            candidates.append(
+                QuickCandidate(
                     sku=sku_word["text"],
+                    page_no=page.page_no,
+                    sku_bbox={
+                        "x0": float(sku_word["x0"]),
+                        "x1": float(sku_word["x1"]),
+                        "top": float(sku_word["top"]),
+                        "bottom": float(sku_word["bottom"]),
+                    },
+                    image_bbox=(
+                        {
+                            "x0": float(mapped_image["x0"]),
+                            "x1": float(mapped_image["x1"]),
+                            "top": float(mapped_image["top"]),
+                            "bottom": float(mapped_image["bottom"]),
+                        }
+                        if mapped_image
+                        else None
+                    ),
                     lines=lines,
-                    image_signature=_image_signature(mapped_image),
+                    quick_fingerprint=quick_fp,
+                    image_digest=image_digest,
+                    layout=layout,
+                    template=page_cells.template if layout == LAYOUT_TEMPLATE else None,
                 )
+            )
+        yield page.page_no, candidates
 
-                candidates.append(
-                    QuickCandidate(
-                        sku=sku_word["text"],
-                        page_no=page_index + 1,
-                        sku_bbox={
-                            "x0": float(sku_word["x0"]),
-                            "x1": float(sku_word["x1"]),
-                            "top": float(sku_word["top"]),
-                            "bottom": float(sku_word["bottom"]),
-                        },
-                        image_bbox=(
-                            {
-                                "x0": float(mapped_image["x0"]),
-                                "x1": float(mapped_image["x1"]),
-                                "top": float(mapped_image["top"]),
-                                "bottom": float(mapped_image["bottom"]),
-                            }
-                            if mapped_image
-                            else None
-                        ),
-                        lines=lines,
-                        quick_fingerprint=quick_fp,
-                    )
-                )
 
-    return candidates
+def scan_catalog_fast(
+    pdf_path: str | Path,
+    *,
+    page_numbers: set[int] | None = None,
+    grid_template: bool = True,
+    backend: str = DEFAULT_EXTRACTION_BACKEND,
+    page_timings: list[dict] | None = None,
+) -> list[QuickCandidate]:
+    return [
+        candidate
+        for _, candidates in scan_catalog_pages(
+            pdf_path,
+            page_numbers=page_numbers,
+            grid_template=grid_template,
+            backend=backend,
+            page_timings=page_timings,
+        )
+        for candidate in candidates
+    ]
 
 
 def parse_catalog_pdf(
     pdf_path: str | Path,
     sku_filter: set[str] | None = None,
+    page_numbers: set[int] | None = None,
+    *,
+    grid_template: bool = True,
+    template: GridTemplate | None = None,
+    backend: str = DEFAULT_EXTRACTION_BACKEND,
+    page_timings: list[dict] | None = None,
 ) -> list[ParsedItem]:
+    """Parse the selected cells; ``template`` cuts pages by a grid the scan already inferred."""
+    iter_pages = _extraction_backend(backend)
     pdf_path = Path(pdf_path)
-    reader = PdfReader(str(pdf_path))
+    reader = _open_document(pdf_path).reader()
     parsed_items: list[ParsedItem] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        for page_index, page in enumerate(pdf.pages):
-            words = page.extract_words() or []
-            images = [img for img in page.images if img["top"] > 120]
-            assignments = _assign_images_to_skus(words, images)
-
-            selected_assignments = []
-            for sku_word, mapped_image in assignments:
-                sku = sku_word["text"]
-                if sku_filter is not None and sku not in sku_filter:
-                    continue
-                selected_assignments.append((sku_word, mapped_image))
-
-            if not selected_assignments:
-                continue
-
-            image_by_name: dict[str, Any] = {}
-            if any(mapped_image for _, mapped_image in selected_assignments):
-                for image_obj in list(reader.pages[page_index].images):
-                    image_by_name[image_obj.name] = image_obj
-                    image_by_name[image_obj.name.split(".")[0]] = image_obj
-
-            for sku_word, mapped_image in selected_assignments:
-                sku = sku_word["text"]
-                parse_issues: list[str] = []
+    page_cells = _PageCells(use_template=grid_template, template=template)
+    for page in _timed_pages(iter_pages(pdf_path, page_numbers), page_timings):
+        images = [img for img in page.images if img["top"] > 120]
+        cells, _ = page_cells.cells(page, page.words, images)
+
+        selected_cells = [
+            cell for cell in cells if sku_filter is None or cell[0]["text"] in sku_filter
+        ]
+        if not selected_cells:
+            continue
 
-                x0, x1, y0, y1, used_fallback = _cell_bounds(page, sku_word, mapped_image)
-                if used_fallback:
+        image_by_name: dict[str, Any] = {}
+        if any(mapped_image for _, mapped_image, _, _ in selected_cells):
+            for image_obj in list(reader.pages[page.page_no - 1].images):
+                image_by_name[image_obj.name] = image_obj
+                image_by_name[image_obj.name.split(".")[0]] = image_obj
+
+        for sku_word, mapped_image, bounds, cell_words in selected_cells:
+            sku = sku_word["text"]
+            parse_issues: list[str] = []
+
+            used_fallback = bounds[4]
+            if used_fallback:
+                parse_issues.append("missing_image")
+
+            line_text = _line_text_from_words(cell_words)
+            name, upc, pack = _parse_fields_from_lines(sku, line_text)
+
+            category = category_from_sku(sku)
+            if not category:
+                parse_issues.append("unknown_category")
+                category = "Uncategorized"
+
+            if not pack:
+                parse_issues.append("missing_pack")
+
+            image_bytes: bytes | None = None
+            image_extension: str | None = None
+            if mapped_image:
+                mapped_name = mapped_image.get("name", "")
+                image_obj = image_by_name.get(mapped_name)
+                if image_obj:
+                    image_bytes = bytes(image_obj.data)
+                    if "." in image_obj.name:
+                        image_extension = image_obj.name.split(".")[-1].lower()
+                else:
                     parse_issues.append("missing_image")
 
-                cell_words = _collect_cell_words(words, x0, x1, y0, y1)
-                line_text = _line_text_from_words(cell_words)
-                name, upc, pack = _parse_fields_from_lines(sku, line_text)
-
-                category = category_from_sku(sku)
-                if not category:
-                    parse_issues.append("unknown_category")
-                    category = "Uncategorized"
-
-                if not pack:
-                    parse_issues.append("missing_pack")
-
-                image_bytes: bytes | None = None
-                image_extension: str | None = None
-                if mapped_image:
-                    mapped_name = mapped_image.get("name", "")
-                    image_obj = image_by_name.get(mapped_name)
-                    if image_obj:
-                        image_bytes = bytes(image_obj.data)
-                        if "." in image_obj.name:
-                            image_extension = image_obj.name.split(".")[-1].lower()
-                    else:
-                        parse_issues.append("missing_image")
-
-                parsed_items.append(
-                    ParsedItem(
-                        sku=sku,
-                        name=name,
-                        upc=upc,
-                        pack=pack,
-                        category=category,
-                        parse_issues=sorted(set(parse_issues)),
-                        image_bytes=image_bytes,
-                        image_extension=image_extension,
-                    )
+            parsed_items.append(
+                ParsedItem(
+                    sku=sku,
+                    name=name,
+                    upc=upc,
+                    pack=pack,
+                    category=category,
+                    parse_issues=sorted(set(parse_issues)),
+                    image_bytes=image_bytes,
+                    image_extension=image_extension,
+                    image_digest=_image_digest(mapped_image) if image_bytes else None,
                 )
+            )
 
     unique: dict[str, ParsedItem] = {}
     for item in parsed_items:
         if item.sku not in unique:
             unique[item.sku] = item
     return list(unique.values())
+
+
+if __name__ == "__main__":
+    import sys
+
+    from bulk_parse import main
+
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""Catalog PDFs downloaded ahead of their parser jobs.
+
+While a job parses, a background thread looks at the jobs that would be claimed
+next and downloads their PDFs into a private temp directory. The storage client
+returns a PDF whole, so each one is held in memory once while its MD5 is taken
+and it is written out. Prefetching saves the download's wait, not its memory.
+
+A prefetched PDF is used only when the claimed job has the same storage path and
+the MD5 equals the storage ETag the claim saw, so the bytes on disk are the
+object version being parsed. MD5 is used because a plain upload's ETag is its
+MD5, the only content hash storage exposes. An ETag that is not a plain MD5
+(multipart uploads) has to equal the one seen when the PDF was prefetched.
+Anything else falls back to a normal download.
+
+Prefetched files never take more than ``max_bytes`` of disk. A refill drops the
+files of jobs that are no longer queued (superseded, deleted, claimed by another
+runner), and ``stop`` removes the directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger("parser-worker")
+
+MD5_ETAG_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+@dataclass(frozen=True)
+class PrefetchTarget:
+    job_id: str
+    pdf_storage_path: str
+    content_hash: str | None
+    size_bytes: int
+
+
+@dataclass(frozen=True)
+class _Prefetched:
+    target: PrefetchTarget
+    path: Path
+    md5: str
+    size_bytes: int
+
+
+def _write_hashed(path: Path, data: bytes) -> str:
+    """Write ``data`` to ``path`` so it never appears half-written; returns its MD5."""
+    partial = path.with_suffix(".part")
+    partial.write_bytes(data)
+    partial.replace(path)
+    return hashlib.md5(data, usedforsecurity=False).hexdigest()
+
+
+def _matches_object(entry: _Prefetched, content_hash: str | None) -> bool:
+    """Whether the prefetched bytes are the storage object whose ETag is ``content_hash``."""
+    etag = (content_hash or "").strip('"').lower()
+    if MD5_ETAG_RE.match(etag):
+        return etag == entry.md5
+    return bool(etag) and content_hash == entry.target.content_hash
+
+
+class PdfPrefetcher:
+    """Keeps the PDFs of the next ``ahead`` claimable jobs on local disk.
+
+    Wrap claims in ``claim`` so a refill never drops the PDF of a job that was
+    just claimed. The job then gets it with ``take`` and calls ``release`` when
+    it ends. No lock is held while a claim or a download talks to Supabase.
+    """
+
+    def __init__(self, *, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self._lock = threading.Condition()
+        self._entries: dict[str, _Prefetched] = {}
+        self._reserved: set[str] = set()
+        self._claims_in_flight = 0
+        self._downloading: PrefetchTarget | None = None
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._directory: Path | None = None
+        self._peek: Callable[[int], list[PrefetchTarget]] | None = None
+        self._download: Callable[[str], bytes] | None = None
+        self._ahead = 0
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+
+    def start(
+        self,
+        *,
+        peek: Callable[[int], list[PrefetchTarget]],
+        download: Callable[[str], bytes],
+        ahead: int,
+    ) -> bool:
+        """Start prefetching; returns False when it is disabled or already running."""
+        if self.max_bytes <= 0 or self.active:
+            return False
+        self._peek = peek
+        self._download = download
+        self._ahead = max(1, ahead)
+        self._directory = Path(tempfile.mkdtemp(prefix="blooms-prefetch-"))
+        self._stopped.clear()
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._run, name="parser-pdf-prefetch", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, *, timeout: float | None = None) -> None:
+        """Stop and delete every prefetched file; a download still running after ``timeout`` is abandoned."""
+        if not self.active:
+            return
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        with self._lock:
+            self._entries.clear()
+            self._reserved.clear()
+        shutil.rmtree(self._directory, ignore_errors=True)
+        self._directory = None
+
+    def schedule(self) -> None:
+        """Ask the background thread for a refill; a no-op while prefetching is off."""
+        if self.active:
+            self._wake.set()
+
+    def claim(self, claim: Callable[[], dict | None]) -> dict | None:
+        """Run ``claim`` and reserve the claimed job's prefetched PDF before any refill can drop it."""
+        with self._lock:
+            self._claims_in_flight += 1
+        job = None
+        try:
+            job = claim()
+            return job
+        finally:
+            with self._lock:
+                self._claims_in_flight -= 1
+                if job and self.active:
+                    self._reserved.add(job["id"])
+
+    def take(self, job_id: str, *, pdf_storage_path: str, content_hash: str | None, timeout: float) -> bytes | None:
+        """The job's prefetched PDF if it still matches, waiting up to ``timeout`` for a download in progress."""
+        with self._lock:
+            self._lock.wait_for(
+                lambda: self._downloading is None or self._downloading.job_id != job_id,
+                timeout=timeout,
+            )
+            self._reserved.discard(job_id)
+            entry = self._entries.pop(job_id, None)
+        if entry is None:
+            return None
+        try:
+            if entry.target.pdf_storage_path != pdf_storage_path or not _matches_object(entry, content_hash):
+                logger.info("Dropping prefetched PDF for parser job %s: the catalog PDF changed", job_id)
+                return None
+            data = entry.path.read_bytes()
+            self.hits += 1
+            return data
+        finally:
+            entry.path.unlink(missing_ok=True)
+
+    def release(self, job_id: str) -> None:
+        """Forget the job's reservation and delete its PDF if it was never taken."""
+        with self._lock:
+            self._reserved.discard(job_id)
+            entry = self._entries.pop(job_id, None)
+        if entry is not None:
+            entry.path.unlink(missing_ok=True)
+
+    def used_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            try:
+                self._refill()
+            except Exception as exc:
+                logger.warning("PDF prefetch failed: %s", exc)
+
+    def _refill(self) -> None:
+        targets = self._peek(self._ahead)
+        wanted = {target.job_id for target in targets}
+        dropped: list[_Prefetched] = []
+        with self._lock:
+            # A job claimed since the peek is reserved only once its claim returns, so
+            # nothing is dropped while a claim runs; a later refill drops it instead.
+            if self._claims_in_flight == 0:
+                dropped = [
+                    self._entries.pop(job_id)
+                    for job_id in list(self._entries)
+                    if job_id not in wanted and job_id not in self._reserved
+                ]
+        for entry in dropped:
+            entry.path.unlink(missing_ok=True)
+
+        for target in targets:
+            if self._stopped.is_set():
+                return
+            with self._lock:
+                if target.job_id in self._entries:
+                    continue
+                if sum(entry.size_bytes for entry in self._entries.values()) + target.size_bytes > self.max_bytes:
+                    return
+                self._downloading = target
+            try:
+                self._fetch(target)
+            finally:
+                with self._lock:
+                    self._downloading = None
+                    self._lock.notify_all()
+
+    def _fetch(self, target: PrefetchTarget) -> None:
+        data = self._download(target.pdf_storage_path)
+        path = self._directory / f"{target.job_id}.pdf"
+        md5 = _write_hashed(path, data)
+        with self._lock:
+            used = sum(entry.size_bytes for entry in self._entries.values())
+            if used + len(data) <= self.max_bytes and not self._stopped.is_set():
+                self._entries[target.job_id] = _Prefetched(target, path, md5, len(data))
+                logger.info("Prefetched PDF for parser job %s (%s bytes)", target.job_id, len(data))
+                return
+        path.unlink(missing_ok=True)
@@ -0,0 +1,204 @@
+"""Opt-in profiling for slow parser jobs.
+
+Turned on for every job with ``PARSER_PROFILE`` or for one job with
+``parser_jobs.profile``. Both take a comma list of ``cprofile``, ``tracemalloc``
+and ``pages``, or ``all``. When profiling is off the worker never builds a
+``JobProfiler``, and the parser's page-timing hook costs one ``None`` check per
+call.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+PROFILE_KINDS = frozenset({"cprofile", "tracemalloc", "pages"})
+TRACEMALLOC_TOP_ALLOCATIONS = 10
+
+
+def parse_profile_kinds(value: str | None) -> frozenset[str]:
+    text = (value or "").strip().lower()
+    if text in {"", "0", "off", "false", "none"}:
+        return frozenset()
+    if text in {"1", "on", "true", "all"}:
+        return PROFILE_KINDS
+    kinds = frozenset(part.strip() for part in text.split(",") if part.strip())
+    unknown = kinds - PROFILE_KINDS
+    if unknown:
+        raise ValueError(f"Unknown profile kinds {sorted(unknown)}; expected {sorted(PROFILE_KINDS)}")
+    return kinds
+
+
+def _short_filename(filename: str) -> str:
+    return "/".join(Path(filename).parts[-2:])
+
+
+def top_functions(stats: pstats.Stats, limit: int) -> list[dict]:
+    """The ``limit`` functions with the highest cumulative time."""
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    rows: list[dict] = []
+    for func in stats.fcn_list[:limit]:
+        _, ncalls, tottime, cumtime, _ = stats.stats[func]
+        filename, line, name = func
+        rows.append(
+            {
+                "function": f"{_short_filename(filename)}:{line}({name})",
+                "ncalls": ncalls,
+                "tottime": round(tottime, 4),
+                "cumtime": round(cumtime, 4),
+            }
+        )
+    return rows
+
+
+def profiled_call(
+    kinds: frozenset[str],
+    stats_path: str,
+    fn: Callable[..., Any],
+    *args,
+    **kwargs,
+) -> tuple[Any, dict]:
+    """Run ``fn`` under the requested profilers; runs wherever the parse runs."""
+    report: dict = {}
+    page_timings: list[dict] | None = None
+    if "pages" in kinds:
+        page_timings = kwargs["page_timings"] = []
+
+    was_tracing = tracemalloc.is_tracing()
+    if "tracemalloc" in kinds:
+        if was_tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+
+    profile = cProfile.Profile() if "cprofile" in kinds else None
+    started = time.perf_counter()
+    if profile is not None:
+        profile.enable()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        if profile is not None:
+            profile.disable()
+        report["wall_seconds"] = round(time.perf_counter() - started, 4)
+
+        if "tracemalloc" in kinds:
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if not was_tracing:
+                tracemalloc.stop()
+            report["peak_bytes"] = peak
+            report["top_allocations"] = [
+                {
+                    "location": f"{_short_filename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP_ALLOCATIONS]
+            ]
+
+    if profile is not None:
+        profile.dump_stats(stats_path)
+        report["stats_path"] = stats_path
+    if page_timings is not None:
+        report["page_timings"] = page_timings
+    return result, report
+
+
+class JobProfiler:
+    """Collects profiles for one parser job and turns them into a JSON-ready report.
+
+    Parse calls go through ``run`` so they are profiled in the process that does
+    the work; ``call`` is how the caller runs a function there (in-process or on
+    its parse pool). ``start``/``stop`` profile the job loop itself (uploads, database
+    calls), with the loop profile paused while a parse call is running.
+    """
+
+    def __init__(self, kinds: frozenset[str], *, job_id: str, catalog_id: str, top_n: int = 25) -> None:
+        self.kinds = kinds
+        self.job_id = job_id
+        self.catalog_id = catalog_id
+        self.top_n = top_n
+        self._work_dir = Path(tempfile.mkdtemp(prefix="blooms-profile-"))
+        self._calls: dict[str, list[dict]] = {}
+        self._loop_profile: cProfile.Profile | None = None
+        self._loop_started: float | None = None
+        self._loop_seconds = 0.0
+
+    def start(self) -> None:
+        self._loop_started = time.perf_counter()
+        if "cprofile" in self.kinds:
+            self._loop_profile = cProfile.Profile()
+            self._enable_loop()
+
+    def stop(self) -> None:
+        self._disable_loop()
+        if self._loop_started is not None:
+            self._loop_seconds = time.perf_counter() - self._loop_started
+            self._loop_started = None
+
+    def _enable_loop(self) -> None:
+        if self._loop_profile is None:
+            return
+        try:
+            self._loop_profile.enable()
+        except ValueError:
+            # Another job in this process is already being profiled (one profiler
+            # per process on Python 3.12+); keep the parse profiles only.
+            self._loop_profile = None
+
+    def _disable_loop(self) -> None:
+        if self._loop_profile is not None:
+            self._loop_profile.disable()
+
+    def run(self, call: Callable[..., Any], fn: Callable[..., Any], *args, **kwargs) -> Any:
+        stage = fn.__name__
+        calls = self._calls.setdefault(stage, [])
+        stats_path = str(self._work_dir / f"{stage}-{len(calls)}.prof")
+        self._disable_loop()
+        try:
+            result, report = call(profiled_call, self.kinds, stats_path, fn, *args, **kwargs)
+        finally:
+            self._enable_loop()
+        calls.append(report)
+        return result
+
+    def report(self) -> dict:
+        stages: dict[str, dict] = {}
+        for stage, calls in self._calls.items():
+            summary: dict = {
+                "calls": len(calls),
+                "wall_seconds": round(sum(call["wall_seconds"] for call in calls), 4),
+            }
+            stats_paths = [call["stats_path"] for call in calls if "stats_path" in call]
+            if stats_paths:
+                summary["cprofile_top"] = top_functions(pstats.Stats(*stats_paths), self.top_n)
+            peaks = [call for call in calls if "peak_bytes" in call]
+            if peaks:
+                largest = max(peaks, key=lambda call: call["peak_bytes"])
+                summary["peak_bytes"] = largest["peak_bytes"]
+                summary["top_allocations"] = largest["top_allocations"]
+            page_timings = [timing for call in calls for timing in call.get("page_timings", [])]
+            if "pages" in self.kinds:
+                summary["page_timings"] = sorted(page_timings, key=lambda timing: timing["page_no"])
+            stages[stage] = summary
+
+        job_loop: dict = {"wall_seconds": round(self._loop_seconds, 4)}
+        if self._loop_profile is not None:
+            job_loop["cprofile_top"] = top_functions(pstats.Stats(self._loop_profile), self.top_n)
+        return {
+            "job_id": self.job_id,
+            "catalog_id": self.catalog_id,
+            "kinds": sorted(self.kinds),
+            "stages": stages,
+            "job_loop": job_loop,
+        }
+
+    def close(self) -> None:
+        shutil.rmtree(self._work_dir, ignore_errors=True)
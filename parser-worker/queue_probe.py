@@ -0,0 +1,134 @@
+"""Cheap check for parser work that needs only the standard library.
+
+Runs a PostgREST count of queued jobs and processing jobs whose lease has
+expired and, when there are none, a count of published catalogs still missing a
+customer snapshot. The worker (and with it pdfplumber, pypdf and the supabase
+client) is imported only when one of those counts is non-zero. A probe that
+fails twice (HTTP error, timeout), or cannot run for lack of SUPABASE_URL or
+SUPABASE_SERVICE_ROLE_KEY, reports work, so the worker runs as before.
+
+    python queue_probe.py          # print the count; writes has_work to $GITHUB_OUTPUT
+    python queue_probe.py --run    # also run worker.run_batch() when there is work
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta, timezone
+
+PROBE_TIMEOUT_SECONDS = 10
+
+
+def _env(name: str, default: str = "") -> str:
+    return os.environ.get(name, default)
+
+
+def _claimable_jobs_filter(now: datetime | None = None) -> str:
+    now = now or datetime.now(timezone.utc)
+    lease_cutoff = (now - timedelta(seconds=int(_env("PARSER_LEASE_SECONDS", "60")))).isoformat()
+    stale_cutoff = (
+        now - timedelta(minutes=int(_env("PARSER_STALE_PROCESSING_MINUTES", "15")))
+    ).isoformat()
+    # Same conditions as worker.claim_next_job: queued, or processing with an expired lease.
+    return (
+        "(status.eq.queued,"
+        "and(status.eq.processing,finished_at.is.null,"
+        f'or(heartbeat_at.lt."{lease_cutoff}",'
+        f'and(heartbeat_at.is.null,started_at.lt."{stale_cutoff}"))))'
+    )
+
+
+def _count_from_content_range(content_range: str | None) -> int:
+    # PostgREST answers Prefer: count=exact with e.g. "0-0/12" or "*/0".
+    if not content_range or "/" not in content_range:
+        return 0
+    total = content_range.rsplit("/", 1)[1]
+    return int(total) if total.isdigit() else 0
+
+
+def _head_count(table: str, params: dict[str, str]) -> int:
+    supabase_url = _env("SUPABASE_URL").rstrip("/")
+    service_key = _env("SUPABASE_SERVICE_ROLE_KEY")
+    if not supabase_url or not service_key:
+        raise RuntimeError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required.")
+
+    query = urllib.parse.urlencode({"select": "id", **params})
+    request = urllib.request.Request(
+        f"{supabase_url}/rest/v1/{table}?{query}",
+        method="HEAD",
+        headers={
+            "apikey": service_key,
+            "Authorization": f"Bearer {service_key}",
+            "Prefer": "count=exact",
+        },
+    )
+    with urllib.request.urlopen(request, timeout=PROBE_TIMEOUT_SECONDS) as response:
+        return _count_from_content_range(response.headers.get("Content-Range"))
+
+
+def count_claimable_jobs() -> int:
+    return _head_count("parser_jobs", {"or": _claimable_jobs_filter()})
+
+
+def count_stale_snapshots() -> int:
+    # Same conditions as worker.refresh_stale_snapshots.
+    return _head_count(
+        "catalogs",
+        {"status": "eq.published", "deleted_at": "is.null", "snapshot_path": "is.null"},
+    )
+
+
+def _probe_once() -> tuple[int, int]:
+    count = count_claimable_jobs()
+    # A batch run refreshes snapshots on its way in, so only look when no job will start one.
+    return count, 0 if count else count_stale_snapshots()
+
+
+def probe_counts() -> tuple[int, int]:
+    """Claimable jobs and stale snapshots; an HTTP error or timeout is retried once."""
+    try:
+        return _probe_once()
+    except OSError as exc:  # URLError, HTTPError and socket timeouts
+        print(f"Queue probe failed ({exc}); retrying", file=sys.stderr)
+    return _probe_once()
+
+
+def _write_github_output(has_work: bool, count: int | None, stale_snapshots: int | None) -> None:
+    output_path = _env("GITHUB_OUTPUT")
+    if not output_path:
+        return
+    with open(output_path, "a", encoding="utf-8") as handle:
+        handle.write(f"has_work={'true' if has_work else 'false'}\n")
+        handle.write(f"claimable_jobs={'unknown' if count is None else count}\n")
+        handle.write(f"stale_snapshots={'unknown' if stale_snapshots is None else stale_snapshots}\n")
+
+
+def main(argv: list[str]) -> int:
+    try:
+        count, stale_snapshots = probe_counts()
+    except (OSError, RuntimeError) as exc:  # RuntimeError: missing credentials
+        # Fail open: a probe that cannot run must not skip queued work or fail the workflow.
+        print(f"Queue probe failed ({exc}); running the worker anyway", file=sys.stderr)
+        _write_github_output(True, None, None)
+    else:
+        print(f"Claimable parser jobs: {count}")
+        if stale_snapshots:
+            print(f"Published catalogs without a snapshot: {stale_snapshots}")
+        has_work = count > 0 or stale_snapshots > 0
+        _write_github_output(has_work, count, stale_snapshots)
+        if not has_work:
+            return 0
+    if "--run" not in argv:
+        return 0
+
+    import worker
+
+    print(f"Processed jobs: {worker.run_batch()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,88 @@
+"""Precomputed customer catalog snapshots.
+
+A snapshot is the customer-visible part of a catalog's items, in link-page order,
+as gzip-compressed JSON stored at
+``catalog-snapshots/<catalog_id>/<sha256>.json.gz``. The path is content-addressed,
+so readers can cache a snapshot for as long as they like. Editing a
+customer-visible item column clears ``catalogs.snapshot_path`` (a database
+trigger), and link pages query ``catalog_items`` until a new snapshot is written.
+
+The catalog's lookup index (``lookup_index.py``) is built from the same rows and
+uploaded first, at ``<catalog_id>/<sha256>.index.json.gz``, so every recorded
+snapshot has one.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from typing import TYPE_CHECKING, Iterable
+
+from lookup_index import build_lookup_index
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+SNAPSHOT_BUCKET = "catalog-snapshots"
+SNAPSHOT_SCHEMA_VERSION = 1
+SNAPSHOT_ITEM_FIELDS = (
+    "sku",
+    "name",
+    "upc",
+    "pack",
+    "category",
+    "image_storage_path",
+    "display_order",
+    "sprite_path",
+    "sprite_offset",
+)
+
+
+def _sort_key(row: dict) -> tuple:
+    # Link-page order: display_order, category, name, then sku. Text compares by UTF-16
+    # code unit, like the web's compareLinkOrder (lib/catalog/link-order.ts), which sorts
+    # the catalog_items fallback. Neither depends on the database collation.
+    return (
+        int(row.get("display_order") or 0),
+        *((row.get(column) or "").encode("utf-16-be") for column in ("category", "name", "sku")),
+    )
+
+
+def _compress(document: dict) -> tuple[bytes, str]:
+    payload = json.dumps(document, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    # mtime=0 keeps the compressed bytes identical for identical content.
+    return gzip.compress(payload, mtime=0), hashlib.sha256(payload).hexdigest()
+
+
+def _snapshot_items(rows: Iterable[dict]) -> list[dict]:
+    return [{field: row.get(field) for field in SNAPSHOT_ITEM_FIELDS} for row in sorted(rows, key=_sort_key)]
+
+
+def build_snapshot(catalog_id: str, rows: Iterable[dict]) -> tuple[bytes, str]:
+    """Return the gzip-compressed snapshot and the sha256 of its JSON."""
+    items = _snapshot_items(rows)
+    return _compress({"schema_version": SNAPSHOT_SCHEMA_VERSION, "catalog_id": catalog_id, "items": items})
+
+
+def lookup_index_path(snapshot_path: str) -> str:
+    return snapshot_path.removesuffix(".json.gz") + ".index.json.gz"
+
+
+def _upload(client: Client, path: str, compressed: bytes) -> None:
+    client.storage.from_(SNAPSHOT_BUCKET).upload(
+        path,
+        compressed,
+        {"content-type": "application/gzip", "upsert": "true"},
+    )
+
+
+def upload_snapshot(client: Client, catalog_id: str, rows: Iterable[dict]) -> dict:
+    """Upload a snapshot of ``rows`` and its lookup index; returns the catalog columns."""
+    items = _snapshot_items(rows)
+    compressed, sha256 = build_snapshot(catalog_id, items)
+    path = f"{catalog_id}/{sha256}.json.gz"
+    index, _ = _compress(build_lookup_index(catalog_id, items))
+    _upload(client, lookup_index_path(path), index)
+    _upload(client, path, compressed)
+    return {"snapshot_path": path, "snapshot_sha256": sha256}
@@ -0,0 +1,80 @@
+"""Per-page WebP sprite sheets of product images.
+
+Every product image on a source page is scaled into a fixed square cell of one
+sheet, in display order, ``SPRITE_COLUMNS`` cells to a row. Cells are a fixed
+size, so an item's offset depends only on its position on the page, not on the
+image sizes.
+
+A sheet's path is the sha256 of its page's ``(sku, image_storage_path)`` list.
+Image paths change whenever an image is uploaded again, so a page keeps its sheet
+until one of its images changes, and later catalogs reuse it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+from typing import Iterable
+
+SPRITE_PREFIX = "sprites"
+SPRITE_COLUMNS = 4
+
+
+def sprite_pages(rows: Iterable[dict]) -> dict[str, list[dict]]:
+    """Group rows that have an image by source page; keys are the sheet paths."""
+    by_page: dict[int, list[dict]] = {}
+    for row in rows:
+        if row.get("image_storage_path") and row.get("source_page_no") is not None:
+            by_page.setdefault(int(row["source_page_no"]), []).append(row)
+
+    pages: dict[str, list[dict]] = {}
+    for page_no in sorted(by_page):
+        page_rows = sorted(by_page[page_no], key=lambda row: (row.get("display_order") or 0, row["sku"]))
+        digest = hashlib.sha256(
+            "\n".join(f"{row['sku']}:{row['image_storage_path']}" for row in page_rows).encode("utf-8")
+        ).hexdigest()
+        pages[f"{SPRITE_PREFIX}/{digest}.webp"] = page_rows
+    return pages
+
+
+def _grid(count: int, cell_px: int) -> tuple[int, int]:
+    columns = min(count, SPRITE_COLUMNS)
+    rows = -(-count // SPRITE_COLUMNS)
+    return columns * cell_px, rows * cell_px
+
+
+def sprite_offset(position: int, count: int, cell_px: int) -> dict:
+    sheet_width, sheet_height = _grid(count, cell_px)
+    return {
+        "x": (position % SPRITE_COLUMNS) * cell_px,
+        "y": (position // SPRITE_COLUMNS) * cell_px,
+        "w": cell_px,
+        "h": cell_px,
+        "sheet_w": sheet_width,
+        "sheet_h": sheet_height,
+    }
+
+
+def build_sprite_sheet(images: list[bytes | None], *, cell_px: int, quality: int) -> bytes:
+    """Pack ``images`` into one WebP sheet; an image Pillow cannot read leaves its cell blank."""
+    from PIL import Image, UnidentifiedImageError
+
+    sheet = Image.new("RGBA", _grid(len(images), cell_px), (255, 255, 255, 0))
+    for position, image_bytes in enumerate(images):
+        if not image_bytes:
+            continue
+        try:
+            with Image.open(io.BytesIO(image_bytes)) as image:
+                image.thumbnail((cell_px, cell_px))
+                tile = image.convert("RGBA")
+        except (UnidentifiedImageError, OSError):
+            continue
+        offset = sprite_offset(position, len(images), cell_px)
+        # Centre the scaled image in its cell, as object-fit: contain would.
+        left = offset["x"] + (cell_px - tile.width) // 2
+        top = offset["y"] + (cell_px - tile.height) // 2
+        sheet.paste(tile, (left, top), tile)
+
+    buffer = io.BytesIO()
+    sheet.save(buffer, format="WEBP", quality=quality, method=4)
+    return buffer.getvalue()
@@ -0,0 +1,740 @@
+"""In-memory stand-in for the supabase client used by ``worker.py``.
+
+Implements the ``table()`` query builder, ``rpc()`` and ``storage.from_()`` calls the
+worker makes, with injectable per-request latency. Every request is recorded with its
+table (or RPC / bucket), verb and payload sizes, so tests can assert on DB chatter.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Callable
+
+TABLE_DEFAULTS: dict[str, dict[str, Any]] = {
+    "catalogs": {
+        "status": "draft",
+        "parse_status": "queued",
+        "parse_summary": {},
+        "deleted_at": None,
+        "published_at": None,
+        "items_version": 0,
+        "snapshot_path": None,
+        "snapshot_sha256": None,
+    },
+    "parser_jobs": {
+        "status": "queued",
+        "attempts": 0,
+        "priority": 0,
+        "retry_of_job_id": None,
+        "retry_depth": 0,
+        "retry_skus": None,
+        "profile": None,
+        "profile_artifact": None,
+        "eta_seconds": None,
+        "fits_run_budget": None,
+        "superseded_by_job_id": None,
+        "error_log": None,
+        "started_at": None,
+        "finished_at": None,
+        "heartbeat_at": None,
+        "total_items": 0,
+        "reused_items": 0,
+        "queued_items": 0,
+        "processed_items": 0,
+        "failed_items": 0,
+        "progress_percent": 0,
+        "progress_label": "queued",
+        "parsed_pages": None,
+        "total_pages": None,
+    },
+    "parser_job_items": {"status": "queued", "attempts": 0, "error_log": None},
+    "catalog_items": {
+        "approved": False,
+        "parse_issues": [],
+        "image_storage_path": "",
+        "sprite_path": None,
+        "sprite_offset": None,
+    },
+}
+
+Latency = float | Callable[[str, str, str], float]
+
+
+@dataclass
+class RequestRecord:
+    kind: str
+    target: str
+    verb: str
+    request_bytes: int
+    response_bytes: int
+    latency_seconds: float
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _payload_size(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return len(json.dumps(value, default=str))
+
+
+def _coerce(raw: Any, sample: Any) -> Any:
+    if isinstance(raw, str) and isinstance(sample, bool):
+        return raw == "true"
+    if isinstance(raw, str) and isinstance(sample, (int, float)):
+        return float(raw)
+    return raw
+
+
+def _compare(op: str, value: Any, target: Any) -> bool:
+    if op == "is":
+        expected = {"null": None, "true": True, "false": False}.get(str(target).lower(), target)
+        return value is expected
+    if op == "in":
+        return value in target
+    if value is None:
+        return False
+    target = _coerce(target, value)
+    if op == "eq":
+        return value == target
+    if op == "neq":
+        return value != target
+    if op == "lt":
+        return value < target
+    if op == "lte":
+        return value <= target
+    if op == "gt":
+        return value > target
+    if op == "gte":
+        return value >= target
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+def _split_top_level(expression: str) -> list[str]:
+    parts: list[str] = []
+    depth = 0
+    quoted = False
+    current: list[str] = []
+    for char in expression:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    if current:
+        parts.append("".join(current))
+    return parts
+
+
+def _logic_predicate(expression: str) -> Callable[[dict], bool]:
+    """Parse a PostgREST logic tree such as ``a.eq.1,and(b.is.null,c.lt."x")``."""
+    expression = expression.strip()
+    for group, combine in (("and(", all), ("or(", any)):
+        if expression.startswith(group) and expression.endswith(")"):
+            inner = [_logic_predicate(part) for part in _split_top_level(expression[len(group) : -1])]
+            return lambda row, inner=inner, combine=combine: combine(term(row) for term in inner)
+    if expression.startswith("(") and expression.endswith(")"):
+        return _logic_predicate("or" + expression)
+    column, op, raw = expression.split(".", 2)
+    value = raw[1:-1] if raw.startswith('"') and raw.endswith('"') else raw
+    return lambda row: _compare(op, row.get(column), value)
+
+
+class _Query:
+    def __init__(self, client: FakeSupabase, table: str) -> None:
+        self._client = client
+        self._table = table
+        self._verb = "select"
+        self._columns: list[str] | None = None
+        self._payload: Any = None
+        self._on_conflict: list[str] = []
+        self._filters: list[Callable[[dict], bool]] = []
+        self._orders: list[tuple[str, bool]] = []
+        self._limit: int | None = None
+        self._offset = 0
+        self._single = False
+
+    def select(self, columns: str = "*", **_kwargs) -> _Query:
+        self._verb = "select"
+        if columns.strip() != "*":
+            self._columns = [column.strip() for column in columns.split(",") if column.strip()]
+        return self
+
+    def insert(self, rows: dict | list[dict], **_kwargs) -> _Query:
+        self._verb = "insert"
+        self._payload = rows
+        return self
+
+    def upsert(self, rows: dict | list[dict], *, on_conflict: str = "id", **_kwargs) -> _Query:
+        self._verb = "upsert"
+        self._payload = rows
+        self._on_conflict = [column.strip() for column in on_conflict.split(",")]
+        return self
+
+    def update(self, values: dict, **_kwargs) -> _Query:
+        self._verb = "update"
+        self._payload = values
+        return self
+
+    def delete(self, **_kwargs) -> _Query:
+        self._verb = "delete"
+        return self
+
+    def _filter(self, column: str, op: str, value: Any) -> _Query:
+        self._filters.append(lambda row: _compare(op, row.get(column), value))
+        return self
+
+    def eq(self, column: str, value: Any) -> _Query:
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> _Query:
+        return self._filter(column, "neq", value)
+
+    def lt(self, column: str, value: Any) -> _Query:
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> _Query:
+        return self._filter(column, "lte", value)
+
+    def gt(self, column: str, value: Any) -> _Query:
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> _Query:
+        return self._filter(column, "gte", value)
+
+    def is_(self, column: str, value: Any) -> _Query:
+        return self._filter(column, "is", value)
+
+    def in_(self, column: str, values: list[Any]) -> _Query:
+        return self._filter(column, "in", list(values))
+
+    def or_(self, expression: str) -> _Query:
+        self._filters.append(_logic_predicate(f"or({expression})"))
+        return self
+
+    def order(self, column: str, *, desc: bool = False, **_kwargs) -> _Query:
+        self._orders.append((column, desc))
+        return self
+
+    def limit(self, size: int) -> _Query:
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int) -> _Query:
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def maybe_single(self) -> _Query:
+        self._single = True
+        return self
+
+    def single(self) -> _Query:
+        self._single = True
+        return self
+
+    def _matches(self, row: dict) -> bool:
+        return all(predicate(row) for predicate in self._filters)
+
+    def _project(self, row: dict) -> dict:
+        if self._columns is None:
+            return dict(row)
+        return {column: row.get(column) for column in self._columns}
+
+    def _run(self) -> Any:
+        rows = self._client.tables[self._table]
+        if self._verb == "select":
+            selected = [row for row in rows if self._matches(row)]
+            for column, desc in reversed(self._orders):
+                present = [row for row in selected if row.get(column) is not None]
+                missing = [row for row in selected if row.get(column) is None]
+                present.sort(key=lambda row: row[column], reverse=desc)
+                selected = present + missing
+            selected = selected[self._offset :]
+            if self._limit is not None:
+                selected = selected[: self._limit]
+            result = [self._project(row) for row in selected]
+        elif self._verb == "insert":
+            result = [self._client._insert_row(self._table, row) for row in _as_rows(self._payload)]
+        elif self._verb == "upsert":
+            result = []
+            for incoming in _as_rows(self._payload):
+                key = tuple(incoming.get(column) for column in self._on_conflict)
+                existing = next(
+                    (row for row in rows if tuple(row.get(column) for column in self._on_conflict) == key),
+                    None,
+                )
+                if existing is None:
+                    result.append(self._client._insert_row(self._table, incoming))
+                else:
+                    existing.update(incoming)
+                    result.append(dict(existing))
+        elif self._verb == "update":
+            result = []
+            for row in rows:
+                if self._matches(row):
+                    row.update(self._payload)
+                    result.append(dict(row))
+        elif self._verb == "delete":
+            result = [dict(row) for row in rows if self._matches(row)]
+            self._client.tables[self._table] = [row for row in rows if not self._matches(row)]
+        else:
+            raise ValueError(f"Unsupported verb: {self._verb}")
+
+        if self._single:
+            return result[0] if result else None
+        return result
+
+    def execute(self) -> SimpleNamespace:
+        with self._client._lock:
+            data = self._run()
+        self._client._record("table", self._table, self._verb, self._payload, data)
+        return SimpleNamespace(data=data, count=None)
+
+
+def _as_rows(payload: dict | list[dict]) -> list[dict]:
+    return [payload] if isinstance(payload, dict) else list(payload)
+
+
+class _RpcCall:
+    def __init__(self, client: FakeSupabase, name: str, params: dict) -> None:
+        self._client = client
+        self._name = name
+        self._params = params
+
+    def execute(self) -> SimpleNamespace:
+        handler = self._client.rpc_handlers.get(self._name)
+        if handler is None:
+            raise RuntimeError(f"Fake Supabase has no RPC handler for {self._name}")
+        with self._client._lock:
+            data = handler(self._client, self._params)
+        self._client._record("rpc", self._name, "call", self._params, data)
+        return SimpleNamespace(data=data, count=None)
+
+
+class _FakeBucket:
+    def __init__(self, client: FakeSupabase, bucket: str) -> None:
+        self._client = client
+        self._bucket = bucket
+
+    def download(self, path: str) -> bytes:
+        with self._client._lock:
+            data = self._client.buckets[self._bucket].get(path)
+        self._client._record("storage", self._bucket, "download", None, data)
+        if data is None:
+            raise RuntimeError(f"Object not found: {self._bucket}/{path}")
+        return data
+
+    def upload(self, path: str, file: bytes, file_options: dict | None = None) -> SimpleNamespace:
+        upsert = str((file_options or {}).get("upsert", "false")).lower() == "true"
+        with self._client._lock:
+            objects = self._client.buckets[self._bucket]
+            if path in objects and not upsert:
+                raise RuntimeError(f"Object already exists: {self._bucket}/{path}")
+            objects[path] = bytes(file)
+            self._client.object_created_at[(self._bucket, path)] = _now().isoformat()
+        self._client._record("storage", self._bucket, "upload", file, None)
+        return SimpleNamespace(path=path, full_path=f"{self._bucket}/{path}")
+
+    def remove(self, paths: list[str]) -> list[dict]:
+        with self._client._lock:
+            objects = self._client.buckets[self._bucket]
+            removed = [{"name": path} for path in paths if objects.pop(path, None) is not None]
+        self._client._record("storage", self._bucket, "remove", paths, removed)
+        return removed
+
+
+    def list(self, path: str = "", options: dict | None = None) -> list[dict]:
+        """Direct children of ``path``, like storage list(); folders have no id."""
+        options = options or {}
+        prefix = f"{path.strip('/')}/" if path.strip("/") else ""
+        with self._client._lock:
+            entries: dict[str, dict] = {}
+            for name, data in self._client.buckets[self._bucket].items():
+                if not name.startswith(prefix):
+                    continue
+                child, _, rest = name[len(prefix) :].partition("/")
+                if rest:
+                    entries.setdefault(child, {"name": child, "id": None, "metadata": None})
+                else:
+                    entries[child] = {
+                        "name": child,
+                        "id": name,
+                        # Objects put into buckets directly count as long uploaded.
+                        "created_at": self._client.object_created_at.get(
+                            (self._bucket, name), "2026-01-01T00:00:00+00:00"
+                        ),
+                        "metadata": {"size": len(data)},
+                    }
+        offset = int(options.get("offset", 0))
+        listed = [entries[name] for name in sorted(entries)][offset : offset + int(options.get("limit", 100))]
+        self._client._record("storage", self._bucket, "list", path, listed)
+        return listed
+
+
+class _FakeStorage:
+    def __init__(self, client: FakeSupabase) -> None:
+        self._client = client
+
+    def from_(self, bucket: str) -> _FakeBucket:
+        return _FakeBucket(self._client, bucket)
+
+
+class FakeSupabase:
+    def __init__(
+        self,
+        *,
+        latency: Latency = 0.0,
+        rpc_handlers: dict[str, Callable[[FakeSupabase, dict], Any]] | None = None,
+    ) -> None:
+        self.tables: dict[str, list[dict]] = defaultdict(list)
+        self.buckets: dict[str, dict[str, bytes]] = defaultdict(dict)
+        self.object_created_at: dict[tuple[str, str], str] = {}
+        self.requests: list[RequestRecord] = []
+        self.latency = latency
+        self.rpc_handlers = {**DEFAULT_RPC_HANDLERS, **(rpc_handlers or {})}
+        self.storage = _FakeStorage(self)
+        self._lock = threading.RLock()
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def rpc(self, name: str, params: dict | None = None) -> _RpcCall:
+        return _RpcCall(self, name, params or {})
+
+    def _insert_row(self, table: str, row: dict) -> dict:
+        stored = {
+            **TABLE_DEFAULTS.get(table, {}),
+            "id": str(uuid.uuid4()),
+            "created_at": _now().isoformat(),
+            **row,
+        }
+        self.tables[table].append(stored)
+        return dict(stored)
+
+    def _record(self, kind: str, target: str, verb: str, request: Any, response: Any) -> None:
+        latency = self.latency(kind, target, verb) if callable(self.latency) else self.latency
+        if latency > 0:
+            time.sleep(latency)
+        record = RequestRecord(
+            kind=kind,
+            target=target,
+            verb=verb,
+            request_bytes=_payload_size(request),
+            response_bytes=_payload_size(response),
+            latency_seconds=latency,
+        )
+        with self._lock:
+            self.requests.append(record)
+
+    def request_summary(self) -> dict[tuple[str, str, str], dict[str, float]]:
+        summary: dict[tuple[str, str, str], dict[str, float]] = {}
+        with self._lock:
+            records = list(self.requests)
+        for record in records:
+            entry = summary.setdefault(
+                (record.kind, record.target, record.verb),
+                {"count": 0, "request_bytes": 0, "response_bytes": 0, "latency_seconds": 0.0},
+            )
+            entry["count"] += 1
+            entry["request_bytes"] += record.request_bytes
+            entry["response_bytes"] += record.response_bytes
+            entry["latency_seconds"] += record.latency_seconds
+        return summary
+
+    def count_requests(self, kind: str | None = None, target: str | None = None, verb: str | None = None) -> int:
+        with self._lock:
+            return sum(
+                1
+                for record in self.requests
+                if (kind is None or record.kind == kind)
+                and (target is None or record.target == target)
+                and (verb is None or record.verb == verb)
+            )
+
+
+# RPC handlers mirroring the SQL functions in supabase/migrations.
+
+
+def _diff_catalog_items_against_baseline(client: FakeSupabase, params: dict) -> dict:
+    baseline_id = params["p_baseline_catalog_id"]
+    baseline = {
+        row["sku"]: row.get("signature") or ""
+        for row in client.tables["catalog_items"]
+        if row["catalog_id"] == baseline_id
+    }
+    incoming: dict[str, str] = {}
+    for item in params.get("p_items") or []:
+        if item.get("sku") and item["sku"] not in incoming:
+            incoming[item["sku"]] = item.get("signature") or ""
+    return {
+        "new": sorted(sku for sku in incoming if sku not in baseline),
+        "updated": sorted(sku for sku, sig in incoming.items() if sku in baseline and baseline[sku] != sig),
+        "removed_items": sum(1 for sku in baseline if sku not in incoming),
+    }
+
+
+def _diff_catalog_items_against_latest(client: FakeSupabase, params: dict) -> dict:
+    # Derives sku_latest_versions on the fly: the version from the most recently
+    # published live catalog that has the SKU, as the publish triggers maintain it.
+    # The parsed catalog's own rows are never its baseline.
+    published = {
+        row["id"]: (row.get("published_at") or "", row.get("created_at") or "")
+        for row in client.tables["catalogs"]
+        if row.get("status") == "published"
+        and not row.get("deleted_at")
+        and row.get("published_at")
+        and row["id"] != params.get("p_catalog_id")
+    }
+    latest: dict[str, tuple[tuple[str, str], str]] = {}
+    for row in client.tables["catalog_items"]:
+        when = published.get(row["catalog_id"])
+        if when is not None and (row["sku"] not in latest or when > latest[row["sku"]][0]):
+            latest[row["sku"]] = (when, row.get("signature") or "")
+    incoming: dict[str, str] = {}
+    for item in params.get("p_items") or []:
+        if item.get("sku") and item["sku"] not in incoming:
+            incoming[item["sku"]] = item.get("signature") or ""
+    baseline = {
+        row["sku"] for row in client.tables["catalog_items"] if row["catalog_id"] == params["p_baseline_catalog_id"]
+    }
+    return {
+        "new": sorted(sku for sku in incoming if sku not in latest),
+        "updated": sorted(sku for sku, sig in incoming.items() if sku in latest and latest[sku][1] != sig),
+        "removed_items": sum(1 for sku in baseline if sku not in incoming),
+    }
+
+
+def _parser_job_heartbeat(client: FakeSupabase, params: dict) -> dict:
+    job = next((row for row in client.tables["parser_jobs"] if row["id"] == params["p_job_id"]), None)
+    if job is None:
+        return {"cancel": True, "reason": "job_deleted"}
+    if job.get("status") != "processing" or int(job.get("attempts") or 0) != params["p_attempts"]:
+        return {"cancel": True, "reason": "lease_lost"}
+    job["heartbeat_at"] = _now().isoformat()
+    catalog = next((row for row in client.tables["catalogs"] if row["id"] == job["catalog_id"]), None)
+    if catalog is None or catalog.get("deleted_at") or catalog.get("status") == "archived":
+        return {"cancel": True, "reason": "catalog_deleted"}
+    return {"cancel": False, "reason": None}
+
+
+def _parser_job_candidates(client: FakeSupabase, params: dict) -> list[dict]:
+    finished = sorted(
+        (
+            row
+            for row in client.tables["parser_jobs"]
+            if row.get("status") == "success" and int(row.get("total_items") or 0) > 0
+        ),
+        key=lambda row: row.get("finished_at") or "",
+        reverse=True,
+    )
+
+    def hit_ratio(rows: list[dict]) -> float | None:
+        if not rows:
+            return None
+        return sum(int(row.get("reused_items") or 0) / int(row["total_items"]) for row in rows) / len(rows)
+
+    ratio = hit_ratio(finished[:20]) or 0
+    runs = sorted(
+        client.tables["parser_runtime_history"], key=lambda row: row["created_at"], reverse=True
+    )[:20]
+
+    def rate(seconds_key: str, units_key: str) -> float | None:
+        units = sum(int(row.get(units_key) or 0) for row in runs)
+        return sum(float(row.get(seconds_key) or 0) for row in runs) / units if units else None
+
+    rates = {
+        "scan_seconds_per_page": rate("scan_seconds", "scan_pages"),
+        "parse_seconds_per_item": rate("parse_seconds", "parse_items"),
+        "upload_seconds_per_item": rate("upload_seconds", "upload_items"),
+    }
+    catalogs = {row["id"]: row for row in client.tables["catalogs"]}
+    queued = [row for row in client.tables["parser_jobs"] if row.get("status") == "queued"]
+    candidates = []
+    for row in queued:
+        catalog = catalogs.get(row["catalog_id"])
+        if catalog is None:
+            continue
+        pdf = client.buckets["catalog-pdfs"].get(catalog.get("pdf_storage_path") or "")
+        catalog_ratio = hit_ratio([job for job in finished if job["catalog_id"] == row["catalog_id"]][:5])
+        candidates.append(
+            {
+                **{
+                    key: row.get(key)
+                    for key in (
+                        "id",
+                        "catalog_id",
+                        "status",
+                        "attempts",
+                        "created_at",
+                        "priority",
+                        "total_pages",
+                        "progress_percent",
+                        "total_items",
+                        "reused_items",
+                        "profile",
+                        "retry_skus",
+                    )
+                },
+                "pdf_size_bytes": len(pdf) if pdf is not None else None,
+                "historic_hit_ratio": ratio if catalog_ratio is None else catalog_ratio,
+                **rates,
+                "pdf_content_hash": hashlib.md5(pdf).hexdigest() if pdf is not None else None,
+            }
+        )
+
+    def estimated_cost(job: dict) -> float:
+        size = job["pdf_size_bytes"] or 0
+        pages = (
+            job["total_pages"]
+            or (max(1, round(size / params.get("p_pdf_bytes_per_page", 400_000))) if size else None)
+            or params.get("p_default_pages", 50)
+        )
+        if job["total_items"] > 0:
+            pending = job["total_items"] * (1 - (job["progress_percent"] or 0) / 100)
+        else:
+            pending = pages * params.get("p_items_per_page", 16) * (1 - job["historic_hit_ratio"])
+        item_seconds = (job["parse_seconds_per_item"] or params.get("p_default_parse_seconds_per_item", 0.45)) + (
+            job["upload_seconds_per_item"] or params.get("p_default_upload_seconds_per_item", 0.15)
+        )
+        scan_seconds = job["scan_seconds_per_page"] or params.get("p_default_scan_seconds_per_page", 0.25)
+        return max(1.0, pages * scan_seconds + max(0.0, pending) * item_seconds)
+
+    def response_ratio(job: dict) -> float:
+        cost = estimated_cost(job)
+        waited = (_now() - datetime.fromisoformat(job["created_at"])).total_seconds()
+        return (max(0.0, waited) + cost) / cost
+
+    candidates.sort(key=lambda job: job["created_at"])
+    candidates.sort(key=lambda job: (int(job["priority"] or 0), response_ratio(job)), reverse=True)
+    return candidates[: max(int(params.get("p_limit") or 25), 1)]
+
+
+PARSER_JOB_ITEM_SYNC_FIELDS = ("quick_fingerprint", "page_no", "sku_bbox", "image_bbox", "status", "error_log")
+CATALOG_ITEM_SYNC_FIELDS = (
+    "name",
+    "upc",
+    "pack",
+    "category",
+    "image_storage_path",
+    "parse_issues",
+    "approved",
+    "signature",
+    "quick_fingerprint",
+    "change_type",
+    "display_order",
+    "source_page_no",
+    "source_top",
+    "sprite_path",
+    "sprite_offset",
+)
+
+
+def _sync_guarded(
+    client: FakeSupabase,
+    table: str,
+    owner: dict[str, Any],
+    rows: list[dict],
+    compare_fields: tuple[str, ...],
+    update_fields: tuple[str, ...],
+) -> int:
+    existing_by_sku = {
+        row["sku"]: row
+        for row in client.tables[table]
+        if all(row.get(key) == value for key, value in owner.items())
+    }
+    written = 0
+    for incoming in {row["sku"]: row for row in rows}.values():
+        existing = existing_by_sku.get(incoming["sku"])
+        if existing is None:
+            client._insert_row(
+                table,
+                {**owner, "sku": incoming["sku"], **{field: incoming.get(field) for field in update_fields}},
+            )
+            written += 1
+        elif any(existing.get(field) != incoming.get(field) for field in compare_fields):
+            existing.update({field: incoming.get(field) for field in update_fields})
+            written += 1
+    return written
+
+
+def _prune(client: FakeSupabase, table: str, owner: dict[str, Any], keep_skus: list[str]) -> int:
+    keep = set(keep_skus or [])
+    before = len(client.tables[table])
+    client.tables[table] = [
+        row
+        for row in client.tables[table]
+        if not (all(row.get(key) == value for key, value in owner.items()) and row["sku"] not in keep)
+    ]
+    return before - len(client.tables[table])
+
+
+DEFAULT_RPC_HANDLERS: dict[str, Callable[[FakeSupabase, dict], Any]] = {
+    "diff_catalog_items_against_baseline": _diff_catalog_items_against_baseline,
+    "diff_catalog_items_against_latest": _diff_catalog_items_against_latest,
+    "parser_job_heartbeat": _parser_job_heartbeat,
+    "parser_job_candidates": _parser_job_candidates,
+    "sync_parser_job_items": lambda client, params: _sync_guarded(
+        client,
+        "parser_job_items",
+        {"parser_job_id": params["p_job_id"], "catalog_id": params["p_catalog_id"]},
+        params["p_rows"],
+        PARSER_JOB_ITEM_SYNC_FIELDS,
+        PARSER_JOB_ITEM_SYNC_FIELDS + ("finished_at",),
+    ),
+    "prune_parser_job_items": lambda client, params: _prune(
+        client, "parser_job_items", {"parser_job_id": params["p_job_id"]}, params["p_keep_skus"]
+    ),
+    "sync_catalog_items": lambda client, params: _sync_guarded(
+        client,
+        "catalog_items",
+        {"catalog_id": params["p_catalog_id"]},
+        params["p_rows"],
+        CATALOG_ITEM_SYNC_FIELDS,
+        CATALOG_ITEM_SYNC_FIELDS,
+    ),
+    "prune_catalog_items": lambda client, params: _prune(
+        client, "catalog_items", {"catalog_id": params["p_catalog_id"]}, params["p_keep_skus"]
+    ),
+}
+
+
+def iso_ago(**delta: float) -> str:
+    return (_now() - timedelta(**delta)).isoformat()
+
+
+def queue_catalog(
+    client: FakeSupabase,
+    items: list,
+    *,
+    pdf_path: str = "catalog.pdf",
+    version_label: str = "Test",
+    **job_fields: Any,
+) -> str:
+    """Upload a synthetic catalog PDF of ``items`` and queue a parser job for it."""
+    from synthetic_catalog import build_catalog_pdf
+
+    client.buckets["catalog-pdfs"][pdf_path] = build_catalog_pdf(items)
+    catalog = client.table("catalogs").insert(
+        {"version_label": version_label, "pdf_storage_path": pdf_path}
+    ).execute().data[0]
+    client.table("parser_jobs").insert({"catalog_id": catalog["id"], **job_fields}).execute()
+    return catalog["id"]
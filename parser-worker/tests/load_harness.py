@@ -0,0 +1,147 @@
+"""Load harness for the parser worker against the in-memory Supabase fake.
+
+Queues N synthetic catalogs that share most SKUs with their predecessor, runs them
+through ``worker.claim_next_job``/``worker.process_job`` and reports throughput,
+requests per item and where request time went.
+
+    python tests/load_harness.py --catalogs 5 --items 96 --latency-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, Path(__file__).resolve().parent):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import worker  # noqa: E402
+from fake_supabase import FakeSupabase, Latency, queue_catalog  # noqa: E402
+from synthetic_catalog import synthetic_items  # noqa: E402
+
+
+@dataclass
+class LoadReport:
+    jobs: int
+    items: int
+    elapsed_seconds: float
+    jobs_per_minute: float
+    requests: int
+    requests_per_item: float
+    request_seconds: float
+    request_bytes: int
+    response_bytes: int
+    job_statuses: dict[str, int]
+    breakdown: list[dict] = field(default_factory=list)
+
+
+def queue_synthetic_catalogs(
+    client: FakeSupabase,
+    *,
+    catalogs: int,
+    items_per_catalog: int,
+    changed_fraction: float = 0.1,
+) -> list[str]:
+    catalog_ids: list[str] = []
+    changed_count = int(items_per_catalog * changed_fraction)
+    for index in range(catalogs):
+        items = synthetic_items(items_per_catalog)
+        if index > 0 and changed_count:
+            items[:changed_count] = synthetic_items(changed_count, variant=f"v{index}")
+        catalog_ids.append(
+            queue_catalog(
+                client, items, pdf_path=f"synthetic/catalog-{index}.pdf", version_label=f"Synthetic {index}"
+            )
+        )
+    client.requests.clear()
+    return catalog_ids
+
+
+def _publish(client: FakeSupabase, catalog_id: str) -> None:
+    for row in client.tables["catalogs"]:
+        if row["id"] == catalog_id:
+            row.update({"status": "published", "published_at": worker.now_iso()})
+
+
+def run_load(
+    *,
+    catalogs: int = 3,
+    items_per_catalog: int = 48,
+    latency: Latency = 0.0,
+    changed_fraction: float = 0.1,
+    client: FakeSupabase | None = None,
+) -> LoadReport:
+    client = client or FakeSupabase(latency=latency)
+    queue_synthetic_catalogs(
+        client,
+        catalogs=catalogs,
+        items_per_catalog=items_per_catalog,
+        changed_fraction=changed_fraction,
+    )
+
+    started = time.monotonic()
+    jobs = 0
+    while True:
+        job = worker.claim_next_job(client)
+        if not job:
+            break
+        worker.process_job(client, job)
+        jobs += 1
+        # Publish so the next catalog is diffed against this one, as an admin would.
+        _publish(client, job["catalog_id"])
+    elapsed = time.monotonic() - started
+
+    summary = client.request_summary()
+    items = catalogs * items_per_catalog
+    requests = sum(int(entry["count"]) for entry in summary.values())
+    statuses: dict[str, int] = {}
+    for row in client.tables["parser_jobs"]:
+        statuses[row["status"]] = statuses.get(row["status"], 0) + 1
+
+    breakdown = [
+        {"kind": kind, "target": target, "verb": verb, **entry}
+        for (kind, target, verb), entry in sorted(
+            summary.items(), key=lambda pair: pair[1]["count"], reverse=True
+        )
+    ]
+    return LoadReport(
+        jobs=jobs,
+        items=items,
+        elapsed_seconds=round(elapsed, 3),
+        jobs_per_minute=round(jobs * 60 / elapsed, 2) if elapsed else 0.0,
+        requests=requests,
+        requests_per_item=round(requests / items, 2) if items else 0.0,
+        request_seconds=round(sum(entry["latency_seconds"] for entry in summary.values()), 3),
+        request_bytes=int(sum(entry["request_bytes"] for entry in summary.values())),
+        response_bytes=int(sum(entry["response_bytes"] for entry in summary.values())),
+        job_statuses=statuses,
+        breakdown=breakdown,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--catalogs", type=int, default=3)
+    parser.add_argument("--items", type=int, default=48, help="items per catalog")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency per request")
+    parser.add_argument("--changed-fraction", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    report = run_load(
+        catalogs=args.catalogs,
+        items_per_catalog=args.items,
+        latency=args.latency_ms / 1000,
+        changed_fraction=args.changed_fraction,
+    )
+    print(json.dumps(asdict(report), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Builds small Bloom-style catalog PDFs for tests and load runs.
+
+Pages hold a 4x4 grid of cells: SKU, name, UPC and pack lines on top of a JPEG
+product photo, laid out so the real parser maps every SKU to its image.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+from dataclasses import dataclass
+
+from PIL import Image
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+GRID_COLUMNS = 4
+GRID_ROWS = 4
+CELL_LEFT = 20
+CELL_WIDTH = 145
+CELL_TOP = 140
+CELL_HEIGHT = 155
+FONT_SIZE = 9
+
+
+@dataclass
+class SyntheticItem:
+    sku: str
+    name: str
+    upc: str
+    pack: str
+    image_seed: str
+
+
+def synthetic_items(count: int, *, prefix: str = "BLM", start: int = 1, variant: str = "") -> list[SyntheticItem]:
+    items: list[SyntheticItem] = []
+    for number in range(start, start + count):
+        items.append(
+            SyntheticItem(
+                sku=f"{prefix}{number:04d}",
+                name=f"Synthetic Item {number:04d}{(' ' + variant) if variant else ''}",
+                upc=f"0{number:011d}",
+                pack=f"{(number % 24) + 1}/{(number % 9) + 1}oz",
+                image_seed=f"{prefix}{number}{variant}",
+            )
+        )
+    return items
+
+
+def _jpeg_bytes(seed: str) -> bytes:
+    digest = hashlib.sha256(seed.encode("utf-8")).digest()
+    image = Image.new("RGB", (24, 16), (digest[0], digest[1], digest[2]))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=80)
+    return buffer.getvalue()
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _cell_origin(slot: int) -> tuple[float, float]:
+    column = slot % GRID_COLUMNS
+    row = slot // GRID_COLUMNS
+    return CELL_LEFT + column * CELL_WIDTH, CELL_TOP + row * CELL_HEIGHT
+
+
+def _page_content(items: list[SyntheticItem]) -> tuple[bytes, list[bytes]]:
+    commands: list[str] = []
+    images: list[bytes] = []
+    for slot, item in enumerate(items):
+        left, top = _cell_origin(slot)
+        for offset, text in enumerate((item.sku, item.name, item.upc, item.pack)):
+            baseline = PAGE_HEIGHT - (top + offset * 12) - FONT_SIZE
+            commands.append(
+                f"BT /F1 {FONT_SIZE} Tf {left + 10:.2f} {baseline:.2f} Td ({_escape(text)}) Tj ET"
+            )
+        image_left = left + 5
+        image_bottom = PAGE_HEIGHT - (top + 140)
+        commands.append(f"q 120 0 0 80 {image_left:.2f} {image_bottom:.2f} cm /Im{slot + 1} Do Q")
+        images.append(_jpeg_bytes(item.image_seed))
+    return "\n".join(commands).encode("latin-1"), images
+
+
+def build_catalog_pdf(items: list[SyntheticItem]) -> bytes:
+    """Render ``items`` into a PDF, 16 per page, in reading order."""
+    per_page = GRID_COLUMNS * GRID_ROWS
+    pages = [items[index : index + per_page] for index in range(0, len(items), per_page)] or [[]]
+
+    objects: list[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_ref = add(b"")
+    pages_ref = add(b"")
+    font_ref = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_refs: list[int] = []
+    for page_items in pages:
+        content, images = _page_content(page_items)
+        image_refs = []
+        for jpeg in images:
+            with Image.open(io.BytesIO(jpeg)) as decoded:
+                width, height = decoded.size
+            image_refs.append(
+                add(
+                    (
+                        f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                        f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /DCTDecode "
+                        f"/Length {len(jpeg)} >>\nstream\n"
+                    ).encode("latin-1")
+                    + jpeg
+                    + b"\nendstream"
+                )
+            )
+        content_ref = add(
+            f"<< /Length {len(content)} >>\nstream\n".encode("latin-1") + content + b"\nendstream"
+        )
+        xobjects = " ".join(f"/Im{index + 1} {ref} 0 R" for index, ref in enumerate(image_refs))
+        page_refs.append(
+            add(
+                (
+                    f"<< /Type /Page /Parent {pages_ref} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                    f"/Resources << /Font << /F1 {font_ref} 0 R >> /XObject << {xobjects} >> >> "
+                    f"/Contents {content_ref} 0 R >>"
+                ).encode("latin-1")
+            )
+        )
+
+    objects[catalog_ref - 1] = f"<< /Type /Catalog /Pages {pages_ref} 0 R >>".encode("latin-1")
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    objects[pages_ref - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>".encode("latin-1")
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets: list[int] = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n")
+    xref_offset = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        output.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    output.write(
+        (
+            f"trailer\n<< /Size {len(objects) + 1} /Root {catalog_ref} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        ).encode("latin-1")
+    )
+    return output.getvalue()
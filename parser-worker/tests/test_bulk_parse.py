@@ -0,0 +1,58 @@
+import json
+
+import worker
+from bulk_parse import bulk_parse, expand_inputs, load_cache
+from fake_supabase import FakeSupabase
+from synthetic_catalog import build_catalog_pdf, synthetic_items
+
+
+def _write_catalogs(directory, count: int = 2, items: int = 40):
+    directory.mkdir()
+    for index in range(count):
+        # Identical catalogs share every photo, so images must be stored once.
+        (directory / f"catalog-{index}.pdf").write_bytes(build_catalog_pdf(synthetic_items(items)))
+    return directory
+
+
+def test_expand_inputs_accepts_directories_globs_and_files(tmp_path):
+    catalogs = _write_catalogs(tmp_path / "catalogs")
+    (catalogs / "notes.txt").write_text("not a pdf")
+
+    assert len(expand_inputs([str(catalogs)])) == 2
+    assert len(expand_inputs([str(catalogs / "*-1.pdf"), str(catalogs / "catalog-1.pdf")])) == 1
+
+
+def test_bulk_parse_writes_jsonl_and_content_addressed_images(tmp_path):
+    catalogs = _write_catalogs(tmp_path / "catalogs")
+    out = tmp_path / "out" / "items.jsonl"
+    images_dir = tmp_path / "images"
+
+    report, records = bulk_parse([str(catalogs)], out=out, images_dir=images_dir, jobs=2, pages_per_task=1)
+
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert lines == records
+    assert (report.files, report.pages, report.items, report.errors) == (2, 6, 80, 0)
+    assert [line["sku"] for line in lines[:40]] == [f"BLM{number:04d}" for number in range(1, 41)]
+    assert len(list(images_dir.rglob("*.jpg"))) == 40
+    assert all((images_dir / line["image_path"]).exists() for line in lines)
+
+
+def test_loaded_cache_is_reused_by_the_worker(tmp_path):
+    catalogs = _write_catalogs(tmp_path / "catalogs", count=1)
+    images_dir = tmp_path / "images"
+    _, records = bulk_parse([str(catalogs)], out=tmp_path / "items.jsonl", images_dir=images_dir, jobs=1)
+
+    client = FakeSupabase()
+    assert load_cache(client, records, images_dir=images_dir) == 40
+
+    client.buckets["catalog-pdfs"]["catalog.pdf"] = (catalogs / "catalog-0.pdf").read_bytes()
+    catalog = client.table("catalogs").insert(
+        {"version_label": "Backfilled", "pdf_storage_path": "catalog.pdf"}
+    ).execute().data[0]
+    client.table("parser_jobs").insert({"catalog_id": catalog["id"]}).execute()
+    client.requests.clear()
+    assert worker.process_job(client, worker.claim_next_job(client))
+
+    summary = next(row for row in client.tables["catalogs"] if row["id"] == catalog["id"])["parse_summary"]
+    assert summary["reused_items"] == 40
+    assert client.count_requests("storage", "product-images", "upload") == 0
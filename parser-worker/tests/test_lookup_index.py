@@ -0,0 +1,46 @@
+import gzip
+import json
+
+from fake_supabase import FakeSupabase
+from load_harness import run_load
+from lookup_index import build_lookup_index, gtin_key
+from snapshot import SNAPSHOT_BUCKET, lookup_index_path
+
+
+def test_gtin_key_normalizes_upc_and_ean_variants():
+    variants = ["032797004947", "32797004947", "0032797004947", "00032797004947", "0-32797-00494-7"]
+    assert {gtin_key(value) for value in variants} == {"0032797004947"}
+    # An 11-digit UPC-A without its check digit gets it computed.
+    assert gtin_key("03279700494") == "0032797004947"
+    assert gtin_key("4006381333931") == "4006381333931"
+    assert gtin_key("12345") == ""
+    assert gtin_key("") == ""
+
+
+def test_index_postings_point_into_its_own_sku_list():
+    index = build_lookup_index(
+        "catalog-1",
+        [
+            {"sku": "RS100", "name": "Red Rose Bunch", "upc": "032797004947"},
+            {"sku": "TU200", "name": "Tulip Mix", "upc": None},
+            {"sku": "RS101", "name": "Rose Petals", "upc": "4006381333931"},
+        ],
+    )
+
+    assert index["skus"] == ["RS100", "TU200", "RS101"]
+    assert index["upc"] == {"0032797004947": [0], "4006381333931": [2]}
+    assert index["sku_prefix"]["rs"] == [0, 2]
+    assert index["name_prefix"]["ro"] == [0, 2]
+    assert index["trigrams"]["ros"] == [0, 2]
+    # Both barcode variants are searchable by trigram.
+    assert index["trigrams"]["032"] == [0]
+
+
+def test_snapshot_upload_writes_the_lookup_index_next_to_it():
+    client = FakeSupabase()
+    run_load(catalogs=1, items_per_catalog=16, client=client)
+
+    catalog = client.tables["catalogs"][-1]
+    stored = client.buckets[SNAPSHOT_BUCKET][lookup_index_path(catalog["snapshot_path"])]
+    index = json.loads(gzip.decompress(stored))
+    assert sorted(index["skus"]) == sorted(row["sku"] for row in client.tables["catalog_items"])
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+
+from fake_supabase import FakeSupabase
+from load_harness import run_load
+from maintenance import plan_cache_compaction, run_maintenance
+
+NOW = datetime.now(timezone.utc)
+
+
+def _cache_row(sku: str, fingerprint: str, days_ago: int, image: str = "") -> dict:
+    return {
+        "sku": sku,
+        "quick_fingerprint": fingerprint,
+        "strong_fingerprint": f"strong-{fingerprint}",
+        "name": sku,
+        "category": "Roses",
+        "image_storage_path": image,
+        "updated_at": (NOW - timedelta(days=days_ago)).isoformat(),
+    }
+
+
+def _history(client: FakeSupabase, sku: str, count: int) -> list[str]:
+    """Adds ``count`` old fingerprints for ``sku``, each with its own image; returns the image paths."""
+    images = []
+    for index in range(count):
+        image = f"catalog-items/old-catalog/{sku}-{index}.jpg"
+        client.buckets["product-images"][image] = b"old image"
+        client.table("item_parse_cache").insert(_cache_row(sku, f"old-{index}", 30 + index, image)).execute()
+        images.append(image)
+    return images
+
+
+def test_compaction_keeps_in_use_and_newest_fingerprints():
+    rows = [_cache_row("A1", f"fp{index}", index) for index in range(5)]
+    kept, stale = plan_cache_compaction(rows, {("A1", "fp4")}, keep=2)
+
+    assert sorted(row["quick_fingerprint"] for row in kept) == ["fp0", "fp1", "fp4"]
+    assert sorted(row["quick_fingerprint"] for row in stale) == ["fp2", "fp3"]
+
+
+def test_dry_run_reports_and_apply_deletes_idempotently():
+    client = FakeSupabase()
+    run_load(catalogs=1, items_per_catalog=16, client=client)
+    sku = client.tables["catalog_items"][0]["sku"]
+    old_images = _history(client, sku, 4)
+    client.buckets["product-images"]["catalog-items/gone/lost.jpg"] = b"orphan"
+    # Uploaded moments ago and not recorded anywhere yet: too new to delete.
+    client.storage.from_("product-images").upload("catalog-items/pending/new.jpg", b"new")
+    cache_before = len(client.tables["item_parse_cache"])
+
+    report = run_maintenance(client, keep=2, min_age_hours=1)
+
+    assert report.dry_run
+    assert report.cache_rows == cache_before
+    assert report.cache_rows_stale == 3  # the catalog's fingerprint plus the newest old one stay
+    assert report.images_orphaned == 4  # the stale rows' images and the lost one
+    assert report.images_too_new == 1
+    assert len(client.tables["item_parse_cache"]) == cache_before
+    assert "catalog-items/gone/lost.jpg" in client.buckets["product-images"]
+
+    applied = run_maintenance(client, keep=2, min_age_hours=1, apply=True)
+
+    assert applied.cache_rows_deleted == 3
+    assert applied.images_deleted == 4
+    remaining = [path for path in old_images if path in client.buckets["product-images"]]
+    assert remaining == [old_images[0]]
+    assert "catalog-items/pending/new.jpg" in client.buckets["product-images"]
+    # Every catalog image survives.
+    assert all(row["image_storage_path"] in client.buckets["product-images"] for row in client.tables["catalog_items"])
+
+    again = run_maintenance(client, keep=2, min_age_hours=1, apply=True)
+    assert (again.cache_rows_deleted, again.images_deleted) == (0, 0)
+
+
+def test_fingerprints_of_active_jobs_are_kept():
+    client = FakeSupabase()
+    _history(client, "A1", 3)
+    job = client.table("parser_jobs").insert({"catalog_id": "catalog-1", "status": "processing"}).execute().data[0]
+    client.table("parser_job_items").insert(
+        {"parser_job_id": job["id"], "sku": "A1", "quick_fingerprint": "old-2"}
+    ).execute()
+
+    report = run_maintenance(client, keep=0, min_age_hours=0, apply=True)
+
+    assert report.cache_rows_deleted == 2
+    assert [row["quick_fingerprint"] for row in client.tables["item_parse_cache"]] == ["old-2"]
+    assert report.images_deleted == 2
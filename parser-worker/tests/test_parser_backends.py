@@ -0,0 +1,40 @@
+import pytest
+
+from parser import EXTRACTION_BACKENDS, parse_catalog_pdf, scan_catalog_fast
+from synthetic_catalog import build_catalog_pdf, synthetic_items
+
+CORPUS = {
+    "single_page": synthetic_items(5),
+    "full_pages": synthetic_items(48),
+    "partial_last_page": synthetic_items(37, prefix="SHL", start=480),
+    "variant_names": synthetic_items(20, variant="(v2)"),
+}
+
+
+@pytest.fixture(params=sorted(CORPUS))
+def corpus_pdf(request, tmp_path):
+    pdf_path = tmp_path / f"{request.param}.pdf"
+    pdf_path.write_bytes(build_catalog_pdf(CORPUS[request.param]))
+    return pdf_path
+
+
+def test_backends_produce_identical_quick_fingerprints(corpus_pdf):
+    reference = scan_catalog_fast(corpus_pdf, backend="pdfplumber")
+    assert reference
+
+    for backend in EXTRACTION_BACKENDS:
+        candidates = scan_catalog_fast(corpus_pdf, backend=backend)
+        assert [(c.sku, c.page_no, c.quick_fingerprint) for c in candidates] == [
+            (c.sku, c.page_no, c.quick_fingerprint) for c in reference
+        ], backend
+
+
+def test_backends_produce_identical_parsed_items(corpus_pdf):
+    reference = parse_catalog_pdf(corpus_pdf, backend="pdfplumber")
+
+    assert parse_catalog_pdf(corpus_pdf, backend="pypdf") == reference
+
+
+def test_unknown_backend_is_rejected(corpus_pdf):
+    with pytest.raises(ValueError, match="Unknown text extraction backend"):
+        scan_catalog_fast(corpus_pdf, backend="ocr")
@@ -0,0 +1,86 @@
+import dataclasses
+import io
+
+from pypdf import PdfReader, PdfWriter
+
+import parser
+import synthetic_catalog
+from parser import LAYOUT_HEURISTIC, LAYOUT_TEMPLATE, parse_catalog_pdf, scan_catalog_fast
+from synthetic_catalog import build_catalog_pdf, synthetic_items
+
+
+def _pdf(tmp_path, count: int):
+    pdf_path = tmp_path / "catalog.pdf"
+    pdf_path.write_bytes(build_catalog_pdf(synthetic_items(count)))
+    return pdf_path
+
+
+def _without_layout(candidates):
+    return [dataclasses.replace(candidate, layout=LAYOUT_HEURISTIC) for candidate in candidates]
+
+
+def test_later_pages_use_the_inferred_template(tmp_path):
+    candidates = scan_catalog_fast(_pdf(tmp_path, 60))
+
+    layouts = {candidate.page_no: candidate.layout for candidate in candidates}
+    # Pages 1-2 are samples; the partly filled last page still fits the grid.
+    assert layouts == {1: LAYOUT_HEURISTIC, 2: LAYOUT_HEURISTIC, 3: LAYOUT_TEMPLATE, 4: LAYOUT_TEMPLATE}
+
+
+def test_template_matches_the_heuristic(tmp_path):
+    pdf_path = _pdf(tmp_path, 60)
+
+    assert _without_layout(scan_catalog_fast(pdf_path)) == _without_layout(
+        scan_catalog_fast(pdf_path, grid_template=False)
+    )
+    assert parse_catalog_pdf(pdf_path) == parse_catalog_pdf(pdf_path, grid_template=False)
+
+
+def test_pages_off_the_grid_fall_back_to_the_heuristic(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "catalog.pdf"
+    items = synthetic_items(48)
+    first_pages = build_catalog_pdf(items[:32])
+    # Shift the third page's cells so they no longer line up with the template.
+    monkeypatch.setattr(synthetic_catalog, "CELL_LEFT", 35)
+    shifted = build_catalog_pdf(items[32:])
+
+    writer = PdfWriter()
+    for source in (first_pages, shifted):
+        for page in PdfReader(io.BytesIO(source)).pages:
+            writer.add_page(page)
+    output = io.BytesIO()
+    writer.write(output)
+    pdf_path.write_bytes(output.getvalue())
+
+    candidates = scan_catalog_fast(pdf_path)
+    assert {candidate.page_no: candidate.layout for candidate in candidates}[3] == LAYOUT_HEURISTIC
+    assert [candidate.sku for candidate in candidates] == [item.sku for item in items]
+
+
+def test_page_parses_reuse_the_scan_template_and_document(tmp_path, monkeypatch):
+    pdf_path = _pdf(tmp_path, 60)
+    candidates = scan_catalog_fast(pdf_path)
+    template = next(candidate.template for candidate in candidates if candidate.page_no == 3)
+    assert template is not None
+
+    opened: list[parser._OpenDocument] = []
+    original = parser._OpenDocument
+
+    def open_document(*args):
+        opened.append(original(*args))
+        return opened[-1]
+
+    monkeypatch.setattr(parser._open_documents, "document", None)
+    monkeypatch.setattr(parser, "_OpenDocument", open_document)
+    by_page = [
+        item
+        for page_no in (1, 2, 3, 4)
+        for item in parse_catalog_pdf(
+            pdf_path,
+            page_numbers={page_no},
+            template=template if page_no > 2 else None,
+        )
+    ]
+
+    assert by_page == parse_catalog_pdf(pdf_path)
+    assert len(opened) == 1
@@ -0,0 +1,50 @@
+import hashlib
+
+import worker
+from fake_supabase import FakeSupabase
+from parser import ParsedItem, QuickCandidate, parse_catalog_pdf, scan_catalog_fast
+from synthetic_catalog import _jpeg_bytes, build_catalog_pdf, synthetic_items
+
+
+def _scan(tmp_path, items, name="catalog.pdf"):
+    pdf_path = tmp_path / name
+    pdf_path.write_bytes(build_catalog_pdf(items))
+    return pdf_path, {candidate.sku: candidate for candidate in scan_catalog_fast(pdf_path)}
+
+
+def test_quick_scan_digests_raw_image_streams(tmp_path):
+    items = synthetic_items(4)
+    _, candidates = _scan(tmp_path, items)
+
+    for item in items:
+        expected = hashlib.sha256(_jpeg_bytes(item.image_seed)).hexdigest()
+        assert candidates[item.sku].image_digest == expected
+
+
+def test_swapped_photo_changes_only_that_fingerprint(tmp_path):
+    items = synthetic_items(4)
+    _, before = _scan(tmp_path, items, "before.pdf")
+    items[1].image_seed = "replacement photo"
+    _, after = _scan(tmp_path, items, "after.pdf")
+
+    changed = sorted(sku for sku in before if before[sku].quick_fingerprint != after[sku].quick_fingerprint)
+    assert changed == [items[1].sku]
+
+
+def test_heavy_parse_reports_the_same_digest(tmp_path):
+    pdf_path, candidates = _scan(tmp_path, synthetic_items(4))
+
+    for item in parse_catalog_pdf(pdf_path):
+        assert item.image_digest == candidates[item.sku].image_digest
+
+
+def test_item_signature_keeps_hashing_the_extracted_image():
+    item = ParsedItem("BLM0001", "Rose", None, None, "Roses", [], b"jpeg bytes", "jpg", image_digest="raw")
+    candidate = QuickCandidate("BLM0001", 1, {"top": 0}, None, [], "fp", image_digest="raw")
+
+    _, signature = worker._store_parsed_item(FakeSupabase(), catalog_id="catalog", item=item, candidate=candidate)
+
+    # Baselines written before the raw-stream digest existed must still match.
+    assert signature == worker._item_signature(
+        "BLM0001", "Rose", None, None, "Roses", hashlib.sha256(b"jpeg bytes").hexdigest()
+    )
@@ -0,0 +1,61 @@
+import urllib.error
+from datetime import datetime, timezone
+
+import queue_probe
+from queue_probe import _claimable_jobs_filter, _count_from_content_range
+
+
+def test_count_from_content_range():
+    assert _count_from_content_range("0-0/12") == 12
+    assert _count_from_content_range("*/0") == 0
+    assert _count_from_content_range("*/*") == 0
+    assert _count_from_content_range(None) == 0
+
+
+def test_claimable_filter_matches_queued_and_expired_leases(monkeypatch):
+    monkeypatch.setenv("PARSER_LEASE_SECONDS", "60")
+    monkeypatch.setenv("PARSER_STALE_PROCESSING_MINUTES", "15")
+    now = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+    expression = _claimable_jobs_filter(now)
+
+    assert expression.startswith("(status.eq.queued,")
+    assert 'heartbeat_at.lt."2026-10-19T11:59:00+00:00"' in expression
+    assert 'started_at.lt."2026-10-19T11:45:00+00:00"' in expression
+    assert expression.count("(") == expression.count(")")
+
+
+def _unreachable(*_args, **_kwargs):
+    raise urllib.error.URLError("timed out")
+
+
+def test_probe_retries_once_before_failing_open(monkeypatch, tmp_path):
+    calls = []
+
+    def flaky_count():
+        calls.append(1)
+        if len(calls) == 1:
+            raise urllib.error.HTTPError("url", 503, "Service Unavailable", None, None)
+        return 0
+
+    monkeypatch.setattr(queue_probe, "count_claimable_jobs", flaky_count)
+    monkeypatch.setattr(queue_probe, "count_stale_snapshots", lambda: 0)
+    assert queue_probe.probe_counts() == (0, 0)
+    assert len(calls) == 2
+
+    output = tmp_path / "github_output"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+    monkeypatch.setattr(queue_probe, "count_claimable_jobs", _unreachable)
+
+    assert queue_probe.main([]) == 0
+    assert "has_work=true" in output.read_text().splitlines()
+
+
+def test_probe_without_credentials_fails_open(monkeypatch, tmp_path):
+    output = tmp_path / "github_output"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.delenv("SUPABASE_SERVICE_ROLE_KEY", raising=False)
+
+    assert queue_probe.main([]) == 0
+    assert output.read_text().splitlines() == ["has_work=true", "claimable_jobs=unknown", "stale_snapshots=unknown"]
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import worker
+from fake_supabase import FakeSupabase, queue_catalog
+from synthetic_catalog import synthetic_items
+from worker import _diff_against_baseline
+
+
+class _RpcClient:
+    def __init__(self, data: dict):
+        self.data = data
+        self.calls: list[tuple[str, dict]] = []
+
+    def rpc(self, name: str, params: dict):
+        self.calls.append((name, params))
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=self.data))
+
+
+def test_diff_without_baseline_still_checks_published_versions():
+    client = _RpcClient({"new": ["B2"], "removed_items": 0})
+    change_types, removed = _diff_against_baseline(client, None, {"A1": "s1", "B2": "s2"}, catalog_id="parsed")
+
+    assert change_types == {"A1": "unchanged", "B2": "new"}
+    assert removed == 0
+    name, params = client.calls[0]
+    assert params["p_baseline_catalog_id"] is None
+    assert params["p_catalog_id"] == "parsed"
+
+
+def test_diff_maps_rpc_result_and_defaults_to_unchanged():
+    client = _RpcClient({"new": ["C3"], "updated": ["B2"], "removed_items": 4})
+    change_types, removed = _diff_against_baseline(
+        client,
+        "baseline-id",
+        {"A1": "s1", "B2": "s2", "C3": "s3"},
+        catalog_id="parsed",
+    )
+
+    assert change_types == {"A1": "unchanged", "B2": "updated", "C3": "new"}
+    assert removed == 4
+    name, params = client.calls[0]
+    assert name == "diff_catalog_items_against_latest"
+    assert params["p_baseline_catalog_id"] == "baseline-id"
+    assert {"sku": "B2", "signature": "s2"} in params["p_items"]
+
+
+def _parse_and_publish(client: FakeSupabase, label: str, items, *, publish: bool = True) -> dict:
+    catalog_id = queue_catalog(client, items, pdf_path=f"{label}.pdf", version_label=label)
+    worker.process_job(client, worker.claim_next_job(client))
+    if publish:
+        client.table("catalogs").update({"status": "published", "published_at": worker.now_iso()}).eq(
+            "id", catalog_id
+        ).execute()
+    return next(row for row in client.tables["catalogs"] if row["id"] == catalog_id)
+
+
+def test_sku_missing_from_the_latest_catalog_keeps_its_published_version():
+    client = FakeSupabase()
+    _parse_and_publish(client, "january", synthetic_items(16))
+    # February drops the last eight SKUs; March brings them back unchanged.
+    _parse_and_publish(client, "february", synthetic_items(8))
+    march = _parse_and_publish(client, "march", synthetic_items(16), publish=False)
+
+    change_types = {
+        row["sku"]: row["change_type"] for row in client.tables["catalog_items"] if row["catalog_id"] == march["id"]
+    }
+    assert set(change_types.values()) == {"unchanged"}
+    assert march["parse_summary"]["new_items"] == 0
+
+
+def test_reparsed_published_catalog_is_not_diffed_against_itself():
+    client = FakeSupabase()
+    _parse_and_publish(client, "january", synthetic_items(16))
+    items = synthetic_items(16)
+    items[:4] = synthetic_items(4, variant="spring")
+    march = _parse_and_publish(client, "march", items)
+    client.table("parser_jobs").insert({"catalog_id": march["id"]}).execute()
+
+    worker.process_job(client, worker.claim_next_job(client))
+
+    summary = next(row for row in client.tables["catalogs"] if row["id"] == march["id"])["parse_summary"]
+    assert (summary["updated_items"], summary["unchanged_items"]) == (4, 12)
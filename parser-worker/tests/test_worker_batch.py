@@ -0,0 +1,62 @@
+import threading
+import time
+
+import worker
+
+
+def _install_queue(monkeypatch, job_count: int, *, work_seconds: float = 0.05):
+    queue = [{"id": f"job-{index}", "catalog_id": f"catalog-{index}"} for index in range(job_count)]
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0, "processed": [], "remaining": []}
+
+    def fake_claim(_client, *, remaining_seconds=None):
+        with lock:
+            state["remaining"].append(remaining_seconds)
+            return queue.pop(0) if queue else None
+
+    def fake_process(_client, job, *, deadline=None, parse_executor=None):
+        assert parse_executor is not None
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(work_seconds)
+        with lock:
+            state["active"] -= 1
+            state["processed"].append(job["id"])
+        return True
+
+    monkeypatch.setattr(worker, "get_client", lambda: object())
+    monkeypatch.setattr(worker, "claim_next_job", fake_claim)
+    monkeypatch.setattr(worker, "process_job", fake_process)
+    return queue, state
+
+
+def test_run_batch_runs_jobs_concurrently_up_to_max(monkeypatch):
+    queue, state = _install_queue(monkeypatch, 6)
+
+    finished = worker.run_batch(max_jobs=4, concurrency=2)
+
+    assert finished == 4
+    assert len(state["processed"]) == 4
+    assert len(queue) == 2
+    assert state["peak"] == 2
+
+
+def test_run_batch_stops_claiming_after_shared_deadline(monkeypatch):
+    queue, state = _install_queue(monkeypatch, 3)
+    monkeypatch.setattr(worker, "_run_deadline", lambda: time.monotonic() - 1)
+
+    assert worker.run_batch(max_jobs=None, concurrency=2) == 0
+    assert len(queue) == 3
+    assert state["processed"] == []
+
+
+
+def test_only_later_claims_are_limited_to_the_time_left(monkeypatch):
+    _, state = _install_queue(monkeypatch, 4)
+
+    assert worker.run_batch(max_jobs=4, concurrency=2) == 4
+
+    # One unbounded claim per lane, then each claim sees what is left of the run.
+    assert state["remaining"][:2] == [None, None]
+    assert all(0 < remaining <= worker.PARSER_MAX_RUN_SECONDS for remaining in state["remaining"][2:])
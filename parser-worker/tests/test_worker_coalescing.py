@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+
+import worker
+from fake_supabase import FakeSupabase
+from synthetic_catalog import build_catalog_pdf, synthetic_items
+from worker import _superseded_jobs
+
+START = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def _queue(client: FakeSupabase, catalog_id: str, minute: int, **fields) -> str:
+    return client.table("parser_jobs").insert(
+        {"catalog_id": catalog_id, "created_at": (START + timedelta(minutes=minute)).isoformat(), **fields}
+    ).execute().data[0]["id"]
+
+
+def _catalog(client: FakeSupabase, path: str, pdf: bytes) -> str:
+    client.buckets["catalog-pdfs"][path] = pdf
+    return client.table("catalogs").insert(
+        {"version_label": path, "pdf_storage_path": path}
+    ).execute().data[0]["id"]
+
+
+def _job(client: FakeSupabase, job_id: str) -> dict:
+    return next(row for row in client.tables["parser_jobs"] if row["id"] == job_id)
+
+
+def test_only_the_newest_job_for_a_catalog_runs():
+    client = FakeSupabase()
+    catalog_id = _catalog(client, "catalog.pdf", build_catalog_pdf(synthetic_items(4)))
+    first, second, newest = (_queue(client, catalog_id, minute) for minute in (0, 1, 2))
+
+    claimed = []
+    while job := worker.claim_next_job(client):
+        claimed.append(job["id"])
+        worker.process_job(client, job)
+
+    assert claimed == [newest]
+    assert client.count_requests("storage", "catalog-pdfs", "download") == 1
+    for loser in (first, second):
+        assert _job(client, loser)["status"] == "superseded"
+        assert _job(client, loser)["superseded_by_job_id"] == newest
+
+
+def test_reuploaded_pdf_supersedes_the_older_catalog():
+    client = FakeSupabase()
+    pdf = build_catalog_pdf(synthetic_items(4))
+    old_catalog = _catalog(client, "first-upload.pdf", pdf)
+    new_catalog = _catalog(client, "second-upload.pdf", pdf)
+    other_catalog = _catalog(client, "other.pdf", build_catalog_pdf(synthetic_items(4, variant="v2")))
+    old_job = _queue(client, old_catalog, 0)
+    other_job = _queue(client, other_catalog, 1)
+    new_job = _queue(client, new_catalog, 2)
+
+    claimed = []
+    while job := worker.claim_next_job(client):
+        claimed.append(job["id"])
+        worker.process_job(client, job)
+
+    assert sorted(claimed) == sorted([new_job, other_job])
+    assert _job(client, old_job)["superseded_by_job_id"] == new_job
+    old = next(row for row in client.tables["catalogs"] if row["id"] == old_catalog)
+    assert old["parse_status"] == "superseded"
+    assert old["parse_summary"]["superseded_by_catalog_id"] == new_catalog
+
+
+def test_superseded_jobs_point_at_the_newest_job_through_chains():
+    rows = [
+        {"id": "a", "catalog_id": "c1", "pdf_content_hash": "h1", "created_at": "2026-10-19T12:00:00"},
+        {"id": "b", "catalog_id": "c2", "pdf_content_hash": "h1", "created_at": "2026-10-19T12:01:00"},
+        {"id": "c", "catalog_id": "c2", "pdf_content_hash": "h2", "created_at": "2026-10-19T12:02:00"},
+        {"id": "d", "catalog_id": "c3", "pdf_content_hash": "h3", "created_at": "2026-10-19T12:03:00"},
+    ]
+
+    assert {job_id: winner["id"] for job_id, winner in _superseded_jobs(rows).items()} == {"a": "c", "b": "c"}
+
+
+def test_newer_retry_job_does_not_supersede_a_full_job():
+    client = FakeSupabase()
+    items = synthetic_items(8)
+    catalog_id = _catalog(client, "catalog.pdf", build_catalog_pdf(items))
+    full = _queue(client, catalog_id, 0)
+    retry = _queue(client, catalog_id, 1, retry_skus=[items[0].sku], retry_depth=1)
+
+    claimed = []
+    while job := worker.claim_next_job(client):
+        claimed.append(job["id"])
+        worker.process_job(client, job)
+
+    assert claimed == [full]
+    assert _job(client, retry)["status"] == "superseded"
+    assert _job(client, retry)["superseded_by_job_id"] == full
+    assert _job(client, full)["failed_items"] == 0
+    assert not [row for row in client.tables["parser_job_items"] if row["status"] == "failed"]
+
+
+def test_retry_jobs_only_give_way_to_a_full_job_of_their_catalog():
+    rows = [
+        {"id": "full", "catalog_id": "c1", "pdf_content_hash": "h1", "created_at": "2026-10-19T12:00:00"},
+        {"id": "retry", "catalog_id": "c1", "retry_skus": ["A"], "created_at": "2026-10-19T12:01:00"},
+        {"id": "reupload", "catalog_id": "c2", "pdf_content_hash": "h2", "created_at": "2026-10-19T12:02:00"},
+        {"id": "retry-1", "catalog_id": "c2", "retry_skus": ["B"], "created_at": "2026-10-19T12:03:00"},
+        {"id": "retry-2", "catalog_id": "c3", "retry_skus": ["C"], "created_at": "2026-10-19T12:04:00"},
+        {"id": "retry-3", "catalog_id": "c3", "retry_skus": ["D"], "created_at": "2026-10-19T12:05:00"},
+    ]
+
+    assert {job_id: winner["id"] for job_id, winner in _superseded_jobs(rows).items()} == {
+        "retry": "full",
+        "retry-1": "reupload",
+    }
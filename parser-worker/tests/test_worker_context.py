@@ -0,0 +1,42 @@
+import worker
+
+
+class _ClosableHttp:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_worker_context_reuses_client_until_reset(monkeypatch):
+    created: list[tuple[object, _ClosableHttp]] = []
+
+    def fake_create():
+        pair = (object(), _ClosableHttp())
+        created.append(pair)
+        return pair
+
+    monkeypatch.setattr(worker, "_create_pooled_client", fake_create)
+    context = worker.WorkerContext()
+
+    first = context.client
+    assert context.client is first
+    assert len(created) == 1
+
+    context.reset()
+    assert created[0][1].closed is True
+    assert context.client is not first
+    assert len(created) == 2
+
+
+def test_pooled_client_shares_one_http_pool(monkeypatch):
+    monkeypatch.setattr(worker, "SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setattr(worker, "SUPABASE_SERVICE_ROLE_KEY", "service-role-key")
+
+    client, http_client = worker._create_pooled_client()
+    try:
+        assert client.postgrest.session is http_client
+        assert client.storage.session is http_client
+    finally:
+        http_client.close()
@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import worker
+from fake_supabase import FakeSupabase
+from load_harness import queue_synthetic_catalogs
+from worker import JobHeartbeat
+
+
+class _HeartbeatClient:
+    def __init__(self, responses: list[dict]):
+        self.responses = list(responses)
+        self.calls: list[tuple[str, dict]] = []
+
+    def rpc(self, name: str, params: dict):
+        self.calls.append((name, params))
+        data = self.responses.pop(0) if self.responses else {"cancel": False}
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=data))
+
+
+def test_heartbeat_beat_records_cancel_reason():
+    client = _HeartbeatClient([{"cancel": False, "reason": None}, {"cancel": True, "reason": "catalog_deleted"}])
+    heartbeat = JobHeartbeat(client, job_id="job-1", attempts=2, interval_seconds=0)
+
+    assert heartbeat.beat() is False
+    assert heartbeat.cancelled is False
+    assert heartbeat.beat() is True
+    assert heartbeat.cancel_reason == "catalog_deleted"
+    assert client.calls[0] == ("parser_job_heartbeat", {"p_job_id": "job-1", "p_attempts": 2})
+
+
+def test_heartbeat_thread_stops_after_cancel():
+    client = _HeartbeatClient([{"cancel": True, "reason": "job_deleted"}])
+    with JobHeartbeat(client, job_id="job-1", attempts=1, interval_seconds=0.01) as heartbeat:
+        heartbeat._thread.join(timeout=2)
+
+    assert heartbeat.cancel_reason == "job_deleted"
+    assert len(client.calls) == 1
+
+
+class _FailingClient:
+    def rpc(self, name: str, params: dict):
+        raise RuntimeError("connection reset")
+
+
+def test_refresh_logs_heartbeat_errors_instead_of_raising():
+    heartbeat = JobHeartbeat(_FailingClient(), job_id="job-1", attempts=1, interval_seconds=0)
+
+    assert heartbeat.refresh() is False
+    assert heartbeat.cancelled is False
+
+
+def test_transient_heartbeat_error_does_not_fail_the_job():
+    client = FakeSupabase()
+    queue_synthetic_catalogs(client, catalogs=1, items_per_catalog=20)
+    original = client.rpc_handlers["parser_job_heartbeat"]
+    failures = [RuntimeError("connection reset")]
+
+    def heartbeat(client, params):
+        if failures:
+            raise failures.pop()
+        return original(client, params)
+
+    client.rpc_handlers["parser_job_heartbeat"] = heartbeat
+
+    assert worker.process_job(client, worker.claim_next_job(client))
+
+    assert not failures
+    assert client.tables["parser_jobs"][0]["status"] == "success"
+    assert len(client.tables["catalog_items"]) == 20
+
+
+def test_reclaimed_job_is_stopped_by_the_page_heartbeat():
+    client = FakeSupabase()
+    queue_synthetic_catalogs(client, catalogs=1, items_per_catalog=20)
+    job = worker.claim_next_job(client)
+    # Another run reclaims the job as stale before this run finishes it.
+    client.tables["parser_jobs"][0]["attempts"] += 1
+
+    assert worker.process_job(client, job)
+
+    assert client.tables["parser_jobs"][0]["status"] == "processing"
+    assert client.tables["catalogs"][0]["parse_status"] == "processing"
+    assert client.count_requests("rpc", "sync_catalog_items") == 0
+
+
+def test_reclaimed_job_does_not_mark_itself_finished():
+    client = FakeSupabase()
+    queue_synthetic_catalogs(client, catalogs=1, items_per_catalog=20)
+    assert worker.process_job(client, worker.claim_next_job(client))
+    client.tables["parser_jobs"][0].update({"status": "queued", "finished_at": None})
+    # Every item is cached now, so no heavy parse heartbeat runs before the final writes.
+    job = worker.claim_next_job(client)
+    client.tables["parser_jobs"][0]["attempts"] += 1
+
+    assert worker.process_job(client, job)
+
+    assert client.tables["parser_jobs"][0]["status"] == "processing"
+    assert client.tables["catalogs"][0]["parse_status"] == "processing"
+
+
+def test_lost_lease_is_not_requeued_on_pause():
+    client = FakeSupabase()
+    queue_synthetic_catalogs(client, catalogs=1, items_per_catalog=20)
+    job = worker.claim_next_job(client)
+    client.tables["parser_jobs"][0]["attempts"] += 1
+
+    worker._pause_job_for_retry(
+        client,
+        job_id=job["id"],
+        catalog_id=job["catalog_id"],
+        progress={"progress_percent": 50},
+        attempts=job["attempts"],
+    )
+
+    assert client.tables["parser_jobs"][0]["status"] == "processing"
+    assert client.tables["catalogs"][0]["parse_status"] == "processing"
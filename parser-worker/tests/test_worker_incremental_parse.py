@@ -0,0 +1,56 @@
+import time
+
+import worker
+from fake_supabase import FakeSupabase, queue_catalog
+from synthetic_catalog import synthetic_items
+
+
+def _recording_parse(monkeypatch, calls: list[set[int]], page_seconds: float = 0.0) -> None:
+    """Record heavy-parse calls; each one advances the worker's clock by ``page_seconds``."""
+    original = worker.parse_catalog_pdf
+    clock = [time.monotonic()]
+    monkeypatch.setattr(worker.time, "monotonic", lambda: clock[0])
+
+    def parse(pdf_path, sku_filter=None, page_numbers=None, **kwargs):
+        calls.append(set(page_numbers or ()))
+        clock[0] += page_seconds
+        return original(pdf_path, sku_filter=sku_filter, page_numbers=page_numbers, **kwargs)
+
+    monkeypatch.setattr(worker, "parse_catalog_pdf", parse)
+
+
+def test_heavy_parse_runs_page_by_page(monkeypatch):
+    calls: list[set[int]] = []
+    _recording_parse(monkeypatch, calls)
+    client = FakeSupabase()
+    queue_catalog(client, synthetic_items(40))
+
+    assert worker.process_job(client, worker.claim_next_job(client))
+
+    assert calls == [{1}, {2}, {3}]
+    assert len(client.tables["catalog_items"]) == 40
+
+
+def test_paused_job_keeps_parsed_pages_and_resumes_with_the_rest(monkeypatch):
+    calls: list[set[int]] = []
+    _recording_parse(monkeypatch, calls, page_seconds=300)
+    client = FakeSupabase()
+    catalog_id = queue_catalog(client, synthetic_items(48))
+
+    job = worker.claim_next_job(client)
+    # The first page takes 300s, so starting the next one would overrun the 500s budget.
+    assert worker.process_job(client, job, deadline=time.monotonic() + 500) is False
+
+    assert calls == [{1}]
+    assert client.tables["parser_jobs"][0]["status"] == "queued"
+    assert client.tables["parser_jobs"][0]["progress_label"] == "paused_time_budget"
+    assert len(client.tables["item_parse_cache"]) == 16
+
+    calls.clear()
+    job = worker.claim_next_job(client)
+    assert worker.process_job(client, job)
+
+    assert calls == [{2}, {3}]
+    catalog = next(row for row in client.tables["catalogs"] if row["id"] == catalog_id)
+    assert catalog["parse_summary"]["reused_items"] == 16
+    assert len(client.tables["catalog_items"]) == 48
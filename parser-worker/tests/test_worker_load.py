@@ -0,0 +1,52 @@
+import pytest
+
+from fake_supabase import FakeSupabase, _logic_predicate
+from load_harness import run_load
+
+# Request budgets guarding against DB-chatter regressions in process_job. Tighten them
+# when a change reduces round trips; a failure here means a change added per-item calls.
+MAX_REQUESTS_PER_COLD_ITEM = 7.0
+# The warm budget includes the customer snapshot and lookup index uploads per completed job.
+MAX_REQUESTS_FOR_WARM_CATALOG = 22
+
+
+def test_logic_tree_filter_matches_postgrest_semantics():
+    predicate = _logic_predicate('or(status.eq.queued,and(heartbeat_at.is.null,started_at.lt."2026-01-02"))')
+
+    assert predicate({"status": "queued"})
+    assert predicate({"status": "processing", "heartbeat_at": None, "started_at": "2026-01-01"})
+    assert not predicate({"status": "processing", "heartbeat_at": None, "started_at": "2026-01-03"})
+    assert not predicate({"status": "processing", "heartbeat_at": "2026-01-01", "started_at": "2026-01-01"})
+
+
+def test_cold_catalog_stays_within_request_budget():
+    client = FakeSupabase()
+    report = run_load(catalogs=1, items_per_catalog=32, client=client)
+
+    assert report.job_statuses == {"success": 1}
+    assert len(client.tables["catalog_items"]) == 32
+    assert client.count_requests("storage", "product-images", "upload") == 32
+    assert report.requests_per_item <= MAX_REQUESTS_PER_COLD_ITEM
+
+
+def test_unchanged_catalog_reuses_cache_with_few_requests():
+    client = FakeSupabase()
+    run_load(catalogs=1, items_per_catalog=32, client=client)
+    before = len(client.requests)
+    report = run_load(catalogs=1, items_per_catalog=32, client=client)
+
+    warm_requests = len(client.requests)
+    assert report.job_statuses == {"success": 2}
+    assert warm_requests <= MAX_REQUESTS_FOR_WARM_CATALOG
+    assert before > warm_requests
+    warm_catalog = client.tables["catalogs"][-1]
+    assert warm_catalog["parse_summary"]["reused_items"] == 32
+    assert warm_catalog["parse_summary"]["unchanged_items"] == 32
+
+
+def test_injected_latency_is_accounted_per_request():
+    client = FakeSupabase(latency=lambda kind, target, verb: 0.001 if kind == "storage" else 0.0)
+    report = run_load(catalogs=1, items_per_catalog=16, client=client)
+
+    storage_requests = client.count_requests("storage")
+    assert report.request_seconds == pytest.approx(storage_requests * 0.001)
@@ -0,0 +1,52 @@
+import worker
+from fake_supabase import FakeSupabase, queue_catalog
+from synthetic_catalog import build_catalog_pdf, synthetic_items
+
+
+def _requeue(client: FakeSupabase) -> None:
+    for row in client.tables["parser_jobs"]:
+        row.update({"status": "queued", "finished_at": None})
+
+
+def _run_all(client: FakeSupabase) -> None:
+    while job := worker.claim_next_job(client):
+        worker.process_job(client, job)
+
+
+def test_rerun_writes_no_unchanged_rows():
+    client = FakeSupabase()
+    catalog_id = queue_catalog(client, synthetic_items(20))
+    _run_all(client)
+    item_ids = {row["sku"]: row["id"] for row in client.tables["catalog_items"]}
+
+    written: list[int] = []
+    original = client.rpc_handlers["sync_catalog_items"]
+    client.rpc_handlers["sync_catalog_items"] = lambda c, p: written.append(original(c, p)) or written[-1]
+    _requeue(client)
+    _run_all(client)
+
+    assert sum(written) == 0
+    assert {row["sku"]: row["id"] for row in client.tables["catalog_items"]} == item_ids
+    assert all(row["catalog_id"] == catalog_id for row in client.tables["catalog_items"])
+    assert client.count_requests("table", "catalog_items", "delete") == 0
+    assert client.count_requests("table", "parser_job_items", "delete") == 0
+
+
+def test_vanished_skus_are_pruned_and_batches_are_bounded(monkeypatch):
+    monkeypatch.setattr(worker, "PARSER_PERSIST_BATCH_SIZE", 8)
+    client = FakeSupabase()
+    queue_catalog(client, synthetic_items(20))
+    _run_all(client)
+
+    client.buckets["catalog-pdfs"]["catalog.pdf"] = build_catalog_pdf(synthetic_items(17))
+    _requeue(client)
+    client.requests.clear()
+    _run_all(client)
+
+    assert sorted(row["sku"] for row in client.tables["catalog_items"]) == [
+        f"BLM{number:04d}" for number in range(1, 18)
+    ]
+    assert len(client.tables["parser_job_items"]) == 17
+    # 17 rows in batches of 8 -> 3 calls per table.
+    assert client.count_requests("rpc", "sync_catalog_items") == 3
+    assert client.count_requests("rpc", "sync_parser_job_items") == 3
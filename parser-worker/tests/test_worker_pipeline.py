@@ -0,0 +1,120 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import worker
+from fake_supabase import FakeSupabase, queue_catalog
+from synthetic_catalog import synthetic_items
+
+ITEM_FIELDS = ("sku", "name", "upc", "category", "signature", "display_order", "source_page_no", "change_type")
+SUMMARY_FIELDS = (
+    "total_items",
+    "raw_candidates",
+    "reused_items",
+    "queued_items",
+    "processed_items",
+    "failed_items",
+    "parsed_pages",
+    "capture_verification_passed",
+)
+
+
+def _run(monkeypatch, *, pipelined: bool, items, parse_executor=None) -> FakeSupabase:
+    monkeypatch.setattr(worker, "PARSER_PIPELINE", pipelined)
+    client = FakeSupabase()
+    queue_catalog(client, items)
+    assert worker.process_job(client, worker.claim_next_job(client), parse_executor=parse_executor)
+    return client
+
+
+def _result(client: FakeSupabase) -> tuple[list[tuple], dict]:
+    items = sorted(tuple(row[field] for field in ITEM_FIELDS) for row in client.tables["catalog_items"])
+    summary = client.tables["catalogs"][0]["parse_summary"]
+    return items, {field: summary[field] for field in SUMMARY_FIELDS}
+
+
+def test_pipelined_job_matches_the_phased_one(monkeypatch):
+    items = synthetic_items(40)
+    # A SKU repeated on a later page keeps its first occurrence either way.
+    items.append(items[3])
+
+    phased = _result(_run(monkeypatch, pipelined=False, items=items))
+    pipelined = _result(_run(monkeypatch, pipelined=True, items=items))
+
+    assert pipelined == phased
+    assert len(pipelined[0]) == 40
+    assert pipelined[1]["parsed_pages"] == 3
+
+    # Pages parse in the background here and can finish out of order.
+    with ThreadPoolExecutor(max_workers=3) as parse_executor:
+        assert _result(_run(monkeypatch, pipelined=True, items=items, parse_executor=parse_executor)) == phased
+
+
+def test_first_page_is_stored_before_the_scan_finishes(monkeypatch):
+    original = worker.scan_catalog_pages
+    stored_before_last_page: list[int] = []
+    client_holder: list[FakeSupabase] = []
+
+    def scan(pdf_path, **kwargs):
+        pages = list(original(pdf_path, **kwargs))
+        for page in pages[:-1]:
+            yield page
+        cache = client_holder[0].tables["item_parse_cache"]
+        waited_until = time.monotonic() + 5
+        while len(cache) < 16 and time.monotonic() < waited_until:
+            time.sleep(0.01)
+        stored_before_last_page.append(len(cache))
+        yield pages[-1]
+
+    monkeypatch.setattr(worker, "scan_catalog_pages", scan)
+    monkeypatch.setattr(worker, "PARSER_PIPELINE", True)
+    client = FakeSupabase()
+    client_holder.append(client)
+    queue_catalog(client, synthetic_items(40))
+
+    assert worker.process_job(client, worker.claim_next_job(client))
+
+    assert stored_before_last_page and stored_before_last_page[0] >= 16
+    assert len(client.tables["catalog_items"]) == 40
+
+
+def test_pipelined_job_looks_up_the_cache_per_page(monkeypatch):
+    client = _run(monkeypatch, pipelined=True, items=synthetic_items(40))
+
+    assert client.count_requests("table", "item_parse_cache", "select") == 3
+    assert {row["status"] for row in client.tables["parser_job_items"]} == {"success"}
+
+
+def test_scan_failure_fails_the_pipelined_job(monkeypatch):
+    def scan(pdf_path, **kwargs):
+        raise RuntimeError("broken page")
+        yield
+
+    monkeypatch.setattr(worker, "scan_catalog_pages", scan)
+    monkeypatch.setattr(worker, "PARSER_PIPELINE", True)
+    client = FakeSupabase()
+    queue_catalog(client, synthetic_items(20))
+
+    assert worker.process_job(client, worker.claim_next_job(client))
+
+    assert client.tables["parser_jobs"][0]["status"] == "failed"
+    assert "broken page" in client.tables["parser_jobs"][0]["error_log"]
+
+
+def test_pipelined_run_once_parses_in_a_process_pool(monkeypatch):
+    client = FakeSupabase()
+    queue_catalog(client, synthetic_items(4))
+    executors = []
+
+    def process(_client, job, *, parse_executor=None, **kwargs):
+        executors.append(parse_executor)
+        return True
+
+    monkeypatch.setattr(worker, "get_client", lambda: client)
+    monkeypatch.setattr(worker, "process_job", process)
+    monkeypatch.setattr(worker, "PARSER_PIPELINE", True)
+
+    assert worker.run_once()
+
+    assert isinstance(executors[0], ProcessPoolExecutor)
+    # The pool started for the job is shut down with it.
+    assert executors[0]._shutdown_thread
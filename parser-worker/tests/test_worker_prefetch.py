@@ -0,0 +1,173 @@
+import hashlib
+import time
+
+import prefetch
+import worker
+from fake_supabase import FakeSupabase, queue_catalog
+from prefetch import PdfPrefetcher, PrefetchTarget
+from synthetic_catalog import synthetic_items
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def _prefetcher(monkeypatch, tmp_path, *, max_bytes: int, targets: list[PrefetchTarget], blobs: dict[str, bytes]):
+    directory = tmp_path / "prefetch"
+
+    def mkdtemp(prefix: str) -> str:
+        directory.mkdir()
+        return str(directory)
+
+    monkeypatch.setattr(prefetch.tempfile, "mkdtemp", mkdtemp)
+    downloads: list[str] = []
+
+    def download(pdf_path: str) -> bytes:
+        downloads.append(pdf_path)
+        return blobs[pdf_path]
+
+    prefetcher = PdfPrefetcher(max_bytes=max_bytes)
+    assert prefetcher.start(peek=lambda limit: targets[:limit], download=download, ahead=2)
+    return prefetcher, directory, downloads
+
+
+def _etag(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+
+def _target(job_id: str, size: int, content_hash: str | None = None) -> PrefetchTarget:
+    return PrefetchTarget(job_id=job_id, pdf_storage_path=f"{job_id}.pdf", content_hash=content_hash, size_bytes=size)
+
+
+def test_next_job_starts_from_the_prefetched_pdf(monkeypatch):
+    client = FakeSupabase()
+    first = queue_catalog(client, synthetic_items(20, variant="v1"), pdf_path="catalog-1.pdf")
+    second = queue_catalog(client, synthetic_items(20, variant="v2"), pdf_path="catalog-2.pdf")
+    monkeypatch.setattr(worker, "get_client", lambda: client)
+    assert worker._start_prefetch(ahead=1)
+    try:
+        job = worker._pdf_prefetcher.claim(lambda: worker.claim_next_job(client))
+        assert job["catalog_id"] == first
+        assert worker.process_job(client, job)
+        assert _wait_for(lambda: worker._pdf_prefetcher.used_bytes() > 0)
+
+        client.requests.clear()
+        job = worker._pdf_prefetcher.claim(lambda: worker.claim_next_job(client))
+        assert job["catalog_id"] == second
+        assert worker.process_job(client, job)
+    finally:
+        worker._pdf_prefetcher.stop()
+
+    catalogs = {row["id"]: row for row in client.tables["catalogs"]}
+    assert catalogs[first]["parse_summary"]["pdf_prefetched"] is False
+    assert catalogs[second]["parse_summary"]["pdf_prefetched"] is True
+    assert client.count_requests("storage", "catalog-pdfs", "download") == 0
+    assert len(client.tables["catalog_items"]) == 40
+
+
+def test_prefetched_pdf_is_verified_against_the_claimed_etag(monkeypatch, tmp_path):
+    # job-2's object was replaced between the peek and the download.
+    blobs = {"job-1.pdf": b"%PDF-one", "job-2.pdf": b"%PDF-new"}
+    targets = [_target("job-1", 8), _target("job-2", 8)]
+    prefetcher, directory, _ = _prefetcher(monkeypatch, tmp_path, max_bytes=100, targets=targets, blobs=blobs)
+    try:
+        prefetcher.schedule()
+        assert _wait_for(lambda: prefetcher.used_bytes() == 16)
+
+        etag = f'"{_etag(b"%PDF-one")}"'
+        assert prefetcher.take("job-1", pdf_storage_path="job-1.pdf", content_hash=etag, timeout=1) == b"%PDF-one"
+        old_etag = _etag(b"%PDF-two")
+        assert prefetcher.take("job-2", pdf_storage_path="job-2.pdf", content_hash=old_etag, timeout=1) is None
+        assert prefetcher.hits == 1
+        assert not list(directory.iterdir())
+    finally:
+        prefetcher.stop()
+    assert not directory.exists()
+
+
+def test_multipart_etag_must_match_the_prefetched_one(monkeypatch, tmp_path):
+    blobs = {"job-1.pdf": b"%PDF-one", "job-2.pdf": b"%PDF-two"}
+    targets = [_target("job-1", 8, "abc-2"), _target("job-2", 8)]
+    prefetcher, _, _ = _prefetcher(monkeypatch, tmp_path, max_bytes=100, targets=targets, blobs=blobs)
+    try:
+        prefetcher.schedule()
+        assert _wait_for(lambda: prefetcher.used_bytes() == 16)
+
+        assert prefetcher.take("job-1", pdf_storage_path="job-1.pdf", content_hash="abc-2", timeout=1) == b"%PDF-one"
+        # Without an ETag nothing proves the file is the current object.
+        assert prefetcher.take("job-2", pdf_storage_path="job-2.pdf", content_hash=None, timeout=1) is None
+    finally:
+        prefetcher.stop()
+
+
+def test_changed_pdf_is_not_served_from_the_prefetch(monkeypatch, tmp_path):
+    blobs = {"job-1.pdf": b"%PDF-one"}
+    prefetcher, directory, _ = _prefetcher(monkeypatch, tmp_path, max_bytes=100, targets=[_target("job-1", 8)], blobs=blobs)
+    try:
+        prefetcher.schedule()
+        assert _wait_for(lambda: prefetcher.used_bytes() == 8)
+
+        assert prefetcher.take("job-1", pdf_storage_path="job-1.pdf", content_hash=_etag(b"%PDF-new"), timeout=1) is None
+        assert not list(directory.iterdir())
+    finally:
+        prefetcher.stop()
+
+
+def test_prefetch_stays_within_the_disk_budget(monkeypatch, tmp_path):
+    blobs = {"job-1.pdf": b"a" * 60, "job-2.pdf": b"b" * 60}
+    targets = [_target("job-1", 60), _target("job-2", 60)]
+    prefetcher, _, downloads = _prefetcher(monkeypatch, tmp_path, max_bytes=100, targets=targets, blobs=blobs)
+    try:
+        prefetcher.schedule()
+        assert _wait_for(lambda: prefetcher.used_bytes() == 60)
+        prefetcher.schedule()
+        time.sleep(0.1)
+
+        assert downloads == ["job-1.pdf"]
+        assert prefetcher.used_bytes() == 60
+    finally:
+        prefetcher.stop()
+
+
+def test_refill_drops_unused_prefetches_but_keeps_claimed_ones(monkeypatch, tmp_path):
+    blobs = {"job-1.pdf": b"one", "job-2.pdf": b"two", "job-3.pdf": b"three"}
+    targets = [_target("job-1", 3), _target("job-2", 3)]
+    prefetcher, directory, _ = _prefetcher(monkeypatch, tmp_path, max_bytes=100, targets=targets, blobs=blobs)
+    try:
+        prefetcher.schedule()
+        assert _wait_for(lambda: prefetcher.used_bytes() == 6)
+
+        # job-1 is claimed here, job-2 by another runner; only job-3 is still queued.
+        assert prefetcher.claim(lambda: {"id": "job-1"}) == {"id": "job-1"}
+        targets[:] = [_target("job-3", 5)]
+        prefetcher.schedule()
+        assert _wait_for(lambda: prefetcher.used_bytes() == 8)
+
+        assert sorted(path.name for path in directory.iterdir()) == ["job-1.pdf", "job-3.pdf"]
+        assert prefetcher.take("job-1", pdf_storage_path="job-1.pdf", content_hash=_etag(b"one"), timeout=1) == b"one"
+        prefetcher.release("job-3")
+        assert not list(directory.iterdir())
+    finally:
+        prefetcher.stop()
+
+
+def test_claim_does_not_block_a_finishing_download(monkeypatch, tmp_path):
+    blobs = {"job-1.pdf": b"one"}
+    prefetcher, _, _ = _prefetcher(monkeypatch, tmp_path, max_bytes=100, targets=[_target("job-1", 3)], blobs=blobs)
+    try:
+
+        def slow_claim():
+            # The refill stores its download while this claim is still talking to the database.
+            prefetcher.schedule()
+            assert _wait_for(lambda: prefetcher.used_bytes() == 3)
+            return {"id": "job-1"}
+
+        assert prefetcher.claim(slow_claim) == {"id": "job-1"}
+        assert prefetcher.take("job-1", pdf_storage_path="job-1.pdf", content_hash=_etag(b"one"), timeout=1) == b"one"
+    finally:
+        prefetcher.stop()
@@ -0,0 +1,104 @@
+import json
+import time
+
+import pytest
+
+import worker
+from fake_supabase import FakeSupabase, queue_catalog
+from profiling import PROFILE_KINDS, parse_profile_kinds
+from synthetic_catalog import synthetic_items
+
+
+def _summary(client: FakeSupabase, catalog_id: str) -> dict:
+    return next(row for row in client.tables["catalogs"] if row["id"] == catalog_id)["parse_summary"]
+
+
+def test_parse_profile_kinds():
+    assert parse_profile_kinds(None) == frozenset()
+    assert parse_profile_kinds("off") == frozenset()
+    assert parse_profile_kinds("all") == PROFILE_KINDS
+    assert parse_profile_kinds(" cprofile, pages ") == {"cprofile", "pages"}
+    with pytest.raises(ValueError):
+        parse_profile_kinds("cprofile,perf")
+
+
+def test_profiled_job_writes_report(monkeypatch, tmp_path):
+    monkeypatch.setattr(worker, "PARSER_PROFILE_DIR", str(tmp_path))
+    client = FakeSupabase()
+    catalog_id = queue_catalog(client, synthetic_items(20), profile="all")
+
+    job = worker.claim_next_job(client)
+    assert worker.process_job(client, job)
+
+    artifact = _summary(client, catalog_id)["profile_artifact"]
+    report = json.loads(open(artifact, encoding="utf-8").read())
+    assert report["job_id"] == job["id"]
+    assert report["kinds"] == sorted(PROFILE_KINDS)
+    assert set(report["stages"]) == {"scan_catalog_fast", "parse_catalog_pdf"}
+
+    scan = report["stages"]["scan_catalog_fast"]
+    assert scan["calls"] == 1
+    assert [timing["page_no"] for timing in scan["page_timings"]] == [1, 2]
+    heavy = report["stages"]["parse_catalog_pdf"]
+    assert heavy["calls"] == 2
+    assert heavy["peak_bytes"] > 0
+    assert any("parser.py" in row["function"] for row in heavy["cprofile_top"])
+    assert "cprofile_top" in report["job_loop"]
+
+
+def test_profile_is_uploaded_without_a_local_dir(monkeypatch):
+    monkeypatch.setattr(worker, "PARSER_PROFILE_DIR", "")
+    client = FakeSupabase()
+    catalog_id = queue_catalog(client, synthetic_items(4), profile="pages")
+
+    job = worker.claim_next_job(client)
+    assert worker.process_job(client, job)
+
+    artifact = _summary(client, catalog_id)["profile_artifact"]
+    assert artifact.startswith(f"parser-profiles/{catalog_id}/")
+    stored = client.buckets["parser-profiles"][artifact.split("/", 1)[1]]
+    report = json.loads(stored)
+    assert "cprofile_top" not in report["stages"]["parse_catalog_pdf"]
+    assert report["stages"]["parse_catalog_pdf"]["page_timings"]
+
+
+def test_unprofiled_job_has_no_artifact():
+    client = FakeSupabase()
+    catalog_id = queue_catalog(client, synthetic_items(4), profile="bogus")
+
+    job = worker.claim_next_job(client)
+    assert worker.process_job(client, job)
+
+    assert "profile_artifact" not in _summary(client, catalog_id)
+    assert "parser-profiles" not in client.buckets
+
+
+def _job_row(client: FakeSupabase, job_id: str) -> dict:
+    return next(row for row in client.tables["parser_jobs"] if row["id"] == job_id)
+
+
+def test_paused_and_failed_jobs_link_their_profiles(monkeypatch, tmp_path):
+    monkeypatch.setattr(worker, "PARSER_PROFILE_DIR", str(tmp_path))
+    client = FakeSupabase()
+    catalog_id = queue_catalog(client, synthetic_items(20), profile="pages")
+
+    job = worker.claim_next_job(client)
+    assert worker.process_job(client, job, deadline=time.monotonic() - 1) is False
+
+    paused = _summary(client, catalog_id)
+    assert paused["progress_label"] == "paused_time_budget"
+    assert _job_row(client, job["id"])["profile_artifact"] == paused["profile_artifact"]
+    assert json.loads(open(paused["profile_artifact"], encoding="utf-8").read())["job_id"] == job["id"]
+
+    def broken_parse(*_args, **_kwargs):
+        raise ValueError("unreadable page")
+
+    monkeypatch.setattr(worker, "parse_catalog_pdf", broken_parse)
+    job = worker.claim_next_job(client)
+    assert worker.process_job(client, job)
+
+    failed = _summary(client, catalog_id)
+    assert failed["error"] == "unreadable page"
+    assert failed["profile_artifact"] != paused["profile_artifact"]
+    assert _job_row(client, job["id"])["profile_artifact"] == failed["profile_artifact"]
+    assert len(list(tmp_path.rglob("*.json"))) == 2
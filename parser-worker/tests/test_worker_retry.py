@@ -0,0 +1,134 @@
+import pytest
+
+import fake_supabase
+import worker
+from fake_supabase import FakeSupabase, queue_catalog
+from synthetic_catalog import synthetic_items
+
+
+class _UpstreamError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"upstream returned {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(worker.time, "sleep", lambda seconds: None)
+
+
+def _failing_uploads(monkeypatch, failures: dict[str, int], status_code: int = 502) -> None:
+    """Make uploads for the given SKUs fail ``failures[sku]`` times before succeeding."""
+    original = fake_supabase._FakeBucket.upload
+
+    def upload(self, path, file, file_options=None):
+        sku = path.rsplit("/", 1)[-1].split("-", 1)[0]
+        if failures.get(sku, 0) > 0:
+            failures[sku] -= 1
+            raise _UpstreamError(status_code)
+        return original(self, path, file, file_options)
+
+    monkeypatch.setattr(fake_supabase._FakeBucket, "upload", upload)
+
+
+def test_transient_errors_are_retried_in_place(monkeypatch):
+    _failing_uploads(monkeypatch, {"BLM0003": worker.PARSER_RETRY_ATTEMPTS - 1})
+    client = FakeSupabase()
+    queue_catalog(client, synthetic_items(8))
+
+    job = worker.claim_next_job(client)
+    assert worker.process_job(client, job)
+
+    assert len(client.tables["catalog_items"]) == 8
+    assert len(client.tables["parser_jobs"]) == 1
+    assert client.tables["parser_jobs"][0]["failed_items"] == 0
+
+
+def test_failed_items_do_not_fail_the_job_and_are_retried_by_a_follow_up(monkeypatch):
+    _failing_uploads(monkeypatch, {"BLM0003": worker.PARSER_RETRY_ATTEMPTS, "BLM0005": worker.PARSER_RETRY_ATTEMPTS})
+    client = FakeSupabase()
+    catalog_id = queue_catalog(client, synthetic_items(8))
+
+    job = worker.claim_next_job(client)
+    assert worker.process_job(client, job)
+
+    first = client.tables["parser_jobs"][0]
+    assert first["status"] == "success"
+    assert first["failed_items"] == 2
+    assert sorted(row["sku"] for row in client.tables["catalog_items"]) == [
+        f"BLM{number:04d}" for number in (1, 2, 4, 6, 7, 8)
+    ]
+    failed = {row["sku"]: row for row in client.tables["parser_job_items"] if row["status"] == "failed"}
+    assert sorted(failed) == ["BLM0003", "BLM0005"]
+    assert failed["BLM0003"]["attempts"] == worker.PARSER_RETRY_ATTEMPTS
+    assert "502" in failed["BLM0003"]["error_log"]
+
+    retry = client.tables["parser_jobs"][1]
+    assert retry["status"] == "queued"
+    assert retry["retry_of_job_id"] == first["id"]
+    assert retry["retry_depth"] == 1
+    assert retry["retry_skus"] == ["BLM0003", "BLM0005"]
+    catalog = next(row for row in client.tables["catalogs"] if row["id"] == catalog_id)
+    assert catalog["parse_summary"]["retry_job_id"] == retry["id"]
+
+    client.requests.clear()
+    job = worker.claim_next_job(client)
+    assert job["id"] == retry["id"]
+    assert worker.process_job(client, job)
+
+    assert len(client.tables["catalog_items"]) == 8
+    assert client.count_requests("storage", "product-images", "upload") == 2
+    assert len(client.tables["parser_jobs"]) == 2
+
+
+def test_follow_up_heavy_parses_only_the_retried_skus(monkeypatch):
+    _failing_uploads(monkeypatch, {"BLM0002": 1}, status_code=400)
+    _failing_uploads(monkeypatch, {"BLM0003": worker.PARSER_RETRY_ATTEMPTS})
+    client = FakeSupabase()
+    queue_catalog(client, synthetic_items(8))
+    assert worker.process_job(client, worker.claim_next_job(client))
+
+    parsed_skus: list[set[str]] = []
+    original = worker.parse_catalog_pdf
+
+    def parse(pdf_path, *, sku_filter, **kwargs):
+        parsed_skus.append(set(sku_filter))
+        return original(pdf_path, sku_filter=sku_filter, **kwargs)
+
+    monkeypatch.setattr(worker, "parse_catalog_pdf", parse)
+    job = worker.claim_next_job(client)
+    assert job["retry_skus"] == ["BLM0003"]
+    assert worker.process_job(client, job)
+
+    assert parsed_skus == [{"BLM0003"}]
+    assert len(client.tables["catalog_items"]) == 7
+    retry_items = {row["sku"]: row for row in client.tables["parser_job_items"] if row["parser_job_id"] == job["id"]}
+    assert retry_items["BLM0002"]["status"] == "failed"
+    assert retry_items["BLM0002"]["error_log"] == worker.NOT_RETRIED_ERROR
+    assert len(client.tables["parser_jobs"]) == 2
+
+
+def test_permanent_errors_are_not_retried(monkeypatch):
+    _failing_uploads(monkeypatch, {"BLM0002": 1}, status_code=400)
+    client = FakeSupabase()
+    queue_catalog(client, synthetic_items(4))
+
+    job = worker.claim_next_job(client)
+    assert worker.process_job(client, job)
+
+    failed = [row for row in client.tables["parser_job_items"] if row["status"] == "failed"]
+    assert [(row["sku"], row["attempts"]) for row in failed] == [("BLM0002", 1)]
+    assert len(client.tables["parser_jobs"]) == 1
+
+
+def test_retry_chain_is_bounded(monkeypatch):
+    monkeypatch.setattr(worker, "PARSER_MAX_RETRY_JOBS", 1)
+    _failing_uploads(monkeypatch, {"BLM0001": 100})
+    client = FakeSupabase()
+    queue_catalog(client, synthetic_items(2))
+
+    while job := worker.claim_next_job(client):
+        worker.process_job(client, job)
+
+    assert [row["retry_depth"] for row in client.tables["parser_jobs"]] == [0, 1]
+    assert all(row["status"] == "success" for row in client.tables["parser_jobs"])
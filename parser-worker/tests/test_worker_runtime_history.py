@@ -0,0 +1,70 @@
+import time
+
+import worker
+from fake_supabase import FakeSupabase, queue_catalog
+from synthetic_catalog import synthetic_items
+
+
+def _slow_pages(monkeypatch, page_seconds: float) -> None:
+    """Each heavy-parse call advances the worker's clock by ``page_seconds``."""
+    original = worker.parse_catalog_pdf
+    clock = [time.monotonic()]
+    monkeypatch.setattr(worker.time, "monotonic", lambda: clock[0])
+
+    def parse(*args, **kwargs):
+        clock[0] += page_seconds
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(worker, "parse_catalog_pdf", parse)
+
+
+def _catalog(client: FakeSupabase, catalog_id: str) -> dict:
+    return next(row for row in client.tables["catalogs"] if row["id"] == catalog_id)
+
+
+def test_completed_job_records_throughput(monkeypatch):
+    _slow_pages(monkeypatch, page_seconds=8)
+    client = FakeSupabase()
+    catalog_id = queue_catalog(client, synthetic_items(32))
+
+    job = worker.claim_next_job(client)
+    assert worker.process_job(client, job)
+
+    [run] = client.tables["parser_runtime_history"]
+    assert run["parser_job_id"] == job["id"]
+    assert run["outcome"] == "success"
+    assert (run["scan_pages"], run["parse_pages"], run["parse_items"], run["upload_items"]) == (2, 2, 32, 32)
+    assert run["parse_seconds"] == 16
+    summary = _catalog(client, catalog_id)["parse_summary"]
+    assert summary["throughput"]["parse_items_per_second"] == 2.0
+    assert summary["eta_seconds"] == 0
+
+
+def test_progress_eta_uses_measured_rates_and_the_run_budget(monkeypatch):
+    _slow_pages(monkeypatch, page_seconds=8)
+    client = FakeSupabase()
+    queue_catalog(client, synthetic_items(16))
+    worker.process_job(client, worker.claim_next_job(client))
+
+    # The next job learns 0.5s per item from the first one.
+    queue_catalog(client, synthetic_items(48, variant="v2"), pdf_path="catalog-2.pdf")
+    job = worker.claim_next_job(client)
+    assert job["parse_seconds_per_item"] == 0.5
+    updates: list[dict] = []
+    original = worker._update_processing_progress
+    monkeypatch.setattr(
+        worker,
+        "_update_processing_progress",
+        lambda client, **kwargs: (updates.append(kwargs["progress"]), original(client, **kwargs)),
+    )
+    # Two 8s pages fit the 20s budget; the third does not.
+    deadline = worker.time.monotonic() + 20
+    assert worker.process_job(client, job, deadline=deadline) is False
+
+    etas = [(update["eta_seconds"], update["fits_run_budget"]) for update in updates]
+    assert etas[0][1] is False
+    assert etas[0][0] > etas[1][0]
+    paused = client.tables["parser_jobs"][-1]
+    assert paused["status"] == "queued"
+    assert paused["fits_run_budget"] is False
+    assert [run["outcome"] for run in client.tables["parser_runtime_history"]] == ["success", "paused"]
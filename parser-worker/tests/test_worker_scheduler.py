@@ -0,0 +1,155 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import worker
+from fake_supabase import FakeSupabase, iso_ago, queue_catalog
+from load_harness import queue_synthetic_catalogs
+from worker import RuntimeModel, _estimate_job_cost_seconds, _pick_next_job
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def _job(job_id: str, *, waited_seconds: float, priority: int = 0, **fields) -> dict:
+    return {
+        "id": job_id,
+        "catalog_id": f"catalog-{job_id}",
+        "created_at": (NOW - timedelta(seconds=waited_seconds)).isoformat(),
+        "priority": priority,
+        **fields,
+    }
+
+
+def test_cost_estimate_prefers_resume_progress_over_pdf_size():
+    cold = _job("cold", waited_seconds=0, pdf_size_bytes=500 * 400_000)
+    resumed = _job("resumed", waited_seconds=0, total_pages=500, total_items=8000, progress_percent=95)
+    warm = _job("warm", waited_seconds=0, pdf_size_bytes=500 * 400_000, historic_hit_ratio=0.9)
+
+    assert _estimate_job_cost_seconds(resumed) < _estimate_job_cost_seconds(cold)
+    assert _estimate_job_cost_seconds(warm) < _estimate_job_cost_seconds(cold)
+
+
+def test_small_job_jumps_ahead_of_large_job_queued_first():
+    large = _job("large", waited_seconds=60, total_pages=500)
+    small = _job("small", waited_seconds=5, total_pages=1)
+
+    assert _pick_next_job([large, small], now=NOW)["id"] == "small"
+
+
+def test_large_job_ages_past_fresh_small_jobs():
+    large = _job("large", waited_seconds=6 * 3600, total_pages=500)
+    small = _job("small", waited_seconds=1, total_pages=1)
+
+    assert _pick_next_job([large, small], now=NOW)["id"] == "large"
+
+
+def test_priority_wins_over_cost():
+    small = _job("small", waited_seconds=60, total_pages=1)
+    urgent = _job("urgent", waited_seconds=0, total_pages=500, priority=10)
+
+    assert _pick_next_job([small, urgent], now=NOW)["id"] == "urgent"
+    assert _pick_next_job([], now=NOW) is None
+
+
+def test_measured_rates_replace_the_default_unit_costs():
+    job = _job("job", waited_seconds=0, total_pages=10)
+    measured = _job(
+        "measured",
+        waited_seconds=0,
+        total_pages=10,
+        scan_seconds_per_page=0.25,
+        parse_seconds_per_item=0.5,
+        upload_seconds_per_item=0.25,
+    )
+
+    assert RuntimeModel.from_job(job) == RuntimeModel()
+    assert RuntimeModel.from_job(measured).item_seconds == 0.75
+    assert _estimate_job_cost_seconds(measured) == 10 * 0.25 + 160 * 0.75
+
+
+def test_jobs_that_fit_a_fresh_run_are_left_for_it(monkeypatch):
+    monkeypatch.setattr(worker, "PARSER_MAX_RUN_SECONDS", 1000)
+    medium = _job("medium", waited_seconds=60, total_pages=5)
+    small = _job("small", waited_seconds=0, total_pages=1)
+    medium_cost = _estimate_job_cost_seconds(medium)
+
+    assert _pick_next_job([medium, small], now=NOW)["id"] == "medium"
+    assert _pick_next_job([medium, small], now=NOW, remaining_seconds=medium_cost - 1)["id"] == "small"
+    assert _pick_next_job([medium], now=NOW, remaining_seconds=medium_cost - 1) is None
+
+
+def test_jobs_too_big_for_any_run_start_when_a_page_fits(monkeypatch):
+    monkeypatch.setattr(worker, "PARSER_MAX_RUN_SECONDS", 100)
+    huge = _job("huge", waited_seconds=0, total_pages=50)
+
+    assert _pick_next_job([huge], now=NOW, remaining_seconds=60)["id"] == "huge"
+    assert _pick_next_job([huge], now=NOW, remaining_seconds=5) is None
+
+
+def test_short_job_behind_the_scheduler_window_is_claimed_first(monkeypatch):
+    monkeypatch.setattr(worker, "PARSER_SCHEDULER_WINDOW", 2)
+    client = FakeSupabase()
+    for index in range(3):
+        queue_catalog(client, [], pdf_path=f"large-{index}.pdf", total_pages=500, created_at=iso_ago(seconds=60))
+    short = queue_catalog(client, [], pdf_path="short.pdf", total_pages=1, created_at=iso_ago(seconds=5))
+
+    assert worker.claim_next_job(client)["catalog_id"] == short
+
+
+def test_stale_job_is_reclaimed_when_no_queued_job_fits(monkeypatch):
+    client = FakeSupabase()
+    queue_synthetic_catalogs(client, catalogs=2, items_per_catalog=20)
+    crashed = worker.claim_next_job(client)
+    stale_at = (datetime.now(timezone.utc) - timedelta(seconds=worker.PARSER_LEASE_SECONDS + 60)).isoformat()
+    next(row for row in client.tables["parser_jobs"] if row["id"] == crashed["id"])["heartbeat_at"] = stale_at
+
+    job = worker.claim_next_job(client, remaining_seconds=0.001)
+
+    assert job["id"] == crashed["id"]
+    assert job["attempts"] == crashed["attempts"] + 1
+
+
+def test_two_runners_claiming_the_same_job_only_one_gets_it(monkeypatch):
+    client = FakeSupabase()
+    queue_synthetic_catalogs(client, catalogs=1, items_per_catalog=20)
+    both_picked = threading.Barrier(2, timeout=5)
+    pick = worker._pick_next_job
+
+    def pick_together(rows, **kwargs):
+        picked = pick(rows, **kwargs)
+        if picked is not None:
+            both_picked.wait()
+        return picked
+
+    monkeypatch.setattr(worker, "_pick_next_job", pick_together)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        claims = list(pool.map(lambda _: worker.claim_next_job(client), range(2)))
+
+    [claimed] = [job for job in claims if job is not None]
+    assert claims.count(None) == 1
+    assert client.tables["parser_jobs"][0]["attempts"] == claimed["attempts"] == 1
+
+
+def test_hit_ratio_comes_from_the_catalogs_own_history():
+    client = FakeSupabase()
+    queue_synthetic_catalogs(client, catalogs=2, items_per_catalog=20)
+    for _ in range(2):
+        assert worker.process_job(client, worker.claim_next_job(client))
+    reparsed = client.tables["catalogs"][0]["id"]
+    client.table("parser_jobs").insert({"catalog_id": reparsed}).execute()
+    client.table("parser_jobs").update({"reused_items": 20}).eq("catalog_id", reparsed).eq(
+        "status", "success"
+    ).execute()
+    fresh = client.table("catalogs").insert({"version_label": "Fresh", "pdf_storage_path": "fresh.pdf"}).execute()
+    client.table("parser_jobs").insert({"catalog_id": fresh.data[0]["id"]}).execute()
+
+    finished = [row["reused_items"] / row["total_items"] for row in client.tables["parser_jobs"] if row["status"] == "success"]
+
+    ratios = {
+        row["catalog_id"]: row["historic_hit_ratio"]
+        for row in client.rpc("parser_job_candidates", {"p_limit": 5}).execute().data
+    }
+
+    assert ratios[reparsed] == 1
+    # A catalog without a finished job falls back to the ratio across catalogs.
+    assert ratios[fresh.data[0]["id"]] == sum(finished) / len(finished) < 1
@@ -0,0 +1,101 @@
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import worker
+from fake_supabase import FakeSupabase, queue_catalog
+from synthetic_catalog import synthetic_items
+
+
+@pytest.fixture(autouse=True)
+def _reset_shutdown(monkeypatch):
+    monkeypatch.setattr(worker, "SHUTDOWN_POLL_SECONDS", 0.01)
+    worker._shutdown.reset()
+    yield
+    worker._shutdown.reset()
+
+
+def _on_page(monkeypatch, page_no: int, action) -> list[int]:
+    """Call ``action`` when the heavy parse reaches ``page_no``; returns the pages parsed."""
+    original = worker.parse_catalog_pdf
+    pages: list[int] = []
+
+    def parse(pdf_path, sku_filter=None, page_numbers=None, **kwargs):
+        pages.extend(sorted(page_numbers or ()))
+        if page_no in (page_numbers or ()):
+            action()
+        return original(pdf_path, sku_filter=sku_filter, page_numbers=page_numbers, **kwargs)
+
+    monkeypatch.setattr(worker, "parse_catalog_pdf", parse)
+    return pages
+
+
+def test_shutdown_stores_the_parsed_page_then_pauses(monkeypatch):
+    pages = _on_page(monkeypatch, 1, worker._shutdown.request)
+    client = FakeSupabase()
+    catalog_id = queue_catalog(client, synthetic_items(48))
+
+    job = worker.claim_next_job(client)
+    assert worker.process_job(client, job) is False
+
+    assert pages == [1]
+    row = client.tables["parser_jobs"][0]
+    assert row["status"] == "queued"
+    assert row["progress_label"] == "paused_shutdown"
+    # The page parsed when the signal came in is stored, not dropped.
+    assert len(client.tables["item_parse_cache"]) == 16
+    assert [run["outcome"] for run in client.tables["parser_runtime_history"]] == ["paused"]
+
+    worker._shutdown.reset()
+    pages.clear()
+    assert worker.process_job(client, worker.claim_next_job(client))
+    catalog = next(row for row in client.tables["catalogs"] if row["id"] == catalog_id)
+    assert pages == [2, 3]
+    assert catalog["parse_summary"]["reused_items"] == 16
+    assert len(client.tables["catalog_items"]) == 48
+
+
+def test_parse_running_past_the_grace_period_is_abandoned(monkeypatch):
+    release = threading.Event()
+
+    def stall() -> None:
+        worker._shutdown.request(grace_seconds=0.05)
+        release.wait(5)
+
+    _on_page(monkeypatch, 2, stall)
+    client = FakeSupabase()
+    queue_catalog(client, synthetic_items(48))
+
+    job = worker.claim_next_job(client)
+    with ThreadPoolExecutor(max_workers=1) as parse_executor:
+        started = time.monotonic()
+        assert worker.process_job(client, job, parse_executor=parse_executor) is False
+        assert time.monotonic() - started < 5
+        release.set()
+
+    row = client.tables["parser_jobs"][0]
+    assert (row["status"], row["progress_label"]) == ("queued", "paused_shutdown")
+    assert len(client.tables["item_parse_cache"]) == 16
+
+
+def test_no_job_is_claimed_once_shutdown_is_requested(monkeypatch):
+    monkeypatch.setattr(worker, "get_client", lambda: pytest.fail("should not connect"))
+    worker._shutdown.request()
+
+    assert worker.run_once() is False
+
+
+def test_sigterm_requests_a_drain():
+    previous = {signum: signal.getsignal(signum) for signum in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        worker._install_shutdown_handlers()
+        os.kill(os.getpid(), signal.SIGTERM)
+        assert worker._shutdown.wait(1)
+        assert not worker._shutdown.grace_expired()
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
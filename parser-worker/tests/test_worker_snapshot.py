@@ -0,0 +1,74 @@
+import gzip
+import json
+
+import worker
+from fake_supabase import FakeSupabase
+from load_harness import run_load
+from snapshot import SNAPSHOT_BUCKET, build_snapshot
+
+
+def _rows(*names: str) -> list[dict]:
+    return [
+        {"sku": f"SKU{index}", "name": name, "category": "Roses", "display_order": 0, "approved": True}
+        for index, name in enumerate(names)
+    ]
+
+
+def _snapshot(client: FakeSupabase, path: str) -> dict:
+    return json.loads(gzip.decompress(client.buckets[SNAPSHOT_BUCKET][path]))
+
+
+def test_snapshot_is_deterministic_and_in_link_order():
+    compressed, sha256 = build_snapshot("catalog-1", _rows("Tulip", "Aster"))
+    again, again_sha256 = build_snapshot("catalog-1", list(reversed(_rows("Tulip", "Aster"))))
+
+    assert (compressed, sha256) == (again, again_sha256)
+    document = json.loads(gzip.decompress(compressed))
+    assert [item["name"] for item in document["items"]] == ["Aster", "Tulip"]
+    # Only customer-visible columns are copied.
+    assert "approved" not in document["items"][0]
+
+
+def test_snapshot_order_ignores_collation_and_breaks_ties_by_sku():
+    # Same rows and order as web/src/lib/catalog/link-order.test.ts.
+    rows = _rows("Aster", "Aster", "Zinnia", "Éclair", "aster") + [
+        {"sku": "SKU5", "name": None, "category": "Roses", "display_order": None}
+    ]
+    compressed, _ = build_snapshot("catalog-1", list(reversed(rows)))
+
+    items = json.loads(gzip.decompress(compressed))["items"]
+    assert [item["sku"] for item in items] == ["SKU5", "SKU0", "SKU1", "SKU2", "SKU4", "SKU3"]
+
+
+def test_completed_job_writes_the_catalog_snapshot():
+    client = FakeSupabase()
+    run_load(catalogs=1, items_per_catalog=16, client=client)
+
+    catalog = client.tables["catalogs"][-1]
+    assert catalog["snapshot_path"] == f"{catalog['id']}/{catalog['snapshot_sha256']}.json.gz"
+    items = _snapshot(client, catalog["snapshot_path"])["items"]
+    assert sorted(item["sku"] for item in items) == sorted(
+        row["sku"] for row in client.tables["catalog_items"]
+    )
+
+
+def test_sweep_refreshes_invalidated_snapshots_unless_edited_again(monkeypatch):
+    client = FakeSupabase()
+    run_load(catalogs=2, items_per_catalog=16, client=client)
+    first, second = client.tables["catalogs"]
+    for catalog in (first, second):
+        catalog.update({"snapshot_path": None, "snapshot_sha256": None})
+    # An edit lands between the sweep's catalog read and its write.
+    real_write = worker._write_catalog_snapshot
+
+    def write_then_edit(client, *, catalog_id, rows):
+        columns = real_write(client, catalog_id=catalog_id, rows=rows)
+        if catalog_id == second["id"]:
+            second["items_version"] += 1
+        return columns
+
+    monkeypatch.setattr(worker, "_write_catalog_snapshot", write_then_edit)
+    assert worker.refresh_stale_snapshots(client) == 1
+
+    assert first["snapshot_path"] is not None
+    assert second["snapshot_path"] is None
@@ -0,0 +1,74 @@
+import io
+
+import pytest
+from PIL import Image
+
+import worker
+from fake_supabase import FakeSupabase
+from load_harness import run_load
+from sprites import build_sprite_sheet, sprite_offset, sprite_pages
+
+
+def _png(color: tuple[int, int, int], size: tuple[int, int]) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def sprites_on(monkeypatch):
+    monkeypatch.setattr(worker, "PARSER_SPRITE_SHEETS", True)
+
+
+def test_sheet_places_each_image_in_its_fixed_cell():
+    images = [_png((255, 0, 0), (40, 20)), None, b"not an image", _png((0, 0, 255), (10, 30)), _png((0, 255, 0), (8, 8))]
+    sheet = Image.open(io.BytesIO(build_sprite_sheet(images, cell_px=32, quality=100)))
+
+    assert sheet.format == "WEBP"
+    assert sheet.size == (128, 64)
+    assert sprite_offset(4, len(images), 32) == {"x": 0, "y": 32, "w": 32, "h": 32, "sheet_w": 128, "sheet_h": 64}
+    rgba = sheet.convert("RGBA")
+    assert rgba.getpixel((16, 16))[0] > 200  # scaled into cell 0
+    assert rgba.getpixel((48, 16))[3] == 0  # no image: blank cell
+    assert rgba.getpixel((112, 16))[2] > 200  # cell 3
+    assert rgba.getpixel((16, 48))[1] > 200  # cell 4 starts the second row
+
+
+def test_sheet_path_changes_only_with_the_pages_images():
+    rows = [
+        {"sku": "A1", "image_storage_path": "a.jpg", "source_page_no": 1, "display_order": 1},
+        {"sku": "B1", "image_storage_path": "b.jpg", "source_page_no": 2, "display_order": 2},
+        {"sku": "C1", "image_storage_path": "", "source_page_no": 2, "display_order": 3},
+    ]
+    first = sprite_pages(rows)
+    rows[1]["image_storage_path"] = "b2.jpg"
+    second = sprite_pages(rows)
+
+    assert [len(page) for page in first.values()] == [1, 1]
+    assert list(first)[0] == list(second)[0]
+    assert list(first)[1] != list(second)[1]
+
+
+def test_jobs_write_sheets_only_for_pages_whose_images_changed(sprites_on):
+    client = FakeSupabase()
+    run_load(catalogs=2, items_per_catalog=32, changed_fraction=0.1, client=client)
+
+    first, second = client.tables["catalogs"]
+    assert first["parse_summary"]["sprite_sheets"] == {"pages": 2, "written": 2, "failed": 0}
+    # Only the first page has new images, so only its sheet is rebuilt.
+    assert second["parse_summary"]["sprite_sheets"] == {"pages": 2, "written": 1, "failed": 0}
+    assert len([path for path in client.buckets["product-images"] if path.startswith("sprites/")]) == 3
+    # The first job packed its own uploads; the second downloaded the 13 reused images of page one.
+    assert client.count_requests("storage", "product-images", "download") == 13
+
+    items = [row for row in client.tables["catalog_items"] if row["catalog_id"] == second["id"]]
+    assert all(row["sprite_path"] and row["sprite_offset"]["w"] == worker.PARSER_SPRITE_CELL_PX for row in items)
+    assert len({row["sprite_path"] for row in items}) == 2
+
+
+def test_sprite_stage_is_off_by_default():
+    client = FakeSupabase()
+    run_load(catalogs=1, items_per_catalog=16, client=client)
+
+    assert "sprite_sheets" not in client.tables["catalogs"][0]["parse_summary"]
+    assert all(row["sprite_path"] is None for row in client.tables["catalog_items"])
@@ -60,3 +60,19 @@ def test_capture_verification_flags_out_of_range_or_invalid_last_page():
     assert result["capture_verification_passed"] is False
     assert result["last_page_item_count"] == 0
     assert result["actual_unique_skus"] == 32
+
+
+def test_capture_verification_reports_template_hit_rate():
+    candidates = _make_candidates([16, 16, 16, 5])
+    for candidate in candidates:
+        if candidate.page_no > 2:
+            candidate.layout = "template"
+    result = _build_capture_verification(
+        catalog_page_count=4,
+        candidates=candidates,
+        unique_sku_count=53,
+    )
+
+    assert result["template_pages"] == 2
+    assert result["template_page_hit_rate"] == 0.5
+    assert result["heuristic_page_numbers"] == [1, 2]
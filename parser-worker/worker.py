@@ -1,18 +1,43 @@
 from __future__ import annotations
 
 import hashlib
+import importlib.util
+import json
 import logging
+import multiprocessing
 import os
+import queue
+import random
+import signal
 import tempfile
+import threading
 import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from dataclasses import asdict, dataclass, fields
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
 from dotenv import load_dotenv
-from pypdf import PdfReader
-from supabase import Client, create_client
 
-from parser import QuickCandidate, parse_catalog_pdf, scan_catalog_fast
+from parser import (
+    DEFAULT_EXTRACTION_BACKEND,
+    LAYOUT_TEMPLATE,
+    ParsedItem,
+    QuickCandidate,
+    parse_catalog_pdf,
+    scan_catalog_fast,
+    scan_catalog_pages,
+)
+from prefetch import PdfPrefetcher, PrefetchTarget
+from profiling import JobProfiler, parse_profile_kinds
+from snapshot import SNAPSHOT_ITEM_FIELDS, upload_snapshot
+from sprites import build_sprite_sheet, sprite_offset, sprite_pages
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 load_dotenv()
 
@@ -22,10 +47,53 @@ PARSER_POLL_SECONDS = int(os.environ.get("PARSER_POLL_SECONDS", "10"))
 LOG_LEVEL = os.environ.get("PARSER_LOG_LEVEL", "INFO")
 PARSER_MAX_RUN_SECONDS = int(os.environ.get("PARSER_MAX_RUN_SECONDS", "1020"))
 PARSER_STALE_PROCESSING_MINUTES = int(os.environ.get("PARSER_STALE_PROCESSING_MINUTES", "15"))
+PARSER_HEARTBEAT_SECONDS = float(os.environ.get("PARSER_HEARTBEAT_SECONDS", "5"))
+PARSER_LEASE_SECONDS = int(os.environ.get("PARSER_LEASE_SECONDS", "60"))
+PARSER_SCHEDULER_WINDOW = int(os.environ.get("PARSER_SCHEDULER_WINDOW", "25"))
+PARSER_CONCURRENCY = max(1, int(os.environ.get("PARSER_CONCURRENCY", "1")))
+PARSER_MAX_JOBS_PER_RUN = int(os.environ.get("PARSER_MAX_JOBS_PER_RUN", "5"))
+PARSER_PERSIST_BATCH_SIZE = max(1, int(os.environ.get("PARSER_PERSIST_BATCH_SIZE", "500")))
+PARSER_TEXT_BACKEND = os.environ.get("PARSER_TEXT_BACKEND", DEFAULT_EXTRACTION_BACKEND)
+PARSER_PROFILE = os.environ.get("PARSER_PROFILE", "")
+PARSER_PROFILE_TOP_N = int(os.environ.get("PARSER_PROFILE_TOP_N", "25"))
+PARSER_PROFILE_DIR = os.environ.get("PARSER_PROFILE_DIR", "")
+PARSER_RETRY_ATTEMPTS = max(1, int(os.environ.get("PARSER_RETRY_ATTEMPTS", "4")))
+PARSER_RETRY_BASE_SECONDS = float(os.environ.get("PARSER_RETRY_BASE_SECONDS", "0.5"))
+PARSER_RETRY_MAX_SECONDS = float(os.environ.get("PARSER_RETRY_MAX_SECONDS", "8"))
+PARSER_MAX_RETRY_JOBS = int(os.environ.get("PARSER_MAX_RETRY_JOBS", "2"))
+PARSER_SHUTDOWN_GRACE_SECONDS = float(os.environ.get("PARSER_SHUTDOWN_GRACE_SECONDS", "8"))
+PARSER_HTTP_TIMEOUT_SECONDS = float(os.environ.get("PARSER_HTTP_TIMEOUT_SECONDS", "60"))
+PARSER_HTTP_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("PARSER_HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+PARSER_HTTP_MAX_CONNECTIONS = int(os.environ.get("PARSER_HTTP_MAX_CONNECTIONS", "20"))
+PARSER_HTTP_KEEPALIVE_SECONDS = float(os.environ.get("PARSER_HTTP_KEEPALIVE_SECONDS", "120"))
+PARSER_SPRITE_SHEETS = os.environ.get("PARSER_SPRITE_SHEETS", "").strip().lower() in {"1", "true", "on"}
+PARSER_SPRITE_CELL_PX = int(os.environ.get("PARSER_SPRITE_CELL_PX", "240"))
+PARSER_SPRITE_QUALITY = int(os.environ.get("PARSER_SPRITE_QUALITY", "80"))
+PARSER_PIPELINE = os.environ.get("PARSER_PIPELINE", "").strip().lower() in {"1", "true", "on"}
+PARSER_PIPELINE_SCAN_AHEAD = max(1, int(os.environ.get("PARSER_PIPELINE_SCAN_AHEAD", "4")))
+PARSER_PIPELINE_PARSE_AHEAD = max(0, int(os.environ.get("PARSER_PIPELINE_PARSE_AHEAD", "1")))
+PARSER_PREFETCH_MAX_BYTES = int(os.environ.get("PARSER_PREFETCH_MAX_BYTES", str(256 * 1024 * 1024)))
 
 logging.basicConfig(level=getattr(logging, LOG_LEVEL.upper(), logging.INFO))
 logger = logging.getLogger("parser-worker")
 ASSUMED_ITEMS_PER_PAGE = 16
+# Rough unit costs, used until parser_runtime_history has measurements.
+ESTIMATED_SCAN_SECONDS_PER_PAGE = 0.25
+ESTIMATED_PARSE_SECONDS_PER_ITEM = 0.45
+ESTIMATED_UPLOAD_SECONDS_PER_ITEM = 0.15
+ESTIMATED_PDF_BYTES_PER_PAGE = 400_000
+DEFAULT_ESTIMATED_PAGES = 50
+TRANSIENT_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+SKU_NOT_FOUND_ERROR = "SKU not found in heavy parse output"
+NOT_RETRIED_ERROR = "Not retried: the previous job failed this SKU permanently"
+SHUTDOWN_POLL_SECONDS = 0.5
+PIPELINE_POLL_SECONDS = 0.05
+SNAPSHOT_SWEEP_SECONDS = 300
+STALE_SNAPSHOT_BATCH = 10
+PAUSE_TIME_BUDGET = "time_budget"
+PAUSE_SHUTDOWN = "shutdown"
+
+T = TypeVar("T")
 
 
 def now_iso() -> str:
@@ -36,10 +104,73 @@ def _stale_processing_cutoff_iso() -> str:
     return (datetime.now(timezone.utc) - timedelta(minutes=PARSER_STALE_PROCESSING_MINUTES)).isoformat()
 
 
-def get_client() -> Client:
+def _lease_expiry_cutoff_iso() -> str:
+    return (datetime.now(timezone.utc) - timedelta(seconds=PARSER_LEASE_SECONDS)).isoformat()
+
+
+def _create_pooled_client() -> tuple[Client, Any]:
     if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
         raise RuntimeError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required.")
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    import httpx
+    from supabase import create_client
+    from supabase.lib.client_options import SyncClientOptions
+
+    # One keep-alive pool shared by PostgREST, RPC and storage calls.
+    http_client = httpx.Client(
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=httpx.Timeout(
+            PARSER_HTTP_TIMEOUT_SECONDS,
+            connect=PARSER_HTTP_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=PARSER_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=PARSER_HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=PARSER_HTTP_KEEPALIVE_SECONDS,
+        ),
+        follow_redirects=True,
+    )
+    client = create_client(
+        SUPABASE_URL,
+        SUPABASE_SERVICE_ROLE_KEY,
+        options=SyncClientOptions(httpx_client=http_client),
+    )
+    return client, http_client
+
+
+class WorkerContext:
+    """Owns the API client shared by every job a worker process runs.
+
+    The client is created on first use and kept for the life of the process; ``reset``
+    drops it after a failure so the next access reconnects.
+    """
+
+    def __init__(self) -> None:
+        self._client: Client | None = None
+        self._http_client: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Client:
+        with self._lock:
+            if self._client is None:
+                self._client, self._http_client = _create_pooled_client()
+            return self._client
+
+    def reset(self) -> None:
+        with self._lock:
+            http_client, self._client, self._http_client = self._http_client, None, None
+        if http_client is not None:
+            try:
+                http_client.close()
+            except Exception:
+                logger.debug("Ignoring error while closing HTTP client", exc_info=True)
+
+
+_worker_context = WorkerContext()
+
+
+def get_client() -> Client:
+    return _worker_context.client
 
 
 def _sha256_hex(value: bytes | str) -> str:
@@ -58,6 +189,52 @@ def _normalize_text(value: str | None) -> str:
     return " ".join(value.strip().lower().split())
 
 
+def _error_status_code(exc: BaseException) -> int | None:
+    response = getattr(exc, "response", None)
+    candidates = [getattr(exc, attr, None) for attr in ("status_code", "status", "code")]
+    candidates.append(getattr(response, "status_code", None))
+    for value in candidates:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _is_transient_error(exc: BaseException) -> bool:
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    import httpx
+
+    if isinstance(exc, httpx.TransportError):
+        return True
+    return _error_status_code(exc) in TRANSIENT_STATUS_CODES
+
+
+def _with_retry(operation: Callable[[], T], *, description: str) -> T:
+    """Run ``operation``, retrying transient errors with full-jitter exponential backoff."""
+    for attempt in range(1, PARSER_RETRY_ATTEMPTS + 1):
+        try:
+            return operation()
+        except Exception as exc:
+            if attempt >= PARSER_RETRY_ATTEMPTS or not _is_transient_error(exc) or _shutdown.requested:
+                raise
+            delay = random.uniform(
+                0,
+                min(PARSER_RETRY_MAX_SECONDS, PARSER_RETRY_BASE_SECONDS * 2 ** (attempt - 1)),
+            )
+            logger.warning(
+                "%s failed (attempt %s/%s), retrying in %.2fs: %s",
+                description,
+                attempt,
+                PARSER_RETRY_ATTEMPTS,
+                delay,
+                exc,
+            )
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
 def _item_signature(
     sku: str,
     name: str,
@@ -95,17 +272,72 @@ def _load_baseline_catalog_id(client: Client, catalog_id: str) -> str | None:
     return rows[0]["id"] if rows else None
 
 
-def _load_baseline_items(client: Client, baseline_catalog_id: str | None) -> dict[str, dict]:
-    if not baseline_catalog_id:
-        return {}
-    result = (
-        client.table("catalog_items")
-        .select("sku,signature,name,upc,pack,category,image_storage_path")
-        .eq("catalog_id", baseline_catalog_id)
-        .execute()
+def _diff_against_baseline(
+    client: Client,
+    baseline_catalog_id: str | None,
+    signatures_by_sku: dict[str, str],
+    *,
+    catalog_id: str,
+) -> tuple[dict[str, str], int]:
+    # New/updated come from each SKU's latest published version in another catalog
+    # (sku_latest_versions), so a re-parsed published catalog is not compared with
+    # itself. The baseline catalog only decides removed_items.
+    result = client.rpc(
+        "diff_catalog_items_against_latest",
+        {
+            "p_baseline_catalog_id": baseline_catalog_id,
+            "p_catalog_id": catalog_id,
+            "p_items": [
+                {"sku": sku, "signature": signature}
+                for sku, signature in signatures_by_sku.items()
+            ],
+        },
+    ).execute()
+    diff = result.data or {}
+    change_types = {sku: "unchanged" for sku in signatures_by_sku}
+    for sku in diff.get("updated") or []:
+        change_types[sku] = "updated"
+    for sku in diff.get("new") or []:
+        change_types[sku] = "new"
+    return change_types, int(diff.get("removed_items") or 0)
+
+
+def _chunks(rows: list[dict], size: int) -> list[list[dict]]:
+    return [rows[index : index + size] for index in range(0, len(rows), size)]
+
+
+def _sync_rows(client: Client, rpc_name: str, params: dict, rows: list[dict]) -> int:
+    written = 0
+    for chunk in _chunks(rows, PARSER_PERSIST_BATCH_SIZE):
+        result = _with_retry(
+            lambda: client.rpc(rpc_name, {**params, "p_rows": chunk}).execute(),
+            description=rpc_name,
+        )
+        written += int(result.data or 0)
+    return written
+
+
+def _sync_parser_job_items(client: Client, *, job_id: str, catalog_id: str, rows: list[dict]) -> int:
+    return _sync_rows(
+        client,
+        "sync_parser_job_items",
+        {"p_job_id": job_id, "p_catalog_id": catalog_id},
+        rows,
     )
-    rows = result.data or []
-    return {row["sku"]: row for row in rows}
+
+
+def _prune_parser_job_items(client: Client, *, job_id: str, skus: list[str]) -> None:
+    """Drop job items an earlier run of the job scanned that this run's scan did not find."""
+    client.rpc("prune_parser_job_items", {"p_job_id": job_id, "p_keep_skus": skus}).execute()
+
+
+def _sync_catalog_items(client: Client, *, catalog_id: str, rows: list[dict]) -> int:
+    written = _sync_rows(client, "sync_catalog_items", {"p_catalog_id": catalog_id}, rows)
+    client.rpc(
+        "prune_catalog_items",
+        {"p_catalog_id": catalog_id, "p_keep_skus": [row["sku"] for row in rows]},
+    ).execute()
+    return written
 
 
 def _progress_percent(total_items: int, done_items: int) -> int:
@@ -125,7 +357,10 @@ def _summarize_progress(
     parsed_pages: int,
     total_pages: int,
     capture_verification: dict | None = None,
+    eta: dict | None = None,
+    expected_items: int | None = None,
 ) -> dict:
+    """``expected_items`` projects the total while the scan is still running, so the percentage does not fall back."""
     done_items = reused_items + processed_items + failed_items
     summary = {
         "raw_candidates": raw_candidates,
@@ -137,10 +372,12 @@ def _summarize_progress(
         "failed_items": failed_items,
         "parsed_pages": parsed_pages,
         "total_pages": total_pages,
-        "progress_percent": _progress_percent(total_items, done_items),
+        "progress_percent": _progress_percent(max(total_items, expected_items or 0), done_items),
     }
     if capture_verification:
         summary.update(capture_verification)
+    if eta:
+        summary.update(eta)
     return summary
 
 
@@ -154,8 +391,11 @@ def _build_capture_verification(
     expected_max = catalog_page_count * ASSUMED_ITEMS_PER_PAGE
 
     page_skus: dict[int, set[str]] = {}
+    page_layouts: dict[int, str] = {}
     for candidate in candidates:
         page_skus.setdefault(candidate.page_no, set()).add(candidate.sku)
+        page_layouts[candidate.page_no] = candidate.layout
+    template_pages = sorted(page for page, layout in page_layouts.items() if layout == LAYOUT_TEMPLATE)
 
     non_last_page_count_mismatches: list[dict[str, int]] = []
     if catalog_page_count > 1:
@@ -203,6 +443,11 @@ def _build_capture_verification(
         "last_page_item_count": last_page_item_count,
         "capture_verification_passed": capture_verification_passed,
         "capture_verification_message": capture_verification_message,
+        "template_pages": len(template_pages),
+        "template_page_hit_rate": (
+            round(len(template_pages) / len(page_layouts), 3) if page_layouts else 0.0
+        ),
+        "heuristic_page_numbers": sorted(set(page_layouts) - set(template_pages)),
     }
 
 
@@ -225,6 +470,8 @@ def _update_processing_progress(
             "progress_label": progress_label,
             "parsed_pages": progress["parsed_pages"],
             "total_pages": progress["total_pages"],
+            "eta_seconds": progress.get("eta_seconds"),
+            "fits_run_budget": progress.get("fits_run_budget"),
         }
     ).eq("id", job_id).execute()
 
@@ -236,63 +483,325 @@ def _update_processing_progress(
     ).eq("id", catalog_id).execute()
 
 
-def claim_next_job(client: Client):
-    result = (
-        client.table("parser_jobs")
-        .select("id,catalog_id,status,attempts")
-        .eq("status", "queued")
-        .order("created_at")
-        .limit(1)
-        .execute()
+@dataclass(frozen=True)
+class RuntimeModel:
+    """Seconds per unit of work for each stage of a parser job."""
+
+    scan_seconds_per_page: float = ESTIMATED_SCAN_SECONDS_PER_PAGE
+    parse_seconds_per_item: float = ESTIMATED_PARSE_SECONDS_PER_ITEM
+    upload_seconds_per_item: float = ESTIMATED_UPLOAD_SECONDS_PER_ITEM
+
+    @classmethod
+    def from_job(cls, job: dict) -> RuntimeModel:
+        """Rates measured by recent runs (from parser_job_candidates), else the defaults."""
+        defaults = cls()
+        return cls(
+            **{
+                field.name: float(job.get(field.name) or getattr(defaults, field.name))
+                for field in fields(cls)
+            }
+        )
+
+    @property
+    def item_seconds(self) -> float:
+        return self.parse_seconds_per_item + self.upload_seconds_per_item
+
+
+def _per_second(units: int, seconds: float) -> float | None:
+    return round(units / seconds, 2) if seconds > 0 else None
+
+
+@dataclass
+class JobRuntime:
+    """Work done and time spent in each stage during one run of a job."""
+
+    scan_pages: int = 0
+    scan_seconds: float = 0.0
+    parse_pages: int = 0
+    parse_items: int = 0
+    parse_seconds: float = 0.0
+    upload_items: int = 0
+    upload_seconds: float = 0.0
+
+    def model(self, fallback: RuntimeModel) -> RuntimeModel:
+        """This run's own rates where it has measured any, else ``fallback``'s."""
+        return RuntimeModel(
+            scan_seconds_per_page=(
+                self.scan_seconds / self.scan_pages if self.scan_pages else fallback.scan_seconds_per_page
+            ),
+            parse_seconds_per_item=(
+                self.parse_seconds / self.parse_items if self.parse_items else fallback.parse_seconds_per_item
+            ),
+            upload_seconds_per_item=(
+                self.upload_seconds / self.upload_items if self.upload_items else fallback.upload_seconds_per_item
+            ),
+        )
+
+    def throughput(self) -> dict:
+        return {
+            "scan_pages_per_second": _per_second(self.scan_pages, self.scan_seconds),
+            "parse_pages_per_second": _per_second(self.parse_pages, self.parse_seconds),
+            "parse_items_per_second": _per_second(self.parse_items, self.parse_seconds),
+            "upload_items_per_second": _per_second(self.upload_items, self.upload_seconds),
+        }
+
+    def row(self) -> dict:
+        return {key: round(value, 3) if isinstance(value, float) else value for key, value in asdict(self).items()}
+
+
+def _eta(model: RuntimeModel, *, pending_items: int, deadline: float | None) -> dict:
+    eta_seconds = round(max(0, pending_items) * model.item_seconds, 1)
+    return {
+        "eta_seconds": eta_seconds,
+        "fits_run_budget": deadline is None or time.monotonic() + eta_seconds <= deadline,
+    }
+
+
+def _record_runtime(
+    client: Client,
+    *,
+    job_id: str,
+    catalog_id: str,
+    outcome: str,
+    runtime: JobRuntime,
+) -> None:
+    try:
+        client.table("parser_runtime_history").insert(
+            {"parser_job_id": job_id, "catalog_id": catalog_id, "outcome": outcome, **runtime.row()}
+        ).execute()
+    except Exception:
+        # History only sharpens estimates; losing a row must not fail the job.
+        logger.exception("Could not record runtime history for parser job %s", job_id)
+
+
+def _estimated_pages(job: dict) -> int:
+    total_pages = int(job.get("total_pages") or 0)
+    if total_pages > 0:
+        return total_pages
+    pdf_size_bytes = int(job.get("pdf_size_bytes") or 0)
+    if pdf_size_bytes:
+        return max(1, round(pdf_size_bytes / ESTIMATED_PDF_BYTES_PER_PAGE))
+    return DEFAULT_ESTIMATED_PAGES
+
+
+def _estimate_job_cost_seconds(job: dict) -> float:
+    total_pages = _estimated_pages(job)
+    total_items = int(job.get("total_items") or 0)
+    if total_items > 0:
+        # Resumed job: everything counted in progress is cached by now.
+        pending_items = total_items * (1 - int(job.get("progress_percent") or 0) / 100)
+    else:
+        hit_ratio = float(job.get("historic_hit_ratio") or 0)
+        pending_items = total_pages * ASSUMED_ITEMS_PER_PAGE * (1 - hit_ratio)
+
+    model = RuntimeModel.from_job(job)
+    return total_pages * model.scan_seconds_per_page + max(0.0, pending_items) * model.item_seconds
+
+
+def _should_start_job(job: dict, *, remaining_seconds: float | None) -> bool:
+    """Whether to start ``job`` now, with ``remaining_seconds`` left in this run.
+
+    A job that fits what is left starts. One that would fit a fresh run but not this
+    one stays queued for that run. A job too big for any single run starts as long
+    as the scan and one page of parsing fit.
+    """
+    if remaining_seconds is None:
+        return True
+    cost = _estimate_job_cost_seconds(job)
+    if cost <= remaining_seconds:
+        return True
+    if PARSER_MAX_RUN_SECONDS > 0 and cost <= PARSER_MAX_RUN_SECONDS:
+        return False
+    model = RuntimeModel.from_job(job)
+    first_page_seconds = (
+        _estimated_pages(job) * model.scan_seconds_per_page + ASSUMED_ITEMS_PER_PAGE * model.item_seconds
     )
-    rows = result.data or []
-    reclaimed_stale_job = False
-    if not rows:
-        stale_result = (
+    return first_page_seconds <= remaining_seconds
+
+
+def _response_ratio(job: dict, now: datetime) -> float:
+    cost = max(1.0, _estimate_job_cost_seconds(job))
+    waited = (now - datetime.fromisoformat(job["created_at"])).total_seconds()
+    return (max(0.0, waited) + cost) / cost
+
+
+def _pick_next_job(
+    rows: list[dict],
+    *,
+    now: datetime | None = None,
+    remaining_seconds: float | None = None,
+) -> dict | None:
+    """Highest priority first, then highest response ratio (shortest job first with aging).
+
+    Jobs that ``_should_start_job`` would leave for a fresh run are skipped.
+    """
+    now = now or datetime.now(timezone.utc)
+    ranked = sorted(
+        rows,
+        key=lambda row: (int(row.get("priority") or 0), _response_ratio(row, now)),
+        reverse=True,
+    )
+    return next(
+        (row for row in ranked if _should_start_job(row, remaining_seconds=remaining_seconds)),
+        None,
+    )
+
+
+def _job_candidates(client: Client) -> list[dict]:
+    """The top ``PARSER_SCHEDULER_WINDOW`` queued jobs by priority and response ratio.
+
+    The RPC ranks the whole queue with the same cost estimate as
+    ``_estimate_job_cost_seconds``, so a short job deep in the queue still makes the
+    window. ``_pick_next_job`` then re-ranks the window with the current run's budget.
+    """
+    return (
+        client.rpc(
+            "parser_job_candidates",
+            {
+                "p_limit": PARSER_SCHEDULER_WINDOW,
+                "p_default_scan_seconds_per_page": ESTIMATED_SCAN_SECONDS_PER_PAGE,
+                "p_default_parse_seconds_per_item": ESTIMATED_PARSE_SECONDS_PER_ITEM,
+                "p_default_upload_seconds_per_item": ESTIMATED_UPLOAD_SECONDS_PER_ITEM,
+                "p_pdf_bytes_per_page": ESTIMATED_PDF_BYTES_PER_PAGE,
+                "p_default_pages": DEFAULT_ESTIMATED_PAGES,
+                "p_items_per_page": ASSUMED_ITEMS_PER_PAGE,
+            },
+        ).execute().data
+        or []
+    )
+
+
+def _superseded_jobs(rows: list[dict]) -> dict[str, dict]:
+    """Map each queued job made redundant by another to the job that covers it.
+
+    Full jobs are duplicates when they target the same catalog or the same PDF content,
+    and the newest one wins. A follow-up job (``retry_skus`` set) parses only some SKUs,
+    so it never supersedes anything. It is itself superseded by a full job for its own
+    catalog, whichever is newer, and otherwise runs.
+    """
+    newest_for: dict[tuple[str, str], dict] = {}
+    superseded: dict[str, dict] = {}
+    full_jobs = [row for row in rows if not row.get("retry_skus")]
+    for row in sorted(full_jobs, key=lambda row: row["created_at"], reverse=True):
+        keys = [("catalog", row["catalog_id"])]
+        if row.get("pdf_content_hash"):
+            keys.append(("pdf", row["pdf_content_hash"]))
+        winner = next((newest_for[key] for key in keys if key in newest_for), None)
+        if winner is not None:
+            superseded[row["id"]] = winner
+        for key in keys:
+            newest_for.setdefault(key, winner or row)
+    for row in rows:
+        winner = newest_for.get(("catalog", row["catalog_id"]))
+        if row.get("retry_skus") and winner is not None and winner["catalog_id"] == row["catalog_id"]:
+            superseded[row["id"]] = winner
+    return superseded
+
+
+def _close_superseded_jobs(client: Client, rows: list[dict]) -> list[dict]:
+    """Close queued duplicates as superseded; returns the jobs still worth running."""
+    superseded = _superseded_jobs(rows)
+    if not superseded:
+        return rows
+
+    losers_by_winner: dict[str, list[dict]] = {}
+    for row in rows:
+        if row["id"] in superseded:
+            losers_by_winner.setdefault(superseded[row["id"]]["id"], []).append(row)
+    winners = {row["id"]: row for row in rows if row["id"] not in superseded}
+    for winner_id, losers in losers_by_winner.items():
+        winner = winners[winner_id]
+        message = f"Superseded by parser job {winner_id}."
+        closed = (
             client.table("parser_jobs")
-            .select("id,catalog_id,status,attempts,started_at")
-            .eq("status", "processing")
-            .is_("finished_at", "null")
-            .lt("started_at", _stale_processing_cutoff_iso())
-            .order("started_at")
-            .limit(1)
+            .update(
+                {
+                    "status": "superseded",
+                    "superseded_by_job_id": winner_id,
+                    "error_log": message,
+                    "finished_at": now_iso(),
+                    "progress_label": "superseded",
+                }
+            )
+            .in_("id", [row["id"] for row in losers])
+            # Skip a duplicate another worker claimed in the meantime.
+            .eq("status", "queued")
             .execute()
+        ).data or []
+        # A duplicate PDF uploaded as another catalog: that catalog's parse will not run,
+        # so it points at the catalog that parses the same PDF instead.
+        other_catalog_ids = sorted({row["catalog_id"] for row in closed} - {winner["catalog_id"]})
+        if other_catalog_ids:
+            client.table("catalogs").update(
+                {
+                    "parse_status": "superseded",
+                    "parse_summary": {
+                        "progress_label": "superseded",
+                        "message": f"The same PDF was uploaded again as catalog {winner['catalog_id']}.",
+                        "superseded_by_job_id": winner_id,
+                        "superseded_by_catalog_id": winner["catalog_id"],
+                    },
+                }
+            ).in_("id", other_catalog_ids).execute()
+        logger.info(
+            "Parser jobs %s superseded by %s",
+            ", ".join(row["id"] for row in closed),
+            winner_id,
         )
-        rows = stale_result.data or []
-        reclaimed_stale_job = bool(rows)
+    return list(winners.values())
 
-    if not rows:
-        return None
 
-    job = rows[0]
+def _claim_job(client: Client, job: dict, *, reclaimed_stale_job: bool) -> dict | None:
+    """Take ``job`` if no other runner has since claimed it; ``None`` when one has."""
     if reclaimed_stale_job:
         logger.warning(
-            "Reclaiming stale parser job %s catalog=%s started_at=%s",
+            "Reclaiming stale parser job %s catalog=%s started_at=%s heartbeat_at=%s",
             job["id"],
             job["catalog_id"],
             job.get("started_at"),
+            job.get("heartbeat_at"),
         )
 
     attempts = int(job.get("attempts") or 0) + 1
-    client.table("parser_jobs").update(
-        {
-            "status": "processing",
-            "attempts": attempts,
-            "started_at": now_iso(),
-            "error_log": None
-            if not reclaimed_stale_job
-            else "Previous parser run stalled or was canceled before completion; retrying.",
-            "total_items": 0,
-            "reused_items": 0,
-            "queued_items": 0,
-            "processed_items": 0,
-            "failed_items": 0,
-            "progress_percent": 0,
-            "progress_label": "retrying_after_stall" if reclaimed_stale_job else "queued",
-            "parsed_pages": 0,
-            "total_pages": 0,
-        }
-    ).eq("id", job["id"]).execute()
+    estimated_cost_seconds = round(_estimate_job_cost_seconds(job), 1)
+    logger.info(
+        "Claiming parser job %s priority=%s estimated_cost=%ss",
+        job["id"],
+        job.get("priority", 0),
+        estimated_cost_seconds,
+    )
+    claimed = (
+        client.table("parser_jobs")
+        .update(
+            {
+                "status": "processing",
+                "attempts": attempts,
+                "estimated_cost_seconds": estimated_cost_seconds,
+                "started_at": now_iso(),
+                "heartbeat_at": now_iso(),
+                "error_log": None
+                if not reclaimed_stale_job
+                else "Previous parser run stalled or was canceled before completion; retrying.",
+                "total_items": 0,
+                "reused_items": 0,
+                "queued_items": 0,
+                "processed_items": 0,
+                "failed_items": 0,
+                "progress_percent": 0,
+                "progress_label": "retrying_after_stall" if reclaimed_stale_job else "queued",
+                "parsed_pages": 0,
+                "total_pages": 0,
+            }
+        )
+        .eq("id", job["id"])
+        # Another runner that read the same row claims it first and bumps attempts.
+        .eq("status", job["status"])
+        .eq("attempts", attempts - 1)
+        .execute()
+    ).data
+    if not claimed:
+        logger.info("Parser job %s was claimed by another runner", job["id"])
+        return None
 
     client.table("catalogs").update(
         {
@@ -303,15 +812,44 @@ def claim_next_job(client: Client):
             },
         }
     ).eq("id", job["catalog_id"]).execute()
+    job["attempts"] = attempts
+    # A stale row is read without retry_skus; the claimed row carries it either way.
+    job["retry_skus"] = claimed[0].get("retry_skus")
     return job
 
 
-def _classify_change_type(sku: str, signature: str, baseline_items: dict[str, dict]) -> str:
-    baseline = baseline_items.get(sku)
-    if not baseline:
-        return "new"
-    baseline_signature = baseline.get("signature") or ""
-    return "unchanged" if baseline_signature == signature else "updated"
+def claim_next_job(client: Client, *, remaining_seconds: float | None = None):
+    candidates = _close_superseded_jobs(client, _job_candidates(client))
+    while (picked := _pick_next_job(candidates, remaining_seconds=remaining_seconds)) is not None:
+        job = _claim_job(client, picked, reclaimed_stale_job=False)
+        if job is not None:
+            return job
+        candidates.remove(picked)
+
+    # A crashed job is reclaimed even when no queued job fits what is left of this run.
+    stale_result = (
+        client.table("parser_jobs")
+        .select("id,catalog_id,status,attempts,started_at,heartbeat_at,profile")
+        .eq("status", "processing")
+        .is_("finished_at", "null")
+        .or_(
+            f'heartbeat_at.lt."{_lease_expiry_cutoff_iso()}",'
+            f'and(heartbeat_at.is.null,started_at.lt."{_stale_processing_cutoff_iso()}")'
+        )
+        .order("started_at")
+        .limit(1)
+        .execute()
+    )
+    if stale_result.data:
+        return _claim_job(client, stale_result.data[0], reclaimed_stale_job=True)
+
+    if candidates:
+        logger.info(
+            "Leaving %s queued parser jobs for a fresh run; %.0fs left in this one",
+            len(candidates),
+            remaining_seconds,
+        )
+    return None
 
 
 def _dedupe_candidates(candidates: list[QuickCandidate]) -> list[QuickCandidate]:
@@ -322,8 +860,196 @@ def _dedupe_candidates(candidates: list[QuickCandidate]) -> list[QuickCandidate]
     return list(unique.values())
 
 
-def _should_pause_for_time_budget(deadline: float | None) -> bool:
-    return deadline is not None and time.monotonic() >= deadline
+def _should_pause_for_time_budget(deadline: float | None, *, reserve_seconds: float = 0.0) -> bool:
+    return deadline is not None and time.monotonic() + reserve_seconds >= deadline
+
+
+def _group_candidates_by_page(
+    candidates: dict[str, QuickCandidate],
+) -> list[tuple[int, dict[str, QuickCandidate]]]:
+    pages: dict[int, dict[str, QuickCandidate]] = {}
+    for sku, candidate in candidates.items():
+        pages.setdefault(candidate.page_no, {})[sku] = candidate
+    return sorted(pages.items())
+
+
+def _run_deadline() -> float | None:
+    return time.monotonic() + PARSER_MAX_RUN_SECONDS if PARSER_MAX_RUN_SECONDS > 0 else None
+
+
+def _wait_for_parse(future: Future) -> Any:
+    """The parse result, or ``ShutdownGraceExceeded`` once a shutdown's grace period is over."""
+    while True:
+        try:
+            return future.result(timeout=SHUTDOWN_POLL_SECONDS)
+        except TimeoutError:
+            if _shutdown.grace_expired():
+                future.cancel()
+                raise ShutdownGraceExceeded("Shutdown grace period ended during a parse") from None
+
+
+def _call_in(parse_executor: Executor | None, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    if parse_executor is None:
+        return fn(*args, **kwargs)
+    return _wait_for_parse(parse_executor.submit(fn, *args, **kwargs))
+
+
+def _run_parse(
+    parse_executor: Executor | None,
+    fn: Callable[..., Any],
+    *args,
+    profiler: JobProfiler | None = None,
+    **kwargs,
+) -> Any:
+    if profiler is not None:
+        return profiler.run(partial(_call_in, parse_executor), fn, *args, **kwargs)
+    return _call_in(parse_executor, fn, *args, **kwargs)
+
+
+def _timed_call(fn: Callable[..., T], *args, **kwargs) -> tuple[T, float]:
+    started = time.monotonic()
+    result = fn(*args, **kwargs)
+    return result, time.monotonic() - started
+
+
+def _start_parse(
+    parse_executor: Executor | None,
+    fn: Callable[..., Any],
+    *args,
+    profiler: JobProfiler | None = None,
+    **kwargs,
+) -> Future:
+    """Start ``fn`` where ``_run_parse`` would run it; the future holds ``(result, seconds)``.
+
+    Only an unprofiled call in an executor runs in the background. Any other call has
+    finished by the time this returns.
+    """
+    if parse_executor is not None and profiler is None:
+        return parse_executor.submit(_timed_call, fn, *args, **kwargs)
+    future: Future = Future()
+    future.set_result(_timed_call(_run_parse, parse_executor, fn, *args, profiler=profiler, **kwargs))
+    return future
+
+
+class _PageScan:
+    """Runs ``scan_catalog_pages`` on a thread, handing pages over as they are scanned.
+
+    At most ``depth`` scanned pages wait to be taken, so a slow consumer holds the
+    scan back rather than buffering the whole catalog.
+    """
+
+    _DONE = object()
+
+    def __init__(self, pdf_path: Path, *, backend: str, depth: int) -> None:
+        self.pages = 0
+        self.seconds = 0.0
+        self.finished = False
+        self._pdf_path = pdf_path
+        self._backend = backend
+        self._pages: queue.Queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="parser-page-scan", daemon=True)
+
+    def __enter__(self) -> _PageScan:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join(timeout=SHUTDOWN_POLL_SECONDS)
+
+    def _put(self, entry: object) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._pages.put(entry, timeout=SHUTDOWN_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        try:
+            started = time.monotonic()
+            for page in scan_catalog_pages(self._pdf_path, backend=self._backend):
+                # Time spent waiting for the consumer is not scan time.
+                self.seconds += time.monotonic() - started
+                self.pages += 1
+                if not self._put(page):
+                    return
+                started = time.monotonic()
+        except Exception as exc:
+            self._put(exc)
+            return
+        self._put(self._DONE)
+
+    def next_page(self, timeout: float) -> tuple[int, list[QuickCandidate]] | None:
+        """The next scanned page, or None when none arrived within ``timeout`` or the scan is over."""
+        if self.finished:
+            return None
+        try:
+            entry = self._pages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if entry is self._DONE:
+            self.finished = True
+            return None
+        if isinstance(entry, Exception):
+            self.finished = True
+            raise entry
+        return entry
+
+
+def _job_profiler(job: dict) -> JobProfiler | None:
+    try:
+        kinds = parse_profile_kinds(job.get("profile")) or parse_profile_kinds(PARSER_PROFILE)
+    except ValueError as exc:
+        logger.warning("Ignoring profile setting for parser job %s: %s", job["id"], exc)
+        return None
+    if not kinds:
+        return None
+    return JobProfiler(kinds, job_id=job["id"], catalog_id=job["catalog_id"], top_n=PARSER_PROFILE_TOP_N)
+
+
+def _profile_columns(profile_artifact: str | None) -> dict:
+    """Links a stored profile from ``parser_jobs`` and ``parse_summary``."""
+    return {"profile_artifact": profile_artifact} if profile_artifact else {}
+
+
+def _store_profile(client: Client, profiler: JobProfiler, *, attempts: int) -> str | None:
+    """Write the job's profile to PARSER_PROFILE_DIR or the parser-profiles bucket; returns its location."""
+    try:
+        payload = json.dumps(profiler.report(), indent=2).encode("utf-8")
+        # One report per run: a paused job's resumption is a new attempt.
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        name = f"{profiler.job_id}-{attempts}-{stamp}.json"
+        if PARSER_PROFILE_DIR:
+            path = Path(PARSER_PROFILE_DIR) / profiler.catalog_id / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(payload)
+            location = str(path)
+        else:
+            storage_path = f"{profiler.catalog_id}/{name}"
+            _with_retry(
+                lambda: client.storage.from_("parser-profiles").upload(
+                    storage_path,
+                    payload,
+                    {"content-type": "application/json", "upsert": "true"},
+                ),
+                description=f"Upload profile {storage_path}",
+            )
+            location = f"parser-profiles/{storage_path}"
+    except Exception:
+        # A profile is a diagnostic; losing it must not fail the job.
+        logger.exception("Could not store profile for parser job %s", profiler.job_id)
+        return None
+    logger.info("Parser job %s profile stored at %s", profiler.job_id, location)
+    return location
+
+
+PAUSE_MESSAGES = {
+    PAUSE_TIME_BUDGET: "Parser paused before the GitHub Actions timeout.",
+    PAUSE_SHUTDOWN: "Parser paused because the worker was asked to shut down.",
+}
 
 
 def _pause_job_for_retry(
@@ -332,23 +1058,41 @@ def _pause_job_for_retry(
     job_id: str,
     catalog_id: str,
     progress: dict,
+    attempts: int,
+    reason: str = PAUSE_TIME_BUDGET,
+    profile_artifact: str | None = None,
 ) -> None:
+    """Hand the job back to the queue, unless another run has reclaimed it (``attempts`` moved on)."""
     message = (
-        "Parser paused before the GitHub Actions timeout. "
+        f"{PAUSE_MESSAGES[reason]} "
         "The next scheduled or manual parser run will resume from cached item progress."
     )
-    client.table("parser_jobs").update(
-        {
-            "status": "queued",
-            "error_log": message,
-            "progress_label": "paused_time_budget",
-            "progress_percent": progress["progress_percent"],
-        }
-    ).eq("id", job_id).execute()
+    progress_label = f"paused_{reason}"
+    profile_columns = _profile_columns(profile_artifact)
+    paused = (
+        client.table("parser_jobs")
+        .update(
+            {
+                "status": "queued",
+                "error_log": message,
+                "progress_label": progress_label,
+                "progress_percent": progress["progress_percent"],
+                "eta_seconds": progress.get("eta_seconds"),
+                "fits_run_budget": False,
+                **profile_columns,
+            }
+        )
+        .eq("id", job_id)
+        .eq("attempts", attempts)
+        .execute()
+    ).data
+    if not paused:
+        logger.warning("Parser job %s was reclaimed by another run; not re-queueing it", job_id)
+        return
     client.table("catalogs").update(
         {
             "parse_status": "queued",
-            "parse_summary": {**progress, "progress_label": "paused_time_budget"},
+            "parse_summary": {**progress, "progress_label": progress_label, **profile_columns},
         }
     ).eq("id", catalog_id).execute()
 
@@ -370,15 +1114,486 @@ def _discard_deleted_catalog_job(client: Client, *, job_id: str, catalog_id: str
     client.table("parser_jobs").delete().eq("id", job_id).execute()
 
 
-def process_job(client: Client, job: dict) -> bool:
+class JobHeartbeat:
+    """Refreshes a job's lease from a background thread and records cancellation."""
+
+    def __init__(
+        self,
+        client: Client,
+        *,
+        job_id: str,
+        attempts: int,
+        interval_seconds: float = PARSER_HEARTBEAT_SECONDS,
+    ) -> None:
+        self._client = client
+        self.job_id = job_id
+        self.attempts = attempts
+        self.interval_seconds = interval_seconds
+        self.cancel_reason: str | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"parser-heartbeat-{job_id}",
+            daemon=True,
+        )
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_reason is not None
+
+    def beat(self) -> bool:
+        result = self._client.rpc(
+            "parser_job_heartbeat",
+            {"p_job_id": self.job_id, "p_attempts": self.attempts},
+        ).execute()
+        data = result.data or {}
+        if data.get("cancel"):
+            self.cancel_reason = data.get("reason") or "cancelled"
+        return self.cancelled
+
+    def refresh(self) -> bool:
+        """``beat``, logging a failed call instead of raising: the lease holds until it expires."""
+        try:
+            return self.beat()
+        except Exception:
+            logger.warning("Heartbeat failed for parser job %s", self.job_id, exc_info=True)
+            return self.cancelled
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            if self.refresh():
+                logger.info(
+                    "Parser job %s cancellation requested: %s",
+                    self.job_id,
+                    self.cancel_reason,
+                )
+                return
+
+    def start(self) -> None:
+        if self.interval_seconds > 0:
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=self.interval_seconds + 5)
+
+    def __enter__(self) -> JobHeartbeat:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class ShutdownGraceExceeded(Exception):
+    """A parse was abandoned because the shutdown grace period ran out."""
+
+
+class WorkerShutdown:
+    """Drain state set by SIGTERM/SIGINT.
+
+    Once requested, no new job is claimed and a running job pauses at its next item,
+    keeping its progress. A parse still running when the grace period ends is
+    abandoned so the job can be re-queued before the process is killed.
+    """
+
+    def __init__(self) -> None:
+        self._requested = threading.Event()
+        self.deadline: float | None = None
+
+    @property
+    def requested(self) -> bool:
+        return self._requested.is_set()
+
+    def request(self, grace_seconds: float = PARSER_SHUTDOWN_GRACE_SECONDS) -> None:
+        if not self.requested:
+            self.deadline = time.monotonic() + grace_seconds
+            self._requested.set()
+
+    def grace_expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; returns early (True) once shutdown is requested."""
+        return self._requested.wait(timeout)
+
+    def reset(self) -> None:
+        self._requested.clear()
+        self.deadline = None
+
+
+_shutdown = WorkerShutdown()
+_pdf_prefetcher = PdfPrefetcher(max_bytes=PARSER_PREFETCH_MAX_BYTES)
+
+
+def _download_catalog_pdf(client: Client, pdf_path: str) -> bytes:
+    return _with_retry(
+        lambda: client.storage.from_("catalog-pdfs").download(pdf_path),
+        description=f"Download {pdf_path}",
+    )
+
+
+def _prefetch_targets(client: Client, limit: int) -> list[PrefetchTarget]:
+    """The next ``limit`` jobs ``claim_next_job`` would pick, with their PDFs' storage paths."""
+    if limit <= 0:
+        return []
+    rows = _job_candidates(client)
+    superseded = _superseded_jobs(rows)
+    pending = [row for row in rows if row["id"] not in superseded and row.get("pdf_size_bytes")]
+    picked: list[dict] = []
+    while len(picked) < limit and (job := _pick_next_job(pending)):
+        picked.append(job)
+        pending.remove(job)
+    if not picked:
+        return []
+
+    catalogs = (
+        client.table("catalogs")
+        .select("id,pdf_storage_path")
+        .in_("id", [job["catalog_id"] for job in picked])
+        .is_("deleted_at", "null")
+        .execute()
+    ).data or []
+    paths = {row["id"]: row.get("pdf_storage_path") for row in catalogs}
+    return [
+        PrefetchTarget(
+            job_id=job["id"],
+            pdf_storage_path=paths[job["catalog_id"]],
+            content_hash=job.get("pdf_content_hash"),
+            size_bytes=int(job["pdf_size_bytes"]),
+        )
+        for job in picked
+        if paths.get(job["catalog_id"])
+    ]
+
+
+def _start_prefetch(*, ahead: int, max_jobs: Callable[[], int] | None = None) -> bool:
+    """Start prefetching the next ``ahead`` jobs' PDFs, or ``max_jobs()`` when that is fewer.
+
+    Each refill uses the current client, so a reconnect after a failure carries over.
+    """
+
+    def peek(limit: int) -> list[PrefetchTarget]:
+        return _prefetch_targets(get_client(), limit if max_jobs is None else min(limit, max_jobs()))
+
+    return _pdf_prefetcher.start(
+        peek=peek,
+        download=lambda pdf_path: _download_catalog_pdf(get_client(), pdf_path),
+        ahead=ahead,
+    )
+
+
+def _handle_shutdown_signal(signum: int, _frame: Any) -> None:
+    if _shutdown.requested:
+        return
+    logger.warning(
+        "Received %s, pausing work within %ss",
+        signal.Signals(signum).name,
+        PARSER_SHUTDOWN_GRACE_SECONDS,
+    )
+    _shutdown.request()
+
+
+def _install_shutdown_handlers() -> None:
+    # Signal handlers can only be installed from the main thread.
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, _handle_shutdown_signal)
+
+
+def _ignore_shutdown_signals() -> None:
+    """Parse pool initializer: the parent decides when parses stop."""
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, signal.SIG_IGN)
+
+
+def _handle_cancelled_job(
+    client: Client,
+    *,
+    job_id: str,
+    catalog_id: str,
+    reason: str | None,
+) -> None:
+    if reason == "lease_lost":
+        logger.warning("Parser job %s was reclaimed by another run; stopping without writes", job_id)
+        return
+    _discard_deleted_catalog_job(client, job_id=job_id, catalog_id=catalog_id)
+
+
+def _set_job_item_status(client: Client, *, job_id: str, sku: str, values: dict) -> None:
+    _with_retry(
+        lambda: client.table("parser_job_items")
+        .update(values)
+        .eq("parser_job_id", job_id)
+        .eq("sku", sku)
+        .execute(),
+        description=f"Update parser job item {sku}",
+    )
+
+
+def _cache_row(
+    item: ParsedItem,
+    *,
+    quick_fingerprint: str,
+    signature: str,
+    image_storage_path: str,
+) -> dict:
+    return {
+        "sku": item.sku,
+        "quick_fingerprint": quick_fingerprint,
+        "strong_fingerprint": signature,
+        "name": item.name,
+        "upc": item.upc,
+        "pack": item.pack,
+        "category": item.category,
+        "image_storage_path": image_storage_path,
+        "updated_at": now_iso(),
+    }
+
+
+def _store_parsed_item(
+    client: Client,
+    *,
+    catalog_id: str,
+    item: ParsedItem,
+    candidate: QuickCandidate,
+) -> tuple[str, str]:
+    """Upload the item's image and cache its parse; returns (image_storage_path, signature)."""
+    image_storage_path = ""
+    if item.image_bytes:
+        ext = item.image_extension or "jpg"
+        image_storage_path = (
+            f"catalog-items/{catalog_id}/{item.sku}-{int(time.time() * 1000)}.{_safe_filename(ext)}"
+        )
+        _with_retry(
+            lambda: client.storage.from_("product-images").upload(
+                image_storage_path,
+                item.image_bytes,
+                {"upsert": "true"},
+            ),
+            description=f"Upload image for {item.sku}",
+        )
+
+    signature = _item_signature(
+        sku=item.sku,
+        name=item.name,
+        upc=item.upc,
+        pack=item.pack,
+        category=item.category,
+        # The raw-stream digest keys the parse cache only. Signatures keep hashing the
+        # extracted bytes so they still match the baselines stored before it.
+        image_hash=_sha256_hex(item.image_bytes) if item.image_bytes else "",
+    )
+
+    _with_retry(
+        lambda: client.table("item_parse_cache").upsert(
+            _cache_row(
+                item,
+                quick_fingerprint=candidate.quick_fingerprint,
+                signature=signature,
+                image_storage_path=image_storage_path,
+            ),
+            on_conflict="sku,quick_fingerprint",
+        ).execute(),
+        description=f"Cache parse for {item.sku}",
+    )
+    return image_storage_path, signature
+
+
+def _attach_page_sprites(client: Client, *, rows: list[dict], images: dict[str, bytes]) -> dict:
+    """Point every row with an image at its page's sprite sheet; returns summary counts.
+
+    ``images`` holds the bytes of images uploaded by this job; reused images are
+    downloaded, and only for pages whose sheet does not exist yet. A page whose
+    sheet cannot be written keeps plain per-item images.
+    """
+    pages = sprite_pages(rows)
+    if not pages:
+        return {"pages": 0, "written": 0, "failed": 0}
+    existing = {
+        row["sprite_path"]
+        for row in (
+            client.table("catalog_items").select("sprite_path").in_("sprite_path", list(pages)).execute()
+        ).data
+        or []
+    }
+
+    written = failed = 0
+    for path, page_rows in pages.items():
+        if path not in existing:
+            try:
+                sheet = build_sprite_sheet(
+                    [
+                        images.get(row["image_storage_path"])
+                        or _with_retry(
+                            lambda row=row: client.storage.from_("product-images").download(
+                                row["image_storage_path"]
+                            ),
+                            description=f"Download image for {row['sku']}",
+                        )
+                        for row in page_rows
+                    ],
+                    cell_px=PARSER_SPRITE_CELL_PX,
+                    quality=PARSER_SPRITE_QUALITY,
+                )
+                _with_retry(
+                    lambda: client.storage.from_("product-images").upload(
+                        path,
+                        sheet,
+                        {"content-type": "image/webp", "upsert": "true"},
+                    ),
+                    description=f"Upload sprite sheet {path}",
+                )
+            except Exception:
+                logger.exception("Could not write sprite sheet %s", path)
+                failed += 1
+                continue
+            written += 1
+        for position, row in enumerate(page_rows):
+            row["sprite_path"] = path
+            row["sprite_offset"] = sprite_offset(position, len(page_rows), PARSER_SPRITE_CELL_PX)
+    return {"pages": len(pages), "written": written, "failed": failed}
+
+
+def _write_catalog_snapshot(client: Client, *, catalog_id: str, rows: list[dict]) -> dict:
+    """Upload the catalog's customer snapshot; returns its catalog columns, or {} on failure."""
+    try:
+        return _with_retry(
+            lambda: upload_snapshot(client, catalog_id, rows),
+            description=f"Upload snapshot for catalog {catalog_id}",
+        )
+    except Exception:
+        # Link pages fall back to querying catalog_items without a snapshot.
+        logger.exception("Could not write snapshot for catalog %s", catalog_id)
+        return {}
+
+
+def refresh_stale_snapshots(client: Client, *, limit: int = STALE_SNAPSHOT_BATCH) -> int:
+    """Write snapshots for published catalogs without one; returns how many were recorded."""
+    stale = (
+        client.table("catalogs")
+        .select("id,items_version")
+        .eq("status", "published")
+        .is_("deleted_at", "null")
+        .is_("snapshot_path", "null")
+        .order("published_at", desc=True)
+        .limit(limit)
+        .execute()
+    ).data or []
+
+    written = 0
+    for catalog in stale:
+        rows = (
+            client.table("catalog_items")
+            .select(",".join(SNAPSHOT_ITEM_FIELDS))
+            .eq("catalog_id", catalog["id"])
+            .execute()
+        ).data or []
+        columns = _write_catalog_snapshot(client, catalog_id=catalog["id"], rows=rows)
+        if not columns:
+            continue
+        # items_version was read before the items. If an edit has bumped it since,
+        # this snapshot is already stale and is not recorded.
+        updated = (
+            client.table("catalogs")
+            .update(columns)
+            .eq("id", catalog["id"])
+            .eq("items_version", catalog["items_version"])
+            .execute()
+        ).data or []
+        written += len(updated)
+    if written:
+        logger.info("Wrote %s catalog snapshots", written)
+    return written
+
+
+_last_snapshot_sweep: float | None = None
+
+
+def _maybe_refresh_snapshots(client: Client) -> None:
+    global _last_snapshot_sweep
+    if _last_snapshot_sweep is not None and time.monotonic() - _last_snapshot_sweep < SNAPSHOT_SWEEP_SECONDS:
+        return
+    _last_snapshot_sweep = time.monotonic()
+    try:
+        refresh_stale_snapshots(client)
+    except Exception:
+        logger.exception("Snapshot refresh failed")
+
+
+def _queue_retry_job(client: Client, *, job_id: str, catalog_id: str, failed_skus: list[str]) -> str | None:
+    """Queue a follow-up job for SKUs that failed on transient errors.
+
+    Every item that succeeded is in ``item_parse_cache`` by now, so the follow-up
+    reuses them and heavy-parses only what is still missing.
+    """
+    if not failed_skus:
+        return None
+    parent = (
+        client.table("parser_jobs")
+        .select("priority,retry_depth")
+        .eq("id", job_id)
+        .maybe_single()
+        .execute()
+    ).data or {}
+    retry_depth = int(parent.get("retry_depth") or 0)
+    if retry_depth >= PARSER_MAX_RETRY_JOBS:
+        logger.warning(
+            "Parser job %s has %s failed items but reached the retry limit",
+            job_id,
+            len(failed_skus),
+        )
+        return None
+    result = client.table("parser_jobs").insert(
+        {
+            "catalog_id": catalog_id,
+            "status": "queued",
+            "attempts": 0,
+            "priority": int(parent.get("priority") or 0) + 1,
+            "retry_of_job_id": job_id,
+            "retry_depth": retry_depth + 1,
+            "retry_skus": sorted(failed_skus),
+        }
+    ).execute()
+    rows = result.data or []
+    return rows[0]["id"] if rows else None
+
+
+def process_job(
+    client: Client,
+    job: dict,
+    *,
+    deadline: float | None = None,
+    parse_executor: Executor | None = None,
+) -> bool:
     job_id = job["id"]
     catalog_id = job["catalog_id"]
     logger.info("Processing parser job %s catalog=%s", job_id, catalog_id)
-    deadline = (
-        time.monotonic() + PARSER_MAX_RUN_SECONDS
-        if PARSER_MAX_RUN_SECONDS > 0
-        else None
-    )
+    if deadline is None:
+        deadline = _run_deadline()
+    heartbeat = JobHeartbeat(client, job_id=job_id, attempts=int(job.get("attempts") or 0))
+    heartbeat.start()
+    profiler = _job_profiler(job)
+    if profiler is not None:
+        profiler.start()
+
+    def store_profile() -> str | None:
+        """Stop the profiler and store its report, once; returns where it went."""
+        nonlocal profiler
+        if profiler is None:
+            return None
+        profiler.stop()
+        profile_artifact = _store_profile(client, profiler, attempts=heartbeat.attempts)
+        profiler.close()
+        profiler = None
+        return profile_artifact
+
+    job_model = RuntimeModel.from_job(job)
+    runtime = JobRuntime()
+    # A follow-up job heavy-parses only the SKUs its parent failed on transient errors.
+    retry_sku_filter = set(job.get("retry_skus") or ())
 
     try:
         catalog_resp = (
@@ -394,7 +1609,17 @@ def process_job(client: Client, job: dict) -> bool:
             return True
 
         pdf_path = catalog["pdf_storage_path"]
-        file_bytes = client.storage.from_("catalog-pdfs").download(pdf_path)
+        file_bytes = _pdf_prefetcher.take(
+            job_id,
+            pdf_storage_path=pdf_path,
+            content_hash=job.get("pdf_content_hash"),
+            timeout=PARSER_HTTP_TIMEOUT_SECONDS,
+        )
+        pdf_prefetched = file_bytes is not None
+        if file_bytes is None:
+            file_bytes = _download_catalog_pdf(client, pdf_path)
+        # This job's PDF is local now: fetch the next one while it parses.
+        _pdf_prefetcher.schedule()
         if not file_bytes:
             raise RuntimeError(f"Unable to download PDF from storage path: {pdf_path}")
 
@@ -402,45 +1627,23 @@ def process_job(client: Client, job: dict) -> bool:
         with tempfile.TemporaryDirectory(prefix="blooms-parser-") as temp_dir:
             tmp_pdf = Path(temp_dir) / "catalog.pdf"
             tmp_pdf.write_bytes(file_bytes)
+            from pypdf import PdfReader
+
             catalog_page_count = len(PdfReader(str(tmp_pdf)).pages)
 
-            fast_candidates_raw = scan_catalog_fast(tmp_pdf)
-            raw_candidates = len(fast_candidates_raw)
-            fast_candidates = _dedupe_candidates(fast_candidates_raw)
-            candidate_order_by_sku = {
-                candidate.sku: index + 1 for index, candidate in enumerate(fast_candidates)
-            }
-            unique_skus = [candidate.sku for candidate in fast_candidates]
-            total_items = len(fast_candidates)
             total_pages = catalog_page_count
-            capture_verification = _build_capture_verification(
-                catalog_page_count=catalog_page_count,
-                candidates=fast_candidates_raw,
-                unique_sku_count=total_items,
-            )
-
+            # Profiled jobs keep the phased flow so each stage is timed on its own.
+            pipelined = PARSER_PIPELINE and profiler is None
+            parse_ahead = PARSER_PIPELINE_PARSE_AHEAD if pipelined else 0
             baseline_catalog_id = _load_baseline_catalog_id(client, catalog_id)
-            baseline_items = _load_baseline_items(client, baseline_catalog_id)
-            baseline_skus = set(baseline_items.keys())
-
-            cache_rows: list[dict] = []
-            if unique_skus:
-                cache_resp = (
-                    client.table("item_parse_cache")
-                    .select(
-                        "sku,quick_fingerprint,strong_fingerprint,name,upc,pack,category,image_storage_path"
-                    )
-                    .in_("sku", unique_skus)
-                    .execute()
-                )
-                cache_rows = cache_resp.data or []
-
-            cache_by_key = {
-                (row["sku"], row["quick_fingerprint"]): row for row in cache_rows
-            }
 
-            queued_candidates: dict[str, QuickCandidate] = {}
-            parser_job_item_rows: list[dict] = []
+            fast_candidates_raw: list[QuickCandidate] = []
+            candidate_order_by_sku: dict[str, int] = {}
+            scanned_pages = 0
+            scan_complete = False
+            capture_verification: dict | None = None
+            # Bytes of images this job uploads, so sprite sheets need not download them.
+            uploaded_images: dict[str, bytes] = {}
             catalog_item_rows: list[dict] = []
             missing_images = 0
             unknown_categories = 0
@@ -448,199 +1651,248 @@ def process_job(client: Client, job: dict) -> bool:
             queued_items = 0
             processed_items = 0
             failed_items = 0
+            retry_skus: list[str] = []
+            # Pages whose heavy parse has started, oldest first, with the parse's future.
+            in_flight: deque[tuple[int, dict[str, QuickCandidate], Future]] = deque()
+            slowest_page_seconds = 0.0
+
+            def progress_snapshot() -> dict:
+                total_items = len(candidate_order_by_sku)
+                return _summarize_progress(
+                    total_items=total_items,
+                    expected_items=(
+                        None
+                        if scan_complete
+                        else round(total_items * total_pages / scanned_pages) if scanned_pages else 0
+                    ),
+                    raw_candidates=len(fast_candidates_raw),
+                    reused_items=reused_items,
+                    queued_items=queued_items,
+                    processed_items=processed_items,
+                    failed_items=failed_items,
+                    parsed_pages=scanned_pages,
+                    total_pages=total_pages,
+                    capture_verification=capture_verification,
+                    eta=_eta(
+                        runtime.model(job_model),
+                        pending_items=queued_items - processed_items - failed_items,
+                        deadline=deadline,
+                    ),
+                )
 
-            for candidate in fast_candidates:
-                cache_hit = cache_by_key.get((candidate.sku, candidate.quick_fingerprint))
-                status = "queued"
-                row_finished_at = None
-                error_log = None
-
-                if cache_hit:
-                    signature = cache_hit["strong_fingerprint"]
-                    change_type = _classify_change_type(candidate.sku, signature, baseline_items)
-                    approved = change_type == "unchanged"
-                    image_storage_path = cache_hit.get("image_storage_path") or ""
-                    parse_issues: list[str] = []
-                    if not image_storage_path:
-                        missing_images += 1
-                    if cache_hit.get("category") == "Uncategorized":
-                        unknown_categories += 1
+            def pause(reason: str = PAUSE_TIME_BUDGET) -> bool:
+                for _, _, future in in_flight:
+                    future.cancel()
+                progress = progress_snapshot()
+                _pause_job_for_retry(
+                    client,
+                    job_id=job_id,
+                    catalog_id=catalog_id,
+                    progress=progress,
+                    attempts=heartbeat.attempts,
+                    reason=reason,
+                    profile_artifact=store_profile(),
+                )
+                _record_runtime(
+                    client,
+                    job_id=job_id,
+                    catalog_id=catalog_id,
+                    outcome="paused",
+                    runtime=runtime,
+                )
+                logger.info(
+                    "Parser job %s paused at %s%% (%s)",
+                    job_id,
+                    progress["progress_percent"],
+                    reason,
+                )
+                return False
+
+            def admit(candidates: list[QuickCandidate]) -> dict[str, QuickCandidate]:
+                """Reuse cached items among newly seen SKUs; returns the ones left to parse."""
+                nonlocal missing_images, unknown_categories, reused_items, queued_items, failed_items
+                fresh = [
+                    candidate
+                    for candidate in _dedupe_candidates(candidates)
+                    if candidate.sku not in candidate_order_by_sku
+                ]
+                for candidate in fresh:
+                    candidate_order_by_sku[candidate.sku] = len(candidate_order_by_sku) + 1
+
+                cache_rows: list[dict] = []
+                if fresh:
+                    cache_resp = (
+                        client.table("item_parse_cache")
+                        .select(
+                            "sku,quick_fingerprint,strong_fingerprint,name,upc,pack,category,image_storage_path"
+                        )
+                        .in_("sku", [candidate.sku for candidate in fresh])
+                        .execute()
+                    )
+                    cache_rows = cache_resp.data or []
 
-                    catalog_item_rows.append(
+                cache_by_key = {
+                    (row["sku"], row["quick_fingerprint"]): row for row in cache_rows
+                }
+
+                queued_candidates: dict[str, QuickCandidate] = {}
+                parser_job_item_rows: list[dict] = []
+                for candidate in fresh:
+                    cache_hit = cache_by_key.get((candidate.sku, candidate.quick_fingerprint))
+                    status = "queued"
+                    row_finished_at = None
+                    error_log = None
+
+                    if cache_hit:
+                        signature = cache_hit["strong_fingerprint"]
+                        image_storage_path = cache_hit.get("image_storage_path") or ""
+                        parse_issues: list[str] = []
+                        if not image_storage_path:
+                            missing_images += 1
+                        if cache_hit.get("category") == "Uncategorized":
+                            unknown_categories += 1
+
+                        catalog_item_rows.append(
+                            {
+                                "catalog_id": catalog_id,
+                                "sku": candidate.sku,
+                                "name": cache_hit["name"],
+                                "upc": cache_hit.get("upc"),
+                                "pack": cache_hit.get("pack"),
+                                "category": cache_hit["category"],
+                                "image_storage_path": image_storage_path,
+                                "parse_issues": parse_issues,
+                                "approved": False,
+                                "signature": signature,
+                                "quick_fingerprint": candidate.quick_fingerprint,
+                                "change_type": "new",
+                                "display_order": candidate_order_by_sku[candidate.sku],
+                                "source_page_no": candidate.page_no,
+                                "source_top": candidate.sku_bbox["top"],
+                            }
+                        )
+                        status = "reused"
+                        row_finished_at = now_iso()
+                        reused_items += 1
+                    elif retry_sku_filter and candidate.sku not in retry_sku_filter:
+                        status = "failed"
+                        row_finished_at = now_iso()
+                        error_log = NOT_RETRIED_ERROR
+                        failed_items += 1
+                    else:
+                        queued_candidates[candidate.sku] = candidate
+                        queued_items += 1
+
+                    parser_job_item_rows.append(
                         {
-                            "catalog_id": catalog_id,
                             "sku": candidate.sku,
-                            "name": cache_hit["name"],
-                            "upc": cache_hit.get("upc"),
-                            "pack": cache_hit.get("pack"),
-                            "category": cache_hit["category"],
-                            "image_storage_path": image_storage_path,
-                            "parse_issues": parse_issues,
-                            "approved": approved,
-                            "signature": signature,
                             "quick_fingerprint": candidate.quick_fingerprint,
-                            "change_type": change_type,
-                            "display_order": candidate_order_by_sku[candidate.sku],
-                            "source_page_no": candidate.page_no,
-                            "source_top": candidate.sku_bbox["top"],
+                            "page_no": candidate.page_no,
+                            "sku_bbox": candidate.sku_bbox,
+                            "image_bbox": candidate.image_bbox,
+                            "status": status,
+                            "error_log": error_log,
+                            "finished_at": row_finished_at,
                         }
                     )
-                    status = "reused"
-                    row_finished_at = now_iso()
-                    reused_items += 1
-                else:
-                    queued_candidates[candidate.sku] = candidate
-                    queued_items += 1
 
-                parser_job_item_rows.append(
-                    {
-                        "parser_job_id": job_id,
-                        "catalog_id": catalog_id,
-                        "sku": candidate.sku,
-                        "quick_fingerprint": candidate.quick_fingerprint,
-                        "page_no": candidate.page_no,
-                        "sku_bbox": candidate.sku_bbox,
-                        "image_bbox": candidate.image_bbox,
-                        "status": status,
-                        "error_log": error_log,
-                        "attempts": 0,
-                        "finished_at": row_finished_at,
-                    }
+                _sync_parser_job_items(
+                    client,
+                    job_id=job_id,
+                    catalog_id=catalog_id,
+                    rows=parser_job_item_rows,
                 )
-
-            client.table("parser_job_items").delete().eq("parser_job_id", job_id).execute()
-            if parser_job_item_rows:
-                client.table("parser_job_items").insert(parser_job_item_rows).execute()
-
-            client.table("catalog_items").delete().eq("catalog_id", catalog_id).execute()
-
-            progress = _summarize_progress(
-                total_items=total_items,
-                raw_candidates=raw_candidates,
-                reused_items=reused_items,
-                queued_items=queued_items,
-                processed_items=processed_items,
-                failed_items=failed_items,
-                parsed_pages=total_pages,
-                total_pages=total_pages,
-                capture_verification=capture_verification,
-            )
-            _update_processing_progress(
-                client,
-                job_id=job_id,
-                catalog_id=catalog_id,
-                progress=progress,
-                progress_label="reusing_cached_items",
-            )
-
-            if queued_candidates:
-                queued_skus = set(queued_candidates.keys())
-                parsed_items = parse_catalog_pdf(tmp_pdf, sku_filter=queued_skus)
+                _update_processing_progress(
+                    client,
+                    job_id=job_id,
+                    catalog_id=catalog_id,
+                    progress=progress_snapshot(),
+                    progress_label="reusing_cached_items",
+                )
+                return queued_candidates
+
+            def store_page(page_no: int, page_candidates: dict[str, QuickCandidate], future: Future) -> bool | None:
+                """Store one parsed page's items; returns the job's result if it has to stop."""
+                nonlocal missing_images, unknown_categories, processed_items, failed_items, slowest_page_seconds
+                try:
+                    parsed_items, parse_seconds = _wait_for_parse(future)
+                except ShutdownGraceExceeded:
+                    return pause(PAUSE_SHUTDOWN)
                 parsed_by_sku = {item.sku: item for item in parsed_items}
-
-                for item_index, (sku, candidate) in enumerate(queued_candidates.items(), start=1):
-                    if item_index == 1 or item_index % 25 == 0:
-                        if _catalog_is_deleted(client, catalog_id):
-                            _discard_deleted_catalog_job(
-                                client,
-                                job_id=job_id,
-                                catalog_id=catalog_id,
-                            )
-                            return True
-
-                    if _should_pause_for_time_budget(deadline):
-                        progress = _summarize_progress(
-                            total_items=total_items,
-                            raw_candidates=raw_candidates,
-                            reused_items=reused_items,
-                            queued_items=queued_items,
-                            processed_items=processed_items,
-                            failed_items=failed_items,
-                            parsed_pages=total_pages,
-                            total_pages=total_pages,
-                            capture_verification=capture_verification,
-                        )
-                        _pause_job_for_retry(
+                parsed_at = time.monotonic()
+                runtime.parse_pages += 1
+                runtime.parse_items += len(page_candidates)
+                runtime.parse_seconds += parse_seconds
+                heartbeat.refresh()
+
+                for sku, candidate in page_candidates.items():
+                    if heartbeat.cancelled:
+                        _handle_cancelled_job(
                             client,
                             job_id=job_id,
                             catalog_id=catalog_id,
-                            progress=progress,
-                        )
-                        logger.info(
-                            "Parser job %s paused at %s%% before workflow timeout",
-                            job_id,
-                            progress["progress_percent"],
+                            reason=heartbeat.cancel_reason,
                         )
-                        return False
+                        return True
 
-                    client.table("parser_job_items").update(
-                        {
-                            "status": "processing",
-                            "attempts": 1,
-                            "started_at": now_iso(),
-                        }
-                    ).eq("parser_job_id", job_id).eq("sku", sku).execute()
+                    # The page is already parsed: keep storing its items while the
+                    # shutdown grace period lasts.
+                    if _shutdown.grace_expired():
+                        return pause(PAUSE_SHUTDOWN)
+                    if _should_pause_for_time_budget(deadline):
+                        return pause()
+
+                    _set_job_item_status(
+                        client,
+                        job_id=job_id,
+                        sku=sku,
+                        values={"status": "processing", "attempts": 1, "started_at": now_iso()},
+                    )
 
                     item = parsed_by_sku.get(sku)
-                    if not item:
+                    item_error: str | None = None
+                    item_attempts = 1
+                    if item:
+                        try:
+                            image_storage_path, signature = _store_parsed_item(
+                                client,
+                                catalog_id=catalog_id,
+                                item=item,
+                                candidate=candidate,
+                            )
+                        except Exception as exc:
+                            transient = _is_transient_error(exc)
+                            item_attempts = PARSER_RETRY_ATTEMPTS if transient else 1
+                            item_error = str(exc)[:4000] or exc.__class__.__name__
+                            if transient:
+                                retry_skus.append(sku)
+                            logger.warning("Parser job %s item %s failed: %s", job_id, sku, item_error)
+                    else:
+                        item_error = SKU_NOT_FOUND_ERROR
+
+                    if item_error is not None:
                         failed_items += 1
-                        client.table("parser_job_items").update(
-                            {
-                                "status": "failed",
-                                "error_log": "SKU not found in heavy parse output",
-                                "finished_at": now_iso(),
-                            }
-                        ).eq("parser_job_id", job_id).eq("sku", sku).execute()
-
-                        progress = _summarize_progress(
-                            total_items=total_items,
-                            raw_candidates=raw_candidates,
-                            reused_items=reused_items,
-                            queued_items=queued_items,
-                            processed_items=processed_items,
-                            failed_items=failed_items,
-                            parsed_pages=total_pages,
-                            total_pages=total_pages,
-                            capture_verification=capture_verification,
-                        )
-                        _update_processing_progress(
+                        _set_job_item_status(
                             client,
                             job_id=job_id,
-                            catalog_id=catalog_id,
-                            progress=progress,
-                            progress_label="heavy_parse_processing",
+                            sku=sku,
+                            values={
+                                "status": "failed",
+                                "attempts": item_attempts,
+                                "error_log": item_error,
+                                "finished_at": now_iso(),
+                            },
                         )
                         continue
 
-                    image_storage_path = ""
-                    if item.image_bytes:
-                        ext = item.image_extension or "jpg"
-                        image_storage_path = (
-                            f"catalog-items/{catalog_id}/{item.sku}-{int(time.time() * 1000)}.{_safe_filename(ext)}"
-                        )
-                        client.storage.from_("product-images").upload(
-                            image_storage_path,
-                            item.image_bytes,
-                            {"upsert": "true"},
-                        )
-                    else:
+                    if not item.image_bytes:
                         missing_images += 1
+                    elif PARSER_SPRITE_SHEETS:
+                        uploaded_images[image_storage_path] = item.image_bytes
 
                     if "unknown_category" in item.parse_issues:
                         unknown_categories += 1
 
-                    image_hash = _sha256_hex(item.image_bytes) if item.image_bytes else ""
-                    signature = _item_signature(
-                        sku=item.sku,
-                        name=item.name,
-                        upc=item.upc,
-                        pack=item.pack,
-                        category=item.category,
-                        image_hash=image_hash,
-                    )
-                    change_type = _classify_change_type(item.sku, signature, baseline_items)
-                    approved = change_type == "unchanged"
-
                     catalog_item_rows.append(
                         {
                             "catalog_id": catalog_id,
@@ -651,71 +1903,189 @@ def process_job(client: Client, job: dict) -> bool:
                             "category": item.category,
                             "image_storage_path": image_storage_path,
                             "parse_issues": item.parse_issues,
-                            "approved": approved,
+                            "approved": False,
                             "signature": signature,
                             "quick_fingerprint": candidate.quick_fingerprint,
-                            "change_type": change_type,
+                            "change_type": "new",
                             "display_order": candidate_order_by_sku[item.sku],
                             "source_page_no": candidate.page_no,
                             "source_top": candidate.sku_bbox["top"],
                         }
                     )
 
-                    client.table("item_parse_cache").upsert(
-                        {
-                            "sku": item.sku,
-                            "quick_fingerprint": candidate.quick_fingerprint,
-                            "strong_fingerprint": signature,
-                            "name": item.name,
-                            "upc": item.upc,
-                            "pack": item.pack,
-                            "category": item.category,
-                            "image_storage_path": image_storage_path,
-                            "updated_at": now_iso(),
-                        },
-                        on_conflict="sku,quick_fingerprint",
-                    ).execute()
-
                     processed_items += 1
-                    client.table("parser_job_items").update(
-                        {
-                            "status": "success",
-                            "error_log": None,
-                            "finished_at": now_iso(),
-                        }
-                    ).eq("parser_job_id", job_id).eq("sku", item.sku).execute()
-
-                    progress = _summarize_progress(
-                        total_items=total_items,
-                        raw_candidates=raw_candidates,
-                        reused_items=reused_items,
-                        queued_items=queued_items,
-                        processed_items=processed_items,
-                        failed_items=failed_items,
-                        parsed_pages=total_pages,
-                        total_pages=total_pages,
-                        capture_verification=capture_verification,
-                    )
-                    _update_processing_progress(
+                    _set_job_item_status(
                         client,
                         job_id=job_id,
-                        catalog_id=catalog_id,
-                        progress=progress,
-                        progress_label="heavy_parse_processing",
+                        sku=item.sku,
+                        values={"status": "success", "error_log": None, "finished_at": now_iso()},
                     )
 
-            if catalog_item_rows:
-                if _catalog_is_deleted(client, catalog_id):
-                    _discard_deleted_catalog_job(client, job_id=job_id, catalog_id=catalog_id)
-                    return True
+                upload_seconds = time.monotonic() - parsed_at
+                runtime.upload_items += len(page_candidates)
+                runtime.upload_seconds += upload_seconds
+                slowest_page_seconds = max(slowest_page_seconds, parse_seconds + upload_seconds)
+                _update_processing_progress(
+                    client,
+                    job_id=job_id,
+                    catalog_id=catalog_id,
+                    progress=progress_snapshot(),
+                    progress_label="heavy_parse_processing",
+                )
+                return None
+
+            def store_parsed(*, drain: bool = False) -> bool | None:
+                """Store finished pages in order, waiting for them once more than ``parse_ahead`` are out."""
+                while in_flight and (drain or len(in_flight) > parse_ahead or in_flight[0][2].done()):
+                    result = store_page(*in_flight.popleft())
+                    if result is not None:
+                        return result
+                return None
+
+            def take(candidates: list[QuickCandidate]) -> bool | None:
+                """Admit scanned candidates and start the heavy parse of their uncached pages.
+
+                Every stored item is in item_parse_cache right away, so a paused job
+                resumes with only the unparsed pages left.
+                """
+                for page_no, page_candidates in _group_candidates_by_page(admit(candidates)):
+                    if heartbeat.cancelled:
+                        _handle_cancelled_job(
+                            client,
+                            job_id=job_id,
+                            catalog_id=catalog_id,
+                            reason=heartbeat.cancel_reason,
+                        )
+                        return True
+
+                    if _shutdown.requested:
+                        return pause(PAUSE_SHUTDOWN)
+                    if _should_pause_for_time_budget(deadline, reserve_seconds=slowest_page_seconds):
+                        return pause()
+
+                    try:
+                        future = _start_parse(
+                            parse_executor,
+                            parse_catalog_pdf,
+                            tmp_pdf,
+                            sku_filter=set(page_candidates),
+                            page_numbers={page_no},
+                            # Cut the page by the scan's grid so cells match the candidates.
+                            template=next(iter(page_candidates.values())).template,
+                            backend=PARSER_TEXT_BACKEND,
+                            profiler=profiler,
+                        )
+                    except ShutdownGraceExceeded:
+                        return pause(PAUSE_SHUTDOWN)
+                    in_flight.append((page_no, page_candidates, future))
+                    result = store_parsed()
+                    if result is not None:
+                        return result
+                return None
+
+            def complete_scan() -> None:
+                nonlocal scan_complete, scanned_pages, capture_verification
+                scan_complete = True
+                scanned_pages = total_pages
+                capture_verification = _build_capture_verification(
+                    catalog_page_count=catalog_page_count,
+                    candidates=fast_candidates_raw,
+                    unique_sku_count=len({candidate.sku for candidate in fast_candidates_raw}),
+                )
 
-                client.table("catalog_items").upsert(
-                    catalog_item_rows,
-                    on_conflict="catalog_id,sku",
-                ).execute()
+            if pipelined:
+                # Each page is admitted as soon as it is scanned; its misses parse while
+                # the scan goes on and earlier pages upload.
+                with _PageScan(tmp_pdf, backend=PARSER_TEXT_BACKEND, depth=PARSER_PIPELINE_SCAN_AHEAD) as scan:
+                    while not scan.finished:
+                        if _shutdown.requested:
+                            return pause(PAUSE_SHUTDOWN)
+                        page = scan.next_page(timeout=PIPELINE_POLL_SECONDS if in_flight else SHUTDOWN_POLL_SECONDS)
+                        if page is not None:
+                            scanned_pages += 1
+                            fast_candidates_raw.extend(page[1])
+                            result = take(page[1])
+                        else:
+                            result = store_parsed()
+                        if result is not None:
+                            return result
+                    runtime.scan_pages = scan.pages
+                    runtime.scan_seconds = scan.seconds
+                complete_scan()
+            else:
+                scan_started = time.monotonic()
+                fast_candidates_raw = _run_parse(
+                    parse_executor,
+                    scan_catalog_fast,
+                    tmp_pdf,
+                    backend=PARSER_TEXT_BACKEND,
+                    profiler=profiler,
+                )
+                runtime.scan_pages = catalog_page_count
+                runtime.scan_seconds = time.monotonic() - scan_started
+                complete_scan()
+                result = take(fast_candidates_raw)
+                if result is not None:
+                    return result
+
+            total_items = len(candidate_order_by_sku)
+            raw_candidates = len(fast_candidates_raw)
+            _prune_parser_job_items(client, job_id=job_id, skus=list(candidate_order_by_sku))
+            result = store_parsed(drain=True)
+            if result is not None:
+                return result
 
-            parsed_skus = {row["sku"] for row in catalog_item_rows}
-            removed_items = len(baseline_skus - parsed_skus)
+            change_types, removed_items = _diff_against_baseline(
+                client,
+                baseline_catalog_id,
+                {row["sku"]: row["signature"] for row in catalog_item_rows},
+                catalog_id=catalog_id,
+            )
+            for row in catalog_item_rows:
+                row["change_type"] = change_types.get(row["sku"], "new")
+                row["approved"] = row["change_type"] == "unchanged"
+
+            if _catalog_is_deleted(client, catalog_id):
+                _discard_deleted_catalog_job(client, job_id=job_id, catalog_id=catalog_id)
+                return True
+            # A stale reclaim may have handed the job to another run while this one
+            # parsed; only the lease holder writes the catalog.
+            if heartbeat.cancelled:
+                _handle_cancelled_job(
+                    client,
+                    job_id=job_id,
+                    catalog_id=catalog_id,
+                    reason=heartbeat.cancel_reason,
+                )
+                return True
+
+            sprite_sheets = None
+            if PARSER_SPRITE_SHEETS:
+                sprite_sheets = _attach_page_sprites(client, rows=catalog_item_rows, images=uploaded_images)
+                uploaded_images.clear()
+
+            written_items = _sync_catalog_items(client, catalog_id=catalog_id, rows=catalog_item_rows)
+            logger.info(
+                "Parser job %s persisted %s changed of %s catalog items",
+                job_id,
+                written_items,
+                len(catalog_item_rows),
+            )
+            snapshot_columns = _write_catalog_snapshot(client, catalog_id=catalog_id, rows=catalog_item_rows)
+
+            retry_job_id = _queue_retry_job(
+                client,
+                job_id=job_id,
+                catalog_id=catalog_id,
+                failed_skus=retry_skus,
+            )
+            if retry_job_id:
+                logger.info(
+                    "Parser job %s queued retry job %s for %s failed items",
+                    job_id,
+                    retry_job_id,
+                    len(retry_skus),
+                )
 
             new_items = sum(1 for row in catalog_item_rows if row["change_type"] == "new")
             updated_items = sum(1 for row in catalog_item_rows if row["change_type"] == "updated")
@@ -741,8 +2111,47 @@ def process_job(client: Client, job: dict) -> bool:
                 "unknown_categories": unknown_categories,
                 "baseline_catalog_id": baseline_catalog_id,
                 "pdf_sha256": pdf_sha256,
+                "pdf_prefetched": pdf_prefetched,
                 "progress_percent": 100,
+                "retry_job_id": retry_job_id,
+                "retry_skus": sorted(retry_skus),
+                "eta_seconds": 0,
+                "fits_run_budget": True,
+                "throughput": runtime.throughput(),
             }
+            if sprite_sheets is not None:
+                summary["sprite_sheets"] = sprite_sheets
+            profile_columns = _profile_columns(store_profile())
+            summary.update(profile_columns)
+
+            completed = (
+                client.table("parser_jobs")
+                .update(
+                    {
+                        "status": "success",
+                        "error_log": None,
+                        "finished_at": now_iso(),
+                        "total_items": total_items,
+                        "reused_items": reused_items,
+                        "queued_items": queued_items,
+                        "processed_items": processed_items,
+                        "failed_items": failed_items,
+                        "progress_percent": 100,
+                        "progress_label": "complete",
+                        "parsed_pages": total_pages,
+                        "total_pages": total_pages,
+                        "eta_seconds": 0,
+                        "fits_run_budget": True,
+                        **profile_columns,
+                    }
+                )
+                .eq("id", job_id)
+                .eq("attempts", heartbeat.attempts)
+                .execute()
+            ).data
+            if not completed:
+                logger.warning("Parser job %s was reclaimed by another run; leaving the catalog to it", job_id)
+                return True
 
             client.table("catalogs").update(
                 {
@@ -751,64 +2160,206 @@ def process_job(client: Client, job: dict) -> bool:
                     "parse_summary": summary,
                     "baseline_catalog_id": baseline_catalog_id,
                     "pdf_sha256": pdf_sha256,
+                    **snapshot_columns,
                 }
             ).eq("id", catalog_id).execute()
-
-            client.table("parser_jobs").update(
-                {
-                    "status": "success",
-                    "error_log": None,
-                    "finished_at": now_iso(),
-                    "total_items": total_items,
-                    "reused_items": reused_items,
-                    "queued_items": queued_items,
-                    "processed_items": processed_items,
-                    "failed_items": failed_items,
-                    "progress_percent": 100,
-                    "progress_label": "complete",
-                    "parsed_pages": total_pages,
-                    "total_pages": total_pages,
-                }
-            ).eq("id", job_id).execute()
+            _record_runtime(
+                client,
+                job_id=job_id,
+                catalog_id=catalog_id,
+                outcome="success",
+                runtime=runtime,
+            )
 
             logger.info("Parser job %s completed: %s", job_id, summary)
             return True
+    except ShutdownGraceExceeded:
+        # Abandoned during the scan: nothing was stored yet, so just hand the job back.
+        _pause_job_for_retry(
+            client,
+            job_id=job_id,
+            catalog_id=catalog_id,
+            progress={"progress_percent": int(job.get("progress_percent") or 0)},
+            attempts=heartbeat.attempts,
+            reason=PAUSE_SHUTDOWN,
+            profile_artifact=store_profile(),
+        )
+        logger.info("Parser job %s re-queued during shutdown", job_id)
+        return False
     except Exception as exc:
         message = str(exc)[:4000]
         logger.exception("Parser job %s failed: %s", job_id, message)
-        client.table("catalogs").update(
-            {"parse_status": "failed", "parse_summary": {"error": message}}
-        ).eq("id", catalog_id).execute()
-        client.table("parser_jobs").update(
-            {
-                "status": "failed",
-                "error_log": message,
-                "finished_at": now_iso(),
-                "progress_label": "failed",
-            }
-        ).eq("id", job_id).execute()
+        profile_columns = _profile_columns(store_profile())
+        failed = (
+            client.table("parser_jobs")
+            .update(
+                {
+                    "status": "failed",
+                    "error_log": message,
+                    "finished_at": now_iso(),
+                    "progress_label": "failed",
+                    **profile_columns,
+                }
+            )
+            .eq("id", job_id)
+            .eq("attempts", heartbeat.attempts)
+            .execute()
+        ).data
+        if failed:
+            client.table("catalogs").update(
+                {"parse_status": "failed", "parse_summary": {"error": message, **profile_columns}}
+            ).eq("id", catalog_id).execute()
         return True
+    finally:
+        heartbeat.stop()
+        _pdf_prefetcher.release(job_id)
+        store_profile()
+
+
+def _parse_pool(max_workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_ignore_shutdown_signals,
+    )
+
+
+def _close_parse_pool(parse_executor: Executor) -> None:
+    # While draining, do not wait for parses that were abandoned at the grace deadline.
+    parse_executor.shutdown(wait=not _shutdown.requested, cancel_futures=True)
+
 
+def run_once(*, parse_executor: Executor | None = None):
+    """Claim and run one job.
 
-def run_once():
+    With ``PARSER_PIPELINE`` the heavy parse runs in a process pool, so it overlaps the
+    scan thread and uploads instead of sharing the GIL with them. Pass a pool to reuse
+    it across runs; otherwise one is started for this job.
+    """
+    _install_shutdown_handlers()
+    if _shutdown.requested:
+        return False
     client = get_client()
-    job = claim_next_job(client)
+    _maybe_refresh_snapshots(client)
+    job = _pdf_prefetcher.claim(lambda: claim_next_job(client))
     if not job:
         logger.info("No queued parser jobs.")
         return False
-    return process_job(client, job)
+    if parse_executor is not None or not PARSER_PIPELINE:
+        return process_job(client, job, parse_executor=parse_executor)
+    parse_executor = _parse_pool(PARSER_PIPELINE_PARSE_AHEAD + 1)
+    try:
+        return process_job(client, job, parse_executor=parse_executor)
+    finally:
+        _close_parse_pool(parse_executor)
+
+
+def run_batch(
+    *,
+    max_jobs: int | None = PARSER_MAX_JOBS_PER_RUN,
+    concurrency: int = PARSER_CONCURRENCY,
+) -> int:
+    """Run up to ``max_jobs`` jobs, ``concurrency`` at a time, under one shared deadline.
+
+    Each job's scan and heavy parse run in a separate process so parses overlap with the
+    network-bound work of the other jobs. Returns the number of jobs that finished.
+    """
+    _install_shutdown_handlers()
+    client = get_client()
+    _maybe_refresh_snapshots(client)
+    deadline = _run_deadline()
+    claim_lock = threading.Lock()
+    counter_lock = threading.Lock()
+    claimed = 0
+    finished = 0
+
+    def _claim() -> dict | None:
+        nonlocal claimed
+        with claim_lock:
+            if _shutdown.requested or _should_pause_for_time_budget(deadline):
+                return None
+            if max_jobs is not None and claimed >= max_jobs:
+                return None
+            # Each lane's first job gets the whole run. Later claims take only jobs
+            # that fit what is left and leave the rest to a fresh runner.
+            remaining_seconds = (
+                deadline - time.monotonic() if deadline is not None and claimed >= concurrency else None
+            )
+            job = _pdf_prefetcher.claim(
+                lambda: claim_next_job(client, remaining_seconds=remaining_seconds)
+            )
+            if job:
+                claimed += 1
+            return job
+
+    def _lane(parse_executor: Executor) -> None:
+        nonlocal finished
+        while True:
+            job = _claim()
+            if not job:
+                return
+            completed = process_job(
+                client,
+                job,
+                deadline=deadline,
+                parse_executor=parse_executor,
+            )
+            if not completed:
+                return
+            with counter_lock:
+                finished += 1
+
+    # Only prefetch for jobs this run can still claim; run_forever's prefetcher is shared across runs.
+    owns_prefetch = _start_prefetch(
+        ahead=concurrency,
+        max_jobs=(lambda: max_jobs - claimed) if max_jobs is not None else None,
+    )
+    parse_executor = _parse_pool(concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="parser-lane") as lanes:
+            futures = [lanes.submit(_lane, parse_executor) for _ in range(concurrency)]
+            for future in futures:
+                future.result()
+    finally:
+        _close_parse_pool(parse_executor)
+        if owns_prefetch:
+            _pdf_prefetcher.stop(timeout=SHUTDOWN_POLL_SECONDS)
+
+    if claimed == 0:
+        logger.info("No queued parser jobs.")
+    return finished
 
 
 def run_forever():
-    logger.info("Parser worker started, polling every %ss", PARSER_POLL_SECONDS)
-    while True:
-        try:
-            processed = run_once()
-            if not processed:
-                time.sleep(PARSER_POLL_SECONDS)
-        except Exception:
-            logger.exception("Unexpected worker error, sleeping before retry")
-            time.sleep(PARSER_POLL_SECONDS)
+    _install_shutdown_handlers()
+    logger.info(
+        "Parser worker started, polling every %ss with concurrency %s",
+        PARSER_POLL_SECONDS,
+        PARSER_CONCURRENCY,
+    )
+    _start_prefetch(ahead=PARSER_CONCURRENCY)
+    # One-at-a-time pipelined jobs keep one parse pool for the worker's lifetime.
+    parse_executor = (
+        _parse_pool(PARSER_PIPELINE_PARSE_AHEAD + 1) if PARSER_PIPELINE and PARSER_CONCURRENCY == 1 else None
+    )
+    try:
+        while not _shutdown.requested:
+            try:
+                if PARSER_CONCURRENCY > 1:
+                    processed = run_batch(max_jobs=None) > 0
+                else:
+                    processed = run_once(parse_executor=parse_executor)
+                if not processed:
+                    _shutdown.wait(PARSER_POLL_SECONDS)
+            except Exception:
+                logger.exception("Unexpected worker error, reconnecting after sleep")
+                _worker_context.reset()
+                _shutdown.wait(PARSER_POLL_SECONDS)
+    finally:
+        if parse_executor is not None:
+            _close_parse_pool(parse_executor)
+        _pdf_prefetcher.stop(timeout=SHUTDOWN_POLL_SECONDS)
+    logger.info("Parser worker stopped")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,60 @@
+-- Classifies a parsed catalog against its baseline inside the database so the
+-- worker no longer downloads every baseline catalog_items row.
+-- p_items: jsonb array of {"sku": text, "signature": text}.
+-- Returns {"new": [sku...], "updated": [sku...], "removed_items": int};
+-- every input SKU not listed is unchanged.
+create or replace function public.diff_catalog_items_against_baseline(
+  p_baseline_catalog_id uuid,
+  p_items jsonb
+)
+returns jsonb
+language sql
+stable
+as $$
+  with incoming as (
+    select distinct on (item->>'sku')
+      item->>'sku' as sku,
+      coalesce(item->>'signature', '') as signature
+    from jsonb_array_elements(coalesce(p_items, '[]'::jsonb)) as item
+    where coalesce(item->>'sku', '') <> ''
+  ),
+  unchanged as (
+    select i.sku
+    from incoming i
+    join public.catalog_items b
+      on b.catalog_id = p_baseline_catalog_id
+     and b.signature = i.signature
+     and b.sku = i.sku
+  ),
+  existing as (
+    select i.sku
+    from incoming i
+    join public.catalog_items b
+      on b.catalog_id = p_baseline_catalog_id
+     and b.sku = i.sku
+  )
+  select jsonb_build_object(
+    'new', coalesce(
+      (
+        select jsonb_agg(i.sku order by i.sku)
+        from incoming i
+        where not exists (select 1 from existing e where e.sku = i.sku)
+      ),
+      '[]'::jsonb
+    ),
+    'updated', coalesce(
+      (
+        select jsonb_agg(e.sku order by e.sku)
+        from existing e
+        where not exists (select 1 from unchanged u where u.sku = e.sku)
+      ),
+      '[]'::jsonb
+    ),
+    'removed_items', (
+      select count(*)
+      from public.catalog_items b
+      where b.catalog_id = p_baseline_catalog_id
+        and not exists (select 1 from incoming i where i.sku = b.sku)
+    )
+  );
+$$;
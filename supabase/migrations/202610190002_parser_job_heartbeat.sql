@@ -0,0 +1,43 @@
+alter table public.parser_jobs
+add column if not exists heartbeat_at timestamptz;
+
+create index if not exists idx_parser_jobs_status_heartbeat
+on public.parser_jobs(status, heartbeat_at);
+
+-- Refreshes the lease of a running parser job and tells the worker whether it
+-- should stop. The lease is only refreshed while the job is still processing
+-- under the same attempt, so a worker whose job was reclaimed stops writing.
+-- Returns {"cancel": boolean, "reason": text | null}.
+create or replace function public.parser_job_heartbeat(
+  p_job_id uuid,
+  p_attempts int
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+  v_catalog_id uuid;
+  v_catalog public.catalogs%rowtype;
+begin
+  update public.parser_jobs
+  set heartbeat_at = now()
+  where id = p_job_id
+    and status = 'processing'
+    and attempts = p_attempts
+  returning catalog_id into v_catalog_id;
+
+  if not found then
+    if exists (select 1 from public.parser_jobs where id = p_job_id) then
+      return jsonb_build_object('cancel', true, 'reason', 'lease_lost');
+    end if;
+    return jsonb_build_object('cancel', true, 'reason', 'job_deleted');
+  end if;
+
+  select * into v_catalog from public.catalogs where id = v_catalog_id;
+  if not found or v_catalog.deleted_at is not null or v_catalog.status = 'archived' then
+    return jsonb_build_object('cancel', true, 'reason', 'catalog_deleted');
+  end if;
+
+  return jsonb_build_object('cancel', false, 'reason', null);
+end;
+$$;
@@ -0,0 +1,6 @@
+alter table public.parser_jobs
+add column if not exists priority int not null default 0,
+add column if not exists estimated_cost_seconds numeric;
+
+create index if not exists idx_parser_jobs_status_priority_created
+on public.parser_jobs(status, priority desc, created_at);
@@ -0,0 +1,157 @@
+-- Diff-based persistence for parser output. The worker sends rows in bounded
+-- batches; each batch is one statement (one transaction) that inserts new SKUs
+-- and updates only rows whose content changed. Vanished SKUs are pruned
+-- explicitly, so a catalog never goes through a window with no items.
+
+delete from public.parser_job_items a
+using public.parser_job_items b
+where a.parser_job_id = b.parser_job_id
+  and a.sku = b.sku
+  and a.ctid < b.ctid;
+
+create unique index if not exists uniq_parser_job_items_job_sku
+on public.parser_job_items(parser_job_id, sku);
+
+create or replace function public.sync_parser_job_items(
+  p_job_id uuid,
+  p_catalog_id uuid,
+  p_rows jsonb
+)
+returns int
+language sql
+as $$
+  with incoming as (
+    select distinct on (r.sku) r.*
+    from jsonb_to_recordset(coalesce(p_rows, '[]'::jsonb)) as r(
+      sku text,
+      quick_fingerprint text,
+      page_no int,
+      sku_bbox jsonb,
+      image_bbox jsonb,
+      status text,
+      error_log text,
+      finished_at timestamptz
+    )
+  ),
+  written as (
+    insert into public.parser_job_items as j (
+      parser_job_id, catalog_id, sku, quick_fingerprint, page_no,
+      sku_bbox, image_bbox, status, error_log, finished_at
+    )
+    select
+      p_job_id, p_catalog_id, i.sku, i.quick_fingerprint, i.page_no,
+      i.sku_bbox, i.image_bbox, coalesce(i.status, 'queued'), i.error_log, i.finished_at
+    from incoming i
+    on conflict (parser_job_id, sku) do update set
+      quick_fingerprint = excluded.quick_fingerprint,
+      page_no = excluded.page_no,
+      sku_bbox = excluded.sku_bbox,
+      image_bbox = excluded.image_bbox,
+      status = excluded.status,
+      error_log = excluded.error_log,
+      finished_at = excluded.finished_at
+    where (j.quick_fingerprint, j.page_no, j.sku_bbox, j.image_bbox, j.status, j.error_log)
+      is distinct from
+      (excluded.quick_fingerprint, excluded.page_no, excluded.sku_bbox, excluded.image_bbox, excluded.status, excluded.error_log)
+    returning 1
+  )
+  select count(*)::int from written;
+$$;
+
+create or replace function public.prune_parser_job_items(
+  p_job_id uuid,
+  p_keep_skus text[]
+)
+returns int
+language sql
+as $$
+  with deleted as (
+    delete from public.parser_job_items
+    where parser_job_id = p_job_id
+      and not (sku = any(coalesce(p_keep_skus, '{}'::text[])))
+    returning 1
+  )
+  select count(*)::int from deleted;
+$$;
+
+create or replace function public.sync_catalog_items(
+  p_catalog_id uuid,
+  p_rows jsonb
+)
+returns int
+language sql
+as $$
+  with incoming as (
+    select distinct on (r.sku) r.*
+    from jsonb_to_recordset(coalesce(p_rows, '[]'::jsonb)) as r(
+      sku text,
+      name text,
+      upc text,
+      pack text,
+      category text,
+      image_storage_path text,
+      parse_issues jsonb,
+      approved boolean,
+      signature text,
+      quick_fingerprint text,
+      change_type text,
+      display_order int,
+      source_page_no int,
+      source_top numeric
+    )
+  ),
+  written as (
+    insert into public.catalog_items as c (
+      catalog_id, sku, name, upc, pack, category, image_storage_path, parse_issues,
+      approved, signature, quick_fingerprint, change_type, display_order,
+      source_page_no, source_top
+    )
+    select
+      p_catalog_id, i.sku, i.name, i.upc, i.pack, i.category,
+      coalesce(i.image_storage_path, ''), coalesce(i.parse_issues, '[]'::jsonb),
+      coalesce(i.approved, false), coalesce(i.signature, ''), i.quick_fingerprint,
+      coalesce(i.change_type, 'new'), coalesce(i.display_order, 0),
+      i.source_page_no, i.source_top
+    from incoming i
+    on conflict (catalog_id, sku) do update set
+      name = excluded.name,
+      upc = excluded.upc,
+      pack = excluded.pack,
+      category = excluded.category,
+      image_storage_path = excluded.image_storage_path,
+      parse_issues = excluded.parse_issues,
+      approved = excluded.approved,
+      signature = excluded.signature,
+      quick_fingerprint = excluded.quick_fingerprint,
+      change_type = excluded.change_type,
+      display_order = excluded.display_order,
+      source_page_no = excluded.source_page_no,
+      source_top = excluded.source_top
+    where (
+      c.name, c.upc, c.pack, c.category, c.image_storage_path, c.parse_issues, c.approved,
+      c.signature, c.quick_fingerprint, c.change_type, c.display_order, c.source_page_no, c.source_top
+    ) is distinct from (
+      excluded.name, excluded.upc, excluded.pack, excluded.category, excluded.image_storage_path,
+      excluded.parse_issues, excluded.approved, excluded.signature, excluded.quick_fingerprint,
+      excluded.change_type, excluded.display_order, excluded.source_page_no, excluded.source_top
+    )
+    returning 1
+  )
+  select count(*)::int from written;
+$$;
+
+create or replace function public.prune_catalog_items(
+  p_catalog_id uuid,
+  p_keep_skus text[]
+)
+returns int
+language sql
+as $$
+  with deleted as (
+    delete from public.catalog_items
+    where catalog_id = p_catalog_id
+      and not (sku = any(coalesce(p_keep_skus, '{}'::text[])))
+    returning 1
+  )
+  select count(*)::int from deleted;
+$$;
@@ -0,0 +1,11 @@
+-- Follow-up jobs for items that failed on transient errors. A job that finishes
+-- with such failures queues a retry job for the same catalog; items that did
+-- succeed are served from item_parse_cache, so only the failed SKUs are parsed
+-- again. retry_depth bounds the chain.
+alter table public.parser_jobs
+add column if not exists retry_of_job_id uuid references public.parser_jobs(id) on delete set null,
+add column if not exists retry_depth int not null default 0,
+add column if not exists retry_skus text[];
+
+create index if not exists idx_parser_jobs_retry_of_job_id
+on public.parser_jobs(retry_of_job_id);
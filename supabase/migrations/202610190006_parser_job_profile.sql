@@ -0,0 +1,11 @@
+-- Opt-in profiling for a single parser job. `profile` takes the same values as
+-- the worker's PARSER_PROFILE (e.g. 'all' or 'cprofile,pages'); reports go to
+-- the private parser-profiles bucket and are linked from parse_summary and
+-- `profile_artifact`, whether the run succeeded, paused or failed.
+alter table public.parser_jobs
+add column if not exists profile text,
+add column if not exists profile_artifact text;
+
+insert into storage.buckets (id, name, public)
+values ('parser-profiles', 'parser-profiles', false)
+on conflict (id) do nothing;
@@ -0,0 +1,38 @@
+-- Measured parser throughput, one row per job run (a run that pauses on the time
+-- budget and its resumption are separate rows). The worker turns recent rows
+-- into per-page and per-item rates for ETAs and claim-time decisions.
+create table if not exists public.parser_runtime_history (
+  id uuid primary key default gen_random_uuid(),
+  parser_job_id uuid references public.parser_jobs(id) on delete set null,
+  catalog_id uuid references public.catalogs(id) on delete set null,
+  outcome text not null check (outcome in ('success', 'paused')),
+  scan_pages int not null default 0,
+  scan_seconds numeric not null default 0,
+  parse_pages int not null default 0,
+  parse_items int not null default 0,
+  parse_seconds numeric not null default 0,
+  upload_items int not null default 0,
+  upload_seconds numeric not null default 0,
+  scan_pages_per_second numeric generated always as (scan_pages / nullif(scan_seconds, 0)) stored,
+  parse_pages_per_second numeric generated always as (parse_pages / nullif(parse_seconds, 0)) stored,
+  parse_items_per_second numeric generated always as (parse_items / nullif(parse_seconds, 0)) stored,
+  upload_items_per_second numeric generated always as (upload_items / nullif(upload_seconds, 0)) stored,
+  created_at timestamptz not null default now()
+);
+
+create index if not exists idx_parser_runtime_history_created
+on public.parser_runtime_history(created_at desc);
+
+alter table public.parser_runtime_history enable row level security;
+
+drop policy if exists "admin_all_parser_runtime_history" on public.parser_runtime_history;
+create policy "admin_all_parser_runtime_history"
+on public.parser_runtime_history
+for all
+to authenticated
+using (public.is_admin(auth.uid()))
+with check (public.is_admin(auth.uid()));
+
+alter table public.parser_jobs
+add column if not exists eta_seconds numeric,
+add column if not exists fits_run_budget boolean;
@@ -0,0 +1,20 @@
+-- Queued jobs made redundant by another job for the same catalog, or for the same
+-- PDF content, are closed as superseded at claim time instead of being parsed.
+alter table public.parser_jobs
+drop constraint if exists parser_jobs_status_check;
+
+alter table public.parser_jobs
+add constraint parser_jobs_status_check
+check (status in ('queued', 'processing', 'success', 'failed', 'superseded'));
+
+alter table public.parser_jobs
+add column if not exists superseded_by_job_id uuid references public.parser_jobs(id) on delete set null;
+
+-- A catalog whose only job was superseded by a re-upload of the same PDF under another
+-- catalog is not parsed; its parse_summary points at that catalog.
+alter table public.catalogs
+drop constraint if exists catalogs_parse_status_check;
+
+alter table public.catalogs
+add constraint catalogs_parse_status_check
+check (parse_status in ('queued', 'processing', 'needs_review', 'failed', 'complete', 'superseded'));
@@ -0,0 +1,66 @@
+-- Precomputed customer catalog snapshots. The worker writes the ordered items of a
+-- catalog as gzip JSON to catalog-snapshots/<catalog_id>/<sha256>.json.gz and
+-- records the path on the catalog. Any change to a customer-visible item column
+-- bumps items_version and clears the path, so a stale snapshot is never served;
+-- link pages fall back to querying catalog_items until the worker writes a new one.
+alter table public.catalogs
+add column if not exists items_version bigint not null default 0,
+add column if not exists snapshot_path text,
+add column if not exists snapshot_sha256 text;
+
+create index if not exists idx_catalogs_published_without_snapshot
+on public.catalogs(published_at)
+where status = 'published' and snapshot_path is null and deleted_at is null;
+
+insert into storage.buckets (id, name, public)
+values ('catalog-snapshots', 'catalog-snapshots', false)
+on conflict (id) do nothing;
+
+create or replace function public.invalidate_catalog_snapshot()
+returns trigger
+language plpgsql
+as $$
+begin
+  if tg_op = 'INSERT' then
+    update public.catalogs c
+    set items_version = c.items_version + 1, snapshot_path = null
+    where c.id in (select distinct n.catalog_id from new_rows n);
+  elsif tg_op = 'DELETE' then
+    update public.catalogs c
+    set items_version = c.items_version + 1, snapshot_path = null
+    where c.id in (select distinct o.catalog_id from old_rows o);
+  else
+    -- Approvals and parse bookkeeping do not change what customers see.
+    update public.catalogs c
+    set items_version = c.items_version + 1, snapshot_path = null
+    where c.id in (
+      select distinct n.catalog_id
+      from new_rows n
+      join old_rows o on o.id = n.id
+      where (n.sku, n.name, n.upc, n.pack, n.category, n.image_storage_path, n.display_order)
+        is distinct from
+        (o.sku, o.name, o.upc, o.pack, o.category, o.image_storage_path, o.display_order)
+    );
+  end if;
+  return null;
+end;
+$$;
+
+-- Statement-level, so a batched sync touches each catalog row once per statement.
+drop trigger if exists catalog_items_snapshot_insert on public.catalog_items;
+create trigger catalog_items_snapshot_insert
+after insert on public.catalog_items
+referencing new table as new_rows
+for each statement execute procedure public.invalidate_catalog_snapshot();
+
+drop trigger if exists catalog_items_snapshot_update on public.catalog_items;
+create trigger catalog_items_snapshot_update
+after update on public.catalog_items
+referencing old table as old_rows new table as new_rows
+for each statement execute procedure public.invalidate_catalog_snapshot();
+
+drop trigger if exists catalog_items_snapshot_delete on public.catalog_items;
+create trigger catalog_items_snapshot_delete
+after delete on public.catalog_items
+referencing old table as old_rows
+for each statement execute procedure public.invalidate_catalog_snapshot();
@@ -0,0 +1,139 @@
+-- Per-page sprite sheets of product images. With PARSER_SPRITE_SHEETS on, the worker
+-- packs each source page's images into product-images/sprites/<sha256>.webp and
+-- records each item's cell. The sheet path hashes the page's (sku, image path)
+-- list, so unchanged pages share one sheet across catalogs.
+alter table public.catalog_items
+add column if not exists sprite_path text,
+add column if not exists sprite_offset jsonb;
+
+create index if not exists idx_catalog_items_sprite_path
+on public.catalog_items(sprite_path)
+where sprite_path is not null;
+
+create or replace function public.sync_catalog_items(
+  p_catalog_id uuid,
+  p_rows jsonb
+)
+returns int
+language sql
+as $$
+  with incoming as (
+    select distinct on (r.sku) r.*
+    from jsonb_to_recordset(coalesce(p_rows, '[]'::jsonb)) as r(
+      sku text,
+      name text,
+      upc text,
+      pack text,
+      category text,
+      image_storage_path text,
+      parse_issues jsonb,
+      approved boolean,
+      signature text,
+      quick_fingerprint text,
+      change_type text,
+      display_order int,
+      source_page_no int,
+      source_top numeric,
+      sprite_path text,
+      sprite_offset jsonb
+    )
+  ),
+  written as (
+    insert into public.catalog_items as c (
+      catalog_id, sku, name, upc, pack, category, image_storage_path, parse_issues,
+      approved, signature, quick_fingerprint, change_type, display_order,
+      source_page_no, source_top, sprite_path, sprite_offset
+    )
+    select
+      p_catalog_id, i.sku, i.name, i.upc, i.pack, i.category,
+      coalesce(i.image_storage_path, ''), coalesce(i.parse_issues, '[]'::jsonb),
+      coalesce(i.approved, false), coalesce(i.signature, ''), i.quick_fingerprint,
+      coalesce(i.change_type, 'new'), coalesce(i.display_order, 0),
+      i.source_page_no, i.source_top, i.sprite_path, i.sprite_offset
+    from incoming i
+    on conflict (catalog_id, sku) do update set
+      name = excluded.name,
+      upc = excluded.upc,
+      pack = excluded.pack,
+      category = excluded.category,
+      image_storage_path = excluded.image_storage_path,
+      parse_issues = excluded.parse_issues,
+      approved = excluded.approved,
+      signature = excluded.signature,
+      quick_fingerprint = excluded.quick_fingerprint,
+      change_type = excluded.change_type,
+      display_order = excluded.display_order,
+      source_page_no = excluded.source_page_no,
+      source_top = excluded.source_top,
+      sprite_path = excluded.sprite_path,
+      sprite_offset = excluded.sprite_offset
+    where (
+      c.name, c.upc, c.pack, c.category, c.image_storage_path, c.parse_issues, c.approved,
+      c.signature, c.quick_fingerprint, c.change_type, c.display_order, c.source_page_no, c.source_top,
+      c.sprite_path, c.sprite_offset
+    ) is distinct from (
+      excluded.name, excluded.upc, excluded.pack, excluded.category, excluded.image_storage_path,
+      excluded.parse_issues, excluded.approved, excluded.signature, excluded.quick_fingerprint,
+      excluded.change_type, excluded.display_order, excluded.source_page_no, excluded.source_top,
+      excluded.sprite_path, excluded.sprite_offset
+    )
+    returning 1
+  )
+  select count(*)::int from written;
+$$;
+
+-- Snapshots carry the sprite columns, so a sprite change invalidates them too.
+create or replace function public.invalidate_catalog_snapshot()
+returns trigger
+language plpgsql
+as $$
+begin
+  if tg_op = 'INSERT' then
+    update public.catalogs c
+    set items_version = c.items_version + 1, snapshot_path = null
+    where c.id in (select distinct n.catalog_id from new_rows n);
+  elsif tg_op = 'DELETE' then
+    update public.catalogs c
+    set items_version = c.items_version + 1, snapshot_path = null
+    where c.id in (select distinct o.catalog_id from old_rows o);
+  else
+    -- Approvals and parse bookkeeping do not change what customers see.
+    update public.catalogs c
+    set items_version = c.items_version + 1, snapshot_path = null
+    where c.id in (
+      select distinct n.catalog_id
+      from new_rows n
+      join old_rows o on o.id = n.id
+      where (
+        n.sku, n.name, n.upc, n.pack, n.category, n.image_storage_path, n.display_order,
+        n.sprite_path, n.sprite_offset
+      ) is distinct from (
+        o.sku, o.name, o.upc, o.pack, o.category, o.image_storage_path, o.display_order,
+        o.sprite_path, o.sprite_offset
+      )
+    );
+  end if;
+  return null;
+end;
+$$;
+
+-- An image replaced outside the worker (admin edits, imports) no longer matches
+-- its cell, so the item falls back to its own image until the next parse.
+create or replace function public.clear_stale_catalog_item_sprite()
+returns trigger
+language plpgsql
+as $$
+begin
+  if new.image_storage_path is distinct from old.image_storage_path
+     and new.sprite_path is not distinct from old.sprite_path then
+    new.sprite_path := null;
+    new.sprite_offset := null;
+  end if;
+  return new;
+end;
+$$;
+
+drop trigger if exists catalog_items_clear_stale_sprite on public.catalog_items;
+create trigger catalog_items_clear_stale_sprite
+before update of image_storage_path on public.catalog_items
+for each row execute procedure public.clear_stale_catalog_item_sprite();
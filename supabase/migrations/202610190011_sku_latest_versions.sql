@@ -0,0 +1,175 @@
+-- Each SKU's latest published version. Change classification compares a parsed
+-- catalog with this table instead of with one baseline catalog, so a SKU that
+-- skipped the latest catalog is still recognised. Triggers on catalogs keep it
+-- current: publishing records a catalog's items, and unpublishing, archiving
+-- or deleting a catalog falls its SKUs back to the next latest published one.
+create table if not exists public.sku_latest_versions (
+  sku text primary key,
+  catalog_id uuid not null references public.catalogs(id) on delete cascade,
+  signature text not null,
+  upc text,
+  image_storage_path text not null default '',
+  published_at timestamptz not null,
+  updated_at timestamptz not null default now()
+);
+
+create index if not exists idx_sku_latest_versions_catalog
+on public.sku_latest_versions(catalog_id);
+
+alter table public.sku_latest_versions enable row level security;
+
+drop policy if exists "admin_all_sku_latest_versions" on public.sku_latest_versions;
+create policy "admin_all_sku_latest_versions"
+on public.sku_latest_versions
+for all
+to authenticated
+using (public.is_admin(auth.uid()))
+with check (public.is_admin(auth.uid()));
+
+-- Recompute the given SKUs from every published, non-deleted catalog other than
+-- p_exclude_catalog_id; SKUs no such catalog has are dropped.
+create or replace function public.refresh_sku_latest_versions(
+  p_skus text[],
+  p_exclude_catalog_id uuid default null
+)
+returns int
+language sql
+as $$
+  with latest as (
+    select distinct on (i.sku)
+      i.sku, c.id as catalog_id, i.signature, i.upc, i.image_storage_path, c.published_at
+    from public.catalog_items i
+    join public.catalogs c on c.id = i.catalog_id
+    where i.sku = any(p_skus)
+      and c.status = 'published'
+      and c.deleted_at is null
+      and c.published_at is not null
+      and c.id is distinct from p_exclude_catalog_id
+    order by i.sku, c.published_at desc, c.created_at desc
+  ),
+  dropped as (
+    delete from public.sku_latest_versions v
+    where v.sku = any(p_skus)
+      and not exists (select 1 from latest l where l.sku = v.sku)
+    returning 1
+  ),
+  written as (
+    insert into public.sku_latest_versions as v (
+      sku, catalog_id, signature, upc, image_storage_path, published_at, updated_at
+    )
+    select
+      l.sku, l.catalog_id, coalesce(l.signature, ''), l.upc,
+      coalesce(l.image_storage_path, ''), l.published_at, now()
+    from latest l
+    on conflict (sku) do update set
+      catalog_id = excluded.catalog_id,
+      signature = excluded.signature,
+      upc = excluded.upc,
+      image_storage_path = excluded.image_storage_path,
+      published_at = excluded.published_at,
+      updated_at = now()
+    where (v.catalog_id, v.signature, v.upc, v.image_storage_path, v.published_at)
+      is distinct from
+      (excluded.catalog_id, excluded.signature, excluded.upc, excluded.image_storage_path, excluded.published_at)
+    returning 1
+  )
+  select ((select count(*) from written) + (select count(*) from dropped))::int;
+$$;
+
+create or replace function public.sync_sku_latest_versions()
+returns trigger
+language plpgsql
+as $$
+declare
+  was_live boolean := false;
+  is_live boolean := false;
+begin
+  if tg_op <> 'INSERT' then
+    was_live := old.status = 'published' and old.deleted_at is null;
+  end if;
+  if tg_op <> 'DELETE' then
+    is_live := new.status = 'published' and new.deleted_at is null;
+  end if;
+
+  if is_live and (not was_live or new.published_at is distinct from old.published_at) then
+    perform public.refresh_sku_latest_versions(
+      array(select i.sku from public.catalog_items i where i.catalog_id = new.id)
+    );
+  elsif was_live and not is_live then
+    perform public.refresh_sku_latest_versions(
+      array(select v.sku from public.sku_latest_versions v where v.catalog_id = old.id),
+      old.id
+    );
+  end if;
+
+  if tg_op = 'DELETE' then
+    return old;
+  end if;
+  return new;
+end;
+$$;
+
+drop trigger if exists catalogs_sync_sku_latest_versions on public.catalogs;
+create trigger catalogs_sync_sku_latest_versions
+after insert or update of status, deleted_at, published_at on public.catalogs
+for each row execute procedure public.sync_sku_latest_versions();
+
+-- Before delete, while the catalog's items still exist for the fallback.
+drop trigger if exists catalogs_delete_sku_latest_versions on public.catalogs;
+create trigger catalogs_delete_sku_latest_versions
+before delete on public.catalogs
+for each row execute procedure public.sync_sku_latest_versions();
+
+select public.refresh_sku_latest_versions(
+  array(
+    select distinct i.sku
+    from public.catalog_items i
+    join public.catalogs c on c.id = i.catalog_id
+    where c.status = 'published' and c.deleted_at is null
+  )
+);
+
+-- Same result shape as diff_catalog_items_against_baseline. New and updated are
+-- decided per SKU against sku_latest_versions. removed_items still counts the
+-- baseline catalog's SKUs that the parsed catalog dropped.
+create or replace function public.diff_catalog_items_against_latest(
+  p_baseline_catalog_id uuid,
+  p_items jsonb
+)
+returns jsonb
+language sql
+stable
+as $$
+  with incoming as (
+    select distinct on (item->>'sku')
+      item->>'sku' as sku,
+      coalesce(item->>'signature', '') as signature
+    from jsonb_array_elements(coalesce(p_items, '[]'::jsonb)) as item
+    where coalesce(item->>'sku', '') <> ''
+  ),
+  known as (
+    select i.sku, v.signature = i.signature as unchanged
+    from incoming i
+    join public.sku_latest_versions v on v.sku = i.sku
+  )
+  select jsonb_build_object(
+    'new', coalesce(
+      (
+        select jsonb_agg(i.sku order by i.sku)
+        from incoming i
+        where not exists (select 1 from known k where k.sku = i.sku)
+      ),
+      '[]'::jsonb
+    ),
+    'updated', coalesce(
+      (select jsonb_agg(k.sku order by k.sku) from known k where not k.unchanged),
+      '[]'::jsonb
+    ),
+    'removed_items', (
+      select count(*)
+      from public.catalog_items b
+      where b.catalog_id = p_baseline_catalog_id
+        and not exists (select 1 from incoming i where i.sku = b.sku)
+    )
+  );
+$$;
@@ -0,0 +1,173 @@
+-- Queued parser jobs, ranked the way the worker picks them: highest priority first,
+-- then highest response ratio ((wait + estimated cost) / estimated cost). Ranking
+-- before the limit keeps shortest-job-first with aging across the whole queue, not
+-- only among the oldest p_limit jobs.
+--
+-- Each row carries the inputs the worker needs to estimate the job's cost: progress
+-- from a paused run, the PDF object size, the cache-hit ratio of the catalog's last 5
+-- successful jobs (the last 20 jobs overall for a catalog without one), and the unit
+-- costs measured by the last 20 runs. The p_default_* arguments are the worker's
+-- estimates for whatever has not been measured yet. The storage ETag (the content MD5
+-- for a plain upload) lets jobs for byte-identical PDFs be coalesced before anything
+-- is downloaded, and retry_skus keeps a follow-up job that parses only some SKUs from
+-- superseding a full parse.
+create function public.parser_job_candidates(
+  p_limit int default 25,
+  p_default_scan_seconds_per_page numeric default 0.25,
+  p_default_parse_seconds_per_item numeric default 0.45,
+  p_default_upload_seconds_per_item numeric default 0.15,
+  p_pdf_bytes_per_page numeric default 400000,
+  p_default_pages int default 50,
+  p_items_per_page int default 16
+)
+returns table (
+  id uuid,
+  catalog_id uuid,
+  status text,
+  attempts int,
+  created_at timestamptz,
+  priority int,
+  total_pages int,
+  progress_percent int,
+  total_items int,
+  reused_items int,
+  profile text,
+  pdf_size_bytes bigint,
+  historic_hit_ratio numeric,
+  scan_seconds_per_page numeric,
+  parse_seconds_per_item numeric,
+  upload_seconds_per_item numeric,
+  pdf_content_hash text,
+  retry_skus text[]
+)
+language sql
+stable
+security definer
+set search_path = public
+as $$
+  with history as (
+    select coalesce(avg(recent.reused_items::numeric / recent.total_items), 0) as ratio
+    from (
+      select reused_items, total_items
+      from public.parser_jobs
+      where status = 'success'
+        and total_items > 0
+      order by finished_at desc nulls last
+      limit 20
+    ) recent
+  ),
+  rates as (
+    select
+      sum(recent.scan_seconds) / nullif(sum(recent.scan_pages), 0) as scan_seconds_per_page,
+      sum(recent.parse_seconds) / nullif(sum(recent.parse_items), 0) as parse_seconds_per_item,
+      sum(recent.upload_seconds) / nullif(sum(recent.upload_items), 0) as upload_seconds_per_item
+    from (
+      select scan_pages, scan_seconds, parse_items, parse_seconds, upload_items, upload_seconds
+      from public.parser_runtime_history
+      order by created_at desc
+      limit 20
+    ) recent
+  ),
+  queued as (
+    select
+      j.id,
+      j.catalog_id,
+      j.status,
+      j.attempts,
+      j.created_at,
+      j.priority,
+      j.total_pages,
+      j.progress_percent,
+      j.total_items,
+      j.reused_items,
+      j.profile,
+      nullif(o.metadata->>'size', '')::bigint as pdf_size_bytes,
+      coalesce(ch.ratio, h.ratio) as historic_hit_ratio,
+      r.scan_seconds_per_page,
+      r.parse_seconds_per_item,
+      r.upload_seconds_per_item,
+      nullif(o.metadata->>'eTag', '') as pdf_content_hash,
+      j.retry_skus
+    from public.parser_jobs j
+    join public.catalogs c on c.id = j.catalog_id
+    left join storage.objects o
+      on o.bucket_id = 'catalog-pdfs'
+     and o.name = c.pdf_storage_path
+    left join lateral (
+      select avg(recent.reused_items::numeric / recent.total_items) as ratio
+      from (
+        select p.reused_items, p.total_items
+        from public.parser_jobs p
+        where p.catalog_id = j.catalog_id
+          and p.status = 'success'
+          and p.total_items > 0
+        order by p.finished_at desc nulls last
+        limit 5
+      ) recent
+    ) ch on true
+    cross join history h
+    cross join rates r
+    where j.status = 'queued'
+  ),
+  -- The same estimate as the worker's _estimate_job_cost_seconds.
+  costed as (
+    select
+      q.*,
+      greatest(
+        1,
+        pages.estimated * coalesce(nullif(q.scan_seconds_per_page, 0), p_default_scan_seconds_per_page)
+        + greatest(
+          0,
+          case
+            when q.total_items > 0 then q.total_items * (1 - coalesce(q.progress_percent, 0) / 100.0)
+            else pages.estimated * p_items_per_page * (1 - q.historic_hit_ratio)
+          end
+        ) * (
+          coalesce(nullif(q.parse_seconds_per_item, 0), p_default_parse_seconds_per_item)
+          + coalesce(nullif(q.upload_seconds_per_item, 0), p_default_upload_seconds_per_item)
+        )
+      ) as estimated_cost_seconds
+    from queued q
+    cross join lateral (
+      select coalesce(
+        nullif(q.total_pages, 0),
+        case when q.pdf_size_bytes > 0 then greatest(1, round(q.pdf_size_bytes / p_pdf_bytes_per_page))::int end,
+        p_default_pages
+      ) as estimated
+    ) pages
+  )
+  select
+    id,
+    catalog_id,
+    status,
+    attempts,
+    created_at,
+    priority,
+    total_pages,
+    progress_percent,
+    total_items,
+    reused_items,
+    profile,
+    pdf_size_bytes,
+    historic_hit_ratio,
+    scan_seconds_per_page,
+    parse_seconds_per_item,
+    upload_seconds_per_item,
+    pdf_content_hash,
+    retry_skus
+  from costed
+  order by
+    priority desc,
+    (greatest(0, extract(epoch from now() - created_at)) + estimated_cost_seconds) / estimated_cost_seconds desc,
+    created_at
+  limit greatest(p_limit, 1);
+$$;
+
+create index if not exists parser_jobs_catalog_success_idx
+  on public.parser_jobs (catalog_id, finished_at desc)
+  where status = 'success';
+
+revoke all on function public.parser_job_candidates(int, numeric, numeric, numeric, numeric, int, int)
+from public, anon, authenticated;
+grant execute on function public.parser_job_candidates(int, numeric, numeric, numeric, numeric, int, int)
+to service_role;
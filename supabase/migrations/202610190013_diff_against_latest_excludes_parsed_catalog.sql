@@ -0,0 +1,77 @@
+-- Re-parsing a published catalog used to compare its items with themselves,
+-- because sku_latest_versions holds that catalog's own rows. The diff now takes
+-- the parsed catalog and compares its SKUs with the latest published version
+-- from any other catalog. It also runs for a catalog without a baseline, so
+-- removed_items is 0 but new/updated still come from the published versions.
+create index if not exists idx_catalog_items_sku
+on public.catalog_items(sku);
+
+drop function if exists public.diff_catalog_items_against_latest(uuid, jsonb);
+
+create or replace function public.diff_catalog_items_against_latest(
+  p_baseline_catalog_id uuid,
+  p_items jsonb,
+  p_catalog_id uuid default null
+)
+returns jsonb
+language sql
+stable
+as $$
+  with incoming as (
+    select distinct on (item->>'sku')
+      item->>'sku' as sku,
+      coalesce(item->>'signature', '') as signature
+    from jsonb_array_elements(coalesce(p_items, '[]'::jsonb)) as item
+    where coalesce(item->>'sku', '') <> ''
+  ),
+  own_latest as (
+    select i.sku
+    from incoming i
+    join public.sku_latest_versions v on v.sku = i.sku
+    where v.catalog_id = p_catalog_id
+  ),
+  latest as (
+    select v.sku, v.signature
+    from incoming i
+    join public.sku_latest_versions v on v.sku = i.sku
+    where v.catalog_id is distinct from p_catalog_id
+    union all
+    -- The parsed catalog holds the latest version: compare with the one before it.
+    (
+      select distinct on (o.sku) o.sku, coalesce(ci.signature, '')
+      from own_latest o
+      join public.catalog_items ci on ci.sku = o.sku
+      join public.catalogs c on c.id = ci.catalog_id
+      where c.status = 'published'
+        and c.deleted_at is null
+        and c.published_at is not null
+        and c.id <> p_catalog_id
+      order by o.sku, c.published_at desc, c.created_at desc
+    )
+  ),
+  known as (
+    select i.sku, l.signature = i.signature as unchanged
+    from incoming i
+    join latest l on l.sku = i.sku
+  )
+  select jsonb_build_object(
+    'new', coalesce(
+      (
+        select jsonb_agg(i.sku order by i.sku)
+        from incoming i
+        where not exists (select 1 from known k where k.sku = i.sku)
+      ),
+      '[]'::jsonb
+    ),
+    'updated', coalesce(
+      (select jsonb_agg(k.sku order by k.sku) from known k where not k.unchanged),
+      '[]'::jsonb
+    ),
+    'removed_items', (
+      select count(*)
+      from public.catalog_items b
+      where b.catalog_id = p_baseline_catalog_id
+        and not exists (select 1 from incoming i where i.sku = b.sku)
+    )
+  );
+$$;
@@ -23,7 +23,7 @@ export default async function AdminPage() {
     ? await admin
         .from("parser_jobs")
         .select(
-          "id,catalog_id,status,attempts,error_log,created_at,started_at,finished_at,total_items,reused_items,queued_items,processed_items,failed_items,progress_percent,progress_label,parsed_pages,total_pages",
+          "id,catalog_id,status,attempts,error_log,created_at,started_at,finished_at,total_items,reused_items,queued_items,processed_items,failed_items,progress_percent,progress_label,parsed_pages,total_pages,eta_seconds,fits_run_budget",
         )
         .in("catalog_id", catalogIds)
         .order("created_at", { ascending: false })
@@ -24,7 +24,7 @@ export async function GET(
   const { data: parserJob, error: jobError } = await auth.admin
     .from("parser_jobs")
     .select(
-      "id,catalog_id,status,attempts,error_log,created_at,started_at,finished_at,total_items,reused_items,queued_items,processed_items,failed_items,progress_percent,progress_label,parsed_pages,total_pages",
+      "id,catalog_id,status,attempts,error_log,created_at,started_at,finished_at,total_items,reused_items,queued_items,processed_items,failed_items,progress_percent,progress_label,parsed_pages,total_pages,eta_seconds,fits_run_budget",
     )
     .eq("catalog_id", id)
     .order("created_at", { ascending: false })
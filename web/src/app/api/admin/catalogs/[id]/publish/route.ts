@@ -1,5 +1,6 @@
 import { NextResponse } from "next/server";
 import { requireAdminApi } from "@/lib/auth";
+import { triggerParserWorkflow } from "@/lib/github-actions";
 
 export async function POST(
   _request: Request,
@@ -12,7 +13,7 @@ export async function POST(
 
   const { data: catalog, error: catalogError } = await auth.admin
     .from("catalogs")
-    .select("id,status,parse_status,parse_summary,deleted_at")
+    .select("id,status,parse_status,parse_summary,deleted_at,snapshot_path")
     .eq("id", id)
     .single();
 
@@ -34,6 +35,13 @@ export async function POST(
     );
   }
 
+  if (catalog.parse_status === "superseded") {
+    return NextResponse.json(
+      { error: "Catalog cannot be published because it was not parsed; the same PDF was uploaded again as another catalog." },
+      { status: 400 },
+    );
+  }
+
   if (catalog.parse_status === "failed") {
     return NextResponse.json(
       { error: "Catalog cannot be published because parsing failed." },
@@ -91,5 +99,10 @@ export async function POST(
     );
   }
 
+  if (!catalog.snapshot_path) {
+    // Items were edited after parsing; the worker's sweep writes a fresh snapshot.
+    await triggerParserWorkflow({ reason: "catalog_published", catalogId: id });
+  }
+
   return NextResponse.json({ ok: true });
 }
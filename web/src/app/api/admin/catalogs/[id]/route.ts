@@ -36,7 +36,7 @@ export async function GET(
       auth.admin
         .from("parser_jobs")
         .select(
-          "id,status,attempts,error_log,created_at,started_at,finished_at,total_items,reused_items,queued_items,processed_items,failed_items,progress_percent,progress_label,parsed_pages,total_pages",
+          "id,status,attempts,error_log,created_at,started_at,finished_at,total_items,reused_items,queued_items,processed_items,failed_items,progress_percent,progress_label,parsed_pages,total_pages,eta_seconds,fits_run_budget",
         )
         .eq("catalog_id", id)
         .order("created_at", { ascending: false })
@@ -0,0 +1,44 @@
+import { NextResponse } from "next/server";
+import { createSupabaseAdminClient } from "@/lib/supabase/server";
+import { loadCatalogLookupIndex } from "@/lib/catalog/snapshot";
+
+export async function GET(
+  _request: Request,
+  context: { params: Promise<{ token: string }> },
+) {
+  const { token } = await context.params;
+  const admin = createSupabaseAdminClient();
+
+  const { data: link, error: linkError } = await admin
+    .from("customer_links")
+    .select("catalog_id,active")
+    .eq("token", token)
+    .single();
+
+  if (linkError || !link || !link.active) {
+    return NextResponse.json({ error: "Invalid or inactive link" }, { status: 404 });
+  }
+
+  const { data: catalog } = await admin
+    .from("catalogs")
+    .select("status,snapshot_path")
+    .eq("id", link.catalog_id)
+    .single();
+
+  if (!catalog || catalog.status !== "published") {
+    return NextResponse.json(
+      { error: "Catalog is not available for ordering" },
+      { status: 400 },
+    );
+  }
+
+  const index = await loadCatalogLookupIndex(catalog.snapshot_path);
+  if (!index) {
+    // No snapshot yet (or it was invalidated); the page searches without an index.
+    return NextResponse.json({ error: "Lookup index is not available" }, { status: 404 });
+  }
+
+  return NextResponse.json(index, {
+    headers: { "Cache-Control": "private, max-age=300" },
+  });
+}
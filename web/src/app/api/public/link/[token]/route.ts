@@ -1,10 +1,12 @@
+import { createHash } from "node:crypto";
 import { NextResponse } from "next/server";
 import { createSupabaseAdminClient } from "@/lib/supabase/server";
-import { getPublicProductImageUrl } from "@/lib/storage";
+import { getProductSprite, getPublicProductImageUrl } from "@/lib/storage";
 import { formatDealText } from "@/lib/deals/matrix";
+import { loadCatalogItems } from "@/lib/catalog/snapshot";
 
 export async function GET(
-  _request: Request,
+  request: Request,
   context: { params: Promise<{ token: string }> },
 ) {
   const { token } = await context.params;
@@ -22,7 +24,7 @@ export async function GET(
 
   const { data: catalog } = await admin
     .from("catalogs")
-    .select("id,version_label,status")
+    .select("id,version_label,status,snapshot_path")
     .eq("id", link.catalog_id)
     .single();
 
@@ -33,23 +35,19 @@ export async function GET(
     );
   }
 
-  const { data: items, error: itemsError } = await admin
-    .from("catalog_items")
-    .select("sku,name,upc,pack,category,image_storage_path,display_order")
-    .eq("catalog_id", link.catalog_id)
-    .order("display_order", { ascending: true })
-    .order("category", { ascending: true })
-    .order("name", { ascending: true });
-
+  const { items, error: itemsError } = await loadCatalogItems(
+    link.catalog_id,
+    catalog.snapshot_path,
+  );
   if (itemsError) {
     return NextResponse.json(
-      { error: "Failed to load catalog products", details: itemsError.message },
+      { error: "Failed to load catalog products", details: itemsError },
       { status: 500 },
     );
   }
 
   const today = new Date().toISOString().slice(0, 10);
-  const skuList = (items ?? []).map((item) => item.sku);
+  const skuList = items.map((item) => item.sku);
   let deals:
     | Array<{ sku: string; buy_qty: number; free_qty: number; ends_at: string }>
     | null = null;
@@ -80,7 +78,7 @@ export async function GET(
     dealMap.set(d.sku, list);
   }
 
-  const products = (items ?? []).map((item) => ({
+  const products = items.map((item) => ({
     sku: item.sku,
     name: item.name,
     upc: item.upc ?? "",
@@ -89,6 +87,7 @@ export async function GET(
     imageUrl: item.image_storage_path
       ? getPublicProductImageUrl(item.image_storage_path)
       : "",
+    sprite: getProductSprite(item.sprite_path, item.sprite_offset),
     displayOrder: item.display_order ?? 0,
     deals: dealMap.get(item.sku) ?? [],
   }));
@@ -109,7 +108,7 @@ export async function GET(
     liveOrderItems = (rows ?? []).map((row) => ({ sku: row.sku, qty: row.qty, note: row.note ?? "" }));
   }
 
-  return NextResponse.json({
+  const body = JSON.stringify({
     link: {
       id: link.id,
       token,
@@ -129,4 +128,17 @@ export async function GET(
         }
       : null,
   });
+  // The body carries the live order, so browsers revalidate every time; an
+  // unchanged catalog, deals and order answer with an empty 304.
+  const etag = `W/"${createHash("sha256").update(body).digest("base64url")}"`;
+  const headers = {
+    "Cache-Control": "private, no-cache",
+    ETag: etag,
+  };
+  if (request.headers.get("if-none-match") === etag) {
+    return new NextResponse(null, { status: 304, headers });
+  }
+  return new NextResponse(body, {
+    headers: { ...headers, "Content-Type": "application/json" },
+  });
 }
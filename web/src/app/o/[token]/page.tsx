@@ -1,9 +1,10 @@
 import { notFound } from "next/navigation";
 import { createSupabaseAdminClient } from "@/lib/supabase/server";
-import { getPublicProductImageUrl } from "@/lib/storage";
+import { getProductSprite, getPublicProductImageUrl } from "@/lib/storage";
 import { OrderClient } from "@/components/order-client";
 import type { ProductForOrder } from "@/lib/types";
 import { formatDealText } from "@/lib/deals/matrix";
+import { loadCatalogItems } from "@/lib/catalog/snapshot";
 
 export default async function CustomerOrderPage({
   params,
@@ -25,7 +26,7 @@ export default async function CustomerOrderPage({
 
   const { data: catalog } = await admin
     .from("catalogs")
-    .select("id,version_label,status")
+    .select("id,version_label,status,snapshot_path")
     .eq("id", link.catalog_id)
     .single();
 
@@ -33,16 +34,12 @@ export default async function CustomerOrderPage({
     notFound();
   }
 
-  const { data: items } = await admin
-    .from("catalog_items")
-    .select("sku,name,upc,pack,category,image_storage_path,display_order")
-    .eq("catalog_id", link.catalog_id)
-    .order("display_order", { ascending: true })
-    .order("category", { ascending: true })
-    .order("name", { ascending: true });
+  // One snapshot download in link-page order; the sorted query only runs while
+  // the catalog has no snapshot.
+  const { items } = await loadCatalogItems(link.catalog_id, catalog.snapshot_path);
 
   const today = new Date().toISOString().slice(0, 10);
-  const skuList = (items ?? []).map((item) => item.sku);
+  const skuList = items.map((item) => item.sku);
   let deals:
     | Array<{ sku: string; buy_qty: number; free_qty: number; ends_at: string }>
     | null = null;
@@ -73,7 +70,7 @@ export default async function CustomerOrderPage({
     dealMap.set(d.sku, list);
   }
 
-  const products: ProductForOrder[] = (items ?? []).map((item) => ({
+  const products: ProductForOrder[] = items.map((item) => ({
     sku: item.sku,
     name: item.name,
     upc: item.upc ?? "",
@@ -82,6 +79,7 @@ export default async function CustomerOrderPage({
     imageUrl: item.image_storage_path
       ? getPublicProductImageUrl(item.image_storage_path)
       : "",
+    sprite: getProductSprite(item.sprite_path, item.sprite_offset),
     displayOrder: item.display_order ?? 0,
     deals: dealMap.get(item.sku) ?? [],
   }));
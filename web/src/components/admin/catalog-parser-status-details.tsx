@@ -19,6 +19,14 @@ function valueOrDash(value: unknown) {
   return value === undefined || value === null || value === "" ? "-" : String(value);
 }
 
+function formatEta(parserJob: Partial<ParserJob> | null) {
+  if (parserJob?.status !== "processing" && parserJob?.status !== "queued") return "-";
+  if (parserJob.eta_seconds === undefined || parserJob.eta_seconds === null) return "-";
+  const minutes = Math.ceil(Number(parserJob.eta_seconds) / 60);
+  const budget = parserJob.fits_run_budget ? "this run" : "needs another run";
+  return `~${minutes} min (${budget})`;
+}
+
 export function CatalogParserStatusDetails({
   catalogId,
   parserJob,
@@ -74,6 +82,7 @@ export function CatalogParserStatusDetails({
         <div><strong>Progress</strong><span>{health.progressPercent}%</span></div>
         <div><strong>Items</strong><span>{valueOrDash(parserJob?.processed_items)} processed / {valueOrDash(parserJob?.total_items)} total</span></div>
         <div><strong>Pages</strong><span>{valueOrDash(parserJob?.parsed_pages)} parsed / {valueOrDash(parserJob?.total_pages)} total</span></div>
+        <div><strong>ETA</strong><span>{formatEta(parserJob)}</span></div>
       </div>
       <p className="muted parser-debug__message">{health.message}</p>
       {parserJob?.error_log && (
@@ -92,6 +92,12 @@ export function CatalogUploadPanel({ children }: CatalogUploadPanelProps) {
         router.refresh();
         window.clearInterval(timer);
       }
+      if (health.kind === "superseded") {
+        setStages((current) => setStage(current, "final", "done", health.label));
+        setMessage(health.message ?? "The same PDF was uploaded again as another catalog.");
+        router.refresh();
+        window.clearInterval(timer);
+      }
       if (health.kind === "failed" || health.kind === "stuck_queued" || health.kind === "stalled_processing") {
         setStages((current) =>
           setStage(current, health.kind === "failed" ? "final" : "claimed", "error", health.message),
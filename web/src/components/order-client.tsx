@@ -2,7 +2,8 @@
 "use client";
 
 import { useCallback, useEffect, useMemo, useRef, useState, lazy, Suspense } from "react";
-import type { ProductForOrder } from "@/lib/types";
+import type { CSSProperties } from "react";
+import type { ProductForOrder, ProductSprite } from "@/lib/types";
 import {
   buildDealTiers,
   getNextTierProgress,
@@ -10,6 +11,26 @@ import {
   type QtyNormalizeMode,
 } from "@/lib/deals/order-quantity";
 import { matchesBarcodeQuery, pickSearchValueFromScan } from "@/lib/barcode";
+import { searchLookupIndex, type CatalogLookupIndex } from "@/lib/catalog/lookup-index";
+
+function matchesSearch(product: ProductForOrder, q: string): boolean {
+  return (
+    product.name.toLowerCase().includes(q) ||
+    product.sku.toLowerCase().includes(q) ||
+    matchesBarcodeQuery(product.upc, q)
+  );
+}
+
+// Background sizing that shows one sprite cell scaled to the element's box.
+function spriteStyle(sprite: ProductSprite): CSSProperties {
+  const xRange = sprite.sheetWidth - sprite.width;
+  const yRange = sprite.sheetHeight - sprite.height;
+  return {
+    backgroundImage: `url(${sprite.url})`,
+    backgroundSize: `${(sprite.sheetWidth / sprite.width) * 100}% ${(sprite.sheetHeight / sprite.height) * 100}%`,
+    backgroundPosition: `${xRange ? (sprite.x / xRange) * 100 : 0}% ${yRange ? (sprite.y / yRange) * 100 : 0}%`,
+  };
+}
 
 const BarcodeScanner = lazy(() =>
   import("@/components/barcode-scanner").then((m) => ({ default: m.BarcodeScanner })),
@@ -80,6 +101,7 @@ export function OrderClient({
   });
   const [dealPopupSku, setDealPopupSku] = useState<string | null>(null);
   const [showScanner, setShowScanner] = useState(false);
+  const [lookupIndex, setLookupIndex] = useState<CatalogLookupIndex | null>(null);
 
   const [saveState, setSaveState] = useState<"idle" | "saving" | "saved" | "error">(
     "idle",
@@ -92,27 +114,35 @@ export function OrderClient({
     [products],
   );
 
+  const productsBySku = useMemo(
+    () => new Map(products.map((product, position) => [product.sku, { product, position }])),
+    [products],
+  );
+
   const categories = useMemo(
     () => Array.from(new Set(products.map((x) => x.category))),
     [products],
   );
 
   const filteredProducts = useMemo(() => {
+    const q = search.trim() ? search.toLowerCase() : "";
+    const candidates = q && lookupIndex ? searchLookupIndex(lookupIndex, q) : null;
     let result = products;
+    if (candidates) {
+      // Check only the index's candidates, kept in catalog order.
+      result = Array.from(candidates, (sku) => productsBySku.get(sku))
+        .filter((entry): entry is { product: ProductForOrder; position: number } => Boolean(entry))
+        .sort((a, b) => a.position - b.position)
+        .map((entry) => entry.product);
+    }
     if (activeTab !== "ALL") {
       result = result.filter((p) => p.category === activeTab);
     }
-    if (search.trim()) {
-      const q = search.toLowerCase();
-      result = result.filter(
-        (p) =>
-          p.name.toLowerCase().includes(q) ||
-          p.sku.toLowerCase().includes(q) ||
-          matchesBarcodeQuery(p.upc, q),
-      );
+    if (q) {
+      result = result.filter((p) => matchesSearch(p, q));
     }
     return result;
-  }, [activeTab, products, search]);
+  }, [activeTab, lookupIndex, products, productsBySku, search]);
 
   const orderItems = useMemo(() => {
     return Object.entries(quantities)
@@ -270,6 +300,20 @@ export function OrderClient({
     }
   }, [token]);
 
+  // Search works without the index; it only makes large catalogs faster on slow phones.
+  useEffect(() => {
+    let cancelled = false;
+    fetch(`/api/public/link/${token}/lookup-index`)
+      .then((response) => (response.ok ? response.json() : null))
+      .then((index: CatalogLookupIndex | null) => {
+        if (!cancelled && index) setLookupIndex(index);
+      })
+      .catch(() => undefined);
+    return () => {
+      cancelled = true;
+    };
+  }, [token]);
+
   useEffect(() => {
     if (!zoomed) return;
     const onKeyDown = (event: KeyboardEvent) => {
@@ -472,7 +516,18 @@ export function OrderClient({
                 </button>
               )}
               <div className="cardImageWrap">
-                {product.imageUrl ? (
+                {product.sprite ? (
+                  <div
+                    className="cardSprite"
+                    role="img"
+                    aria-label={product.name}
+                    style={spriteStyle(product.sprite)}
+                    onClick={(event) => {
+                      event.stopPropagation();
+                      setZoomed({ url: product.imageUrl, alt: product.name });
+                    }}
+                  />
+                ) : product.imageUrl ? (
                   <img
                     src={product.imageUrl}
                     alt={product.name}
@@ -1,6 +1,7 @@
 import { describe, expect, it } from "vitest";
 import {
   buildBarcodeCandidates,
+  gtinKey,
   matchesBarcodeQuery,
   pickSearchValueFromScan,
 } from "./barcode";
@@ -31,4 +32,13 @@ describe("barcode helpers", () => {
     expect(matchesBarcodeQuery("032797004947", "004947")).toBe(true);
     expect(matchesBarcodeQuery("032797004947", "no-match")).toBe(false);
   });
+
+  it("normalizes UPC-A, EAN-13 and GTIN-14 to one key", () => {
+    for (const value of ["032797004947", "32797004947", "0032797004947", "00032797004947"]) {
+      expect(gtinKey(value)).toBe("0032797004947");
+    }
+    expect(gtinKey("03279700494")).toBe("0032797004947");
+    expect(gtinKey("4006381333931")).toBe("4006381333931");
+    expect(gtinKey("12345")).toBe("");
+  });
 });
@@ -25,6 +25,35 @@ export function buildBarcodeCandidates(value: string): string[] {
   return uniq(candidates);
 }
 
+function gtinCheckDigit(body: string): string {
+  let total = 0;
+  for (let index = 0; index < body.length; index += 1) {
+    const digit = Number(body[body.length - 1 - index]);
+    total += index % 2 === 0 ? digit * 3 : digit;
+  }
+  return String((10 - (total % 10)) % 10);
+}
+
+// EAN-13 form of a UPC-A, EAN-13 or GTIN-14 code, or "" when the value is not one.
+// Mirrors gtin_key in parser-worker/lookup_index.py.
+export function gtinKey(value: string): string {
+  let digits = digitsOnly(String(value ?? ""));
+  if (digits.length === 14) {
+    if (!digits.startsWith("0")) return "";
+    digits = digits.slice(1);
+  }
+  if (digits.length === 11) {
+    // A UPC-A that lost its leading zero, or its check digit when the padded form does not check.
+    const padded = `0${digits}`;
+    digits =
+      gtinCheckDigit(padded.slice(0, -1)) === padded.slice(-1)
+        ? padded
+        : `${digits}${gtinCheckDigit(digits)}`;
+  }
+  if (digits.length === 12) return `0${digits}`;
+  return digits.length === 13 ? digits : "";
+}
+
 export function pickSearchValueFromScan(scannedValue: string): string {
   const trimmed = String(scannedValue ?? "").trim();
   const candidates = buildBarcodeCandidates(trimmed);
@@ -0,0 +1,29 @@
+import { describe, expect, it } from "vitest";
+import { compareLinkOrder } from "./link-order";
+
+function item(sku: string, name: string | null, display_order: number | null = 0) {
+  return { sku, name, category: "Roses", display_order };
+}
+
+describe("link-page order", () => {
+  // Same rows and order as parser-worker/tests/test_worker_snapshot.py.
+  it("orders mixed-case and accented names by code unit, then by sku", () => {
+    const rows = [
+      item("SKU4", "aster"),
+      item("SKU3", "Éclair"),
+      item("SKU2", "Zinnia"),
+      item("SKU1", "Aster"),
+      item("SKU0", "Aster"),
+      item("SKU5", null, null),
+    ];
+
+    expect([...rows].sort(compareLinkOrder).map((row) => row.sku)).toEqual([
+      "SKU5",
+      "SKU0",
+      "SKU1",
+      "SKU2",
+      "SKU4",
+      "SKU3",
+    ]);
+  });
+});
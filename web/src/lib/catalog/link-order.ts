@@ -0,0 +1,25 @@
+// Link-page item order: display_order, category, name, then sku. Catalog snapshots
+// are written in this order (parser-worker/snapshot.py) and the catalog_items
+// fallback is sorted with it. Text compares by UTF-16 code unit rather than by
+// database collation, so both paths give the same order.
+interface LinkOrderFields {
+  sku: string;
+  name: string | null;
+  category: string | null;
+  display_order: number | null;
+}
+
+function compareText(left: string | null, right: string | null): number {
+  const a = left ?? "";
+  const b = right ?? "";
+  return a < b ? -1 : a > b ? 1 : 0;
+}
+
+export function compareLinkOrder(left: LinkOrderFields, right: LinkOrderFields): number {
+  return (
+    (left.display_order ?? 0) - (right.display_order ?? 0) ||
+    compareText(left.category, right.category) ||
+    compareText(left.name, right.name) ||
+    compareText(left.sku, right.sku)
+  );
+}
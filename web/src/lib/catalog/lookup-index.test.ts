@@ -0,0 +1,49 @@
+import { describe, expect, it } from "vitest";
+import { searchLookupIndex, type CatalogLookupIndex } from "./lookup-index";
+
+// Same rows as parser-worker/tests/test_lookup_index.py.
+const index: CatalogLookupIndex = {
+  schema_version: 1,
+  catalog_id: "catalog-1",
+  skus: ["RS100", "TU200", "RS101"],
+  upc: { "0032797004947": [0], "4006381333931": [2] },
+  sku_prefix: { r: [0, 2], rs: [0, 2], t: [1], tu: [1] },
+  name_prefix: { r: [0, 2], re: [0], ro: [0, 2], t: [1], tu: [1] },
+  trigrams: {
+    ros: [0, 2],
+    ose: [0, 2],
+    tul: [1],
+    uli: [1],
+    lip: [1],
+    rs1: [0, 2],
+    s10: [0, 2],
+    "100": [0],
+    "101": [2],
+    "032": [0],
+    "327": [0],
+    "279": [0],
+  },
+};
+
+describe("catalog lookup index", () => {
+  it("resolves a scanned barcode in any UPC/EAN form", () => {
+    expect(searchLookupIndex(index, "0032797004947")).toEqual(new Set(["RS100"]));
+    expect(searchLookupIndex(index, "32797004947")).toEqual(new Set(["RS100"]));
+  });
+
+  it("narrows text queries by trigram", () => {
+    expect(searchLookupIndex(index, "Rose")).toEqual(new Set(["RS100", "RS101"]));
+    expect(searchLookupIndex(index, "rs10")).toEqual(new Set(["RS100", "RS101"]));
+    expect(searchLookupIndex(index, "tulips")).toEqual(new Set());
+  });
+
+  it("answers short queries from SKU and name-word prefixes", () => {
+    expect(searchLookupIndex(index, "tu")).toEqual(new Set(["TU200"]));
+    expect(searchLookupIndex(index, "re")).toEqual(new Set(["RS100"]));
+  });
+
+  it("leaves queries it cannot narrow to the caller", () => {
+    expect(searchLookupIndex(index, "")).toBeNull();
+    expect(searchLookupIndex(index, "1 7")).toBeNull();
+  });
+});
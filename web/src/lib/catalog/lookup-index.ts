@@ -0,0 +1,78 @@
+import { buildBarcodeCandidates, gtinKey } from "@/lib/barcode";
+
+// Written by the parser worker next to each catalog snapshot; see
+// parser-worker/lookup_index.py for how the maps are built.
+export interface CatalogLookupIndex {
+  schema_version: number;
+  catalog_id: string;
+  skus: string[];
+  upc: Record<string, number[]>;
+  sku_prefix: Record<string, number[]>;
+  name_prefix: Record<string, number[]>;
+  trigrams: Record<string, number[]>;
+}
+
+export const LOOKUP_INDEX_SCHEMA_VERSION = 1;
+const SHORT_QUERY_CHARS = 2;
+const BARCODE_QUERY = /^[\d\s-]+$/;
+
+function trigrams(text: string): string[] {
+  const grams = new Set<string>();
+  for (let index = 0; index + 3 <= text.length; index += 1) {
+    grams.add(text.slice(index, index + 3));
+  }
+  return Array.from(grams);
+}
+
+function itemsWithAllTrigrams(index: CatalogLookupIndex, text: string): number[] {
+  const lists = trigrams(text).map((gram) => index.trigrams[gram] ?? []);
+  if (lists.length === 0) return [];
+  lists.sort((a, b) => a.length - b.length);
+  let result = lists[0];
+  for (const list of lists.slice(1)) {
+    if (result.length === 0) break;
+    const members = new Set(list);
+    result = result.filter((position) => members.has(position));
+  }
+  return result;
+}
+
+/**
+ * SKUs that may match `query`, or null when the index cannot narrow it down (an
+ * empty query, or a barcode fragment under three digits). The set covers every
+ * product the search filter keeps, with two exceptions. One- and two-character
+ * queries only reach SKUs and name words that start with them. Only all-digit
+ * queries are compared with UPC digits. Callers still apply the filter to the
+ * candidates.
+ */
+export function searchLookupIndex(
+  index: CatalogLookupIndex,
+  query: string,
+): Set<string> | null {
+  const q = query.trim().toLowerCase();
+  if (!q) return null;
+
+  const positions = new Set<number>();
+  const add = (list: number[] | undefined) => {
+    for (const position of list ?? []) positions.add(position);
+  };
+
+  const key = gtinKey(q);
+  if (key) add(index.upc[key]);
+
+  if (q.length <= SHORT_QUERY_CHARS) {
+    add(index.sku_prefix[q]);
+    add(index.name_prefix[q]);
+  } else {
+    add(itemsWithAllTrigrams(index, q));
+    const digitVariants = BARCODE_QUERY.test(q) ? buildBarcodeCandidates(q) : [];
+    if (digitVariants.length > 0) {
+      // The shortest variant's trigrams are in every longer variant.
+      const shortest = digitVariants.reduce((a, b) => (b.length < a.length ? b : a));
+      if (shortest.length < 3) return null;
+      add(itemsWithAllTrigrams(index, shortest));
+    }
+  }
+
+  return new Set(Array.from(positions, (position) => index.skus[position]));
+}
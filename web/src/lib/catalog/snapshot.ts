@@ -0,0 +1,100 @@
+import { gunzipSync } from "node:zlib";
+import { createSupabaseAdminClient } from "@/lib/supabase/server";
+import type { SpriteOffset } from "@/lib/types";
+import {
+  LOOKUP_INDEX_SCHEMA_VERSION,
+  type CatalogLookupIndex,
+} from "@/lib/catalog/lookup-index";
+import { compareLinkOrder } from "@/lib/catalog/link-order";
+
+export interface CatalogSnapshotItem {
+  sku: string;
+  name: string;
+  upc: string | null;
+  pack: string | null;
+  category: string;
+  image_storage_path: string;
+  display_order: number | null;
+  sprite_path?: string | null;
+  sprite_offset?: SpriteOffset | null;
+}
+
+interface CatalogSnapshot {
+  schema_version: number;
+  catalog_id: string;
+  items: CatalogSnapshotItem[];
+}
+
+const SNAPSHOT_BUCKET = "catalog-snapshots";
+const SNAPSHOT_SCHEMA_VERSION = 1;
+const MAX_CACHED_DOCUMENTS = 50;
+
+// Snapshot paths are content-addressed, so a cached entry never goes stale;
+// an edited catalog gets a new path.
+const cache = new Map<string, unknown>();
+
+async function loadGzipJson<T extends { schema_version: number }>(
+  path: string,
+  schemaVersion: number,
+): Promise<T | null> {
+  const cached = cache.get(path);
+  if (cached) return cached as T;
+
+  const admin = createSupabaseAdminClient();
+  const { data, error } = await admin.storage.from(SNAPSHOT_BUCKET).download(path);
+  if (error || !data) return null;
+
+  try {
+    const compressed = Buffer.from(await data.arrayBuffer());
+    const document = JSON.parse(gunzipSync(compressed).toString("utf8")) as T;
+    if (document.schema_version !== schemaVersion) return null;
+
+    if (cache.size >= MAX_CACHED_DOCUMENTS) {
+      const oldest = cache.keys().next().value;
+      if (oldest !== undefined) cache.delete(oldest);
+    }
+    cache.set(path, document);
+    return document;
+  } catch {
+    return null;
+  }
+}
+
+export async function loadCatalogSnapshot(
+  path: string | null | undefined,
+): Promise<CatalogSnapshotItem[] | null> {
+  if (!path) return null;
+  const snapshot = await loadGzipJson<CatalogSnapshot>(path, SNAPSHOT_SCHEMA_VERSION);
+  return snapshot?.items ?? null;
+}
+
+const CATALOG_ITEM_COLUMNS =
+  "sku,name,upc,pack,category,image_storage_path,display_order,sprite_path,sprite_offset";
+
+// A customer link's items in link-page order: the snapshot when the catalog has
+// one, otherwise the catalog_items query (never written, or invalidated by an edit).
+export async function loadCatalogItems(
+  catalogId: string,
+  snapshotPath: string | null | undefined,
+): Promise<{ items: CatalogSnapshotItem[]; error: string | null }> {
+  const snapshotItems = await loadCatalogSnapshot(snapshotPath);
+  if (snapshotItems) return { items: snapshotItems, error: null };
+
+  const admin = createSupabaseAdminClient();
+  const { data, error } = await admin
+    .from("catalog_items")
+    .select(CATALOG_ITEM_COLUMNS)
+    .eq("catalog_id", catalogId);
+  // Sorted here rather than by the query, whose text order follows the database collation.
+  const items = ((data ?? []) as CatalogSnapshotItem[]).sort(compareLinkOrder);
+  return { items, error: error?.message ?? null };
+}
+
+// The worker uploads the lookup index next to the snapshot it was built with.
+export async function loadCatalogLookupIndex(
+  snapshotPath: string | null | undefined,
+): Promise<CatalogLookupIndex | null> {
+  if (!snapshotPath) return null;
+  const path = snapshotPath.replace(/\.json\.gz$/, ".index.json.gz");
+  return loadGzipJson<CatalogLookupIndex>(path, LOOKUP_INDEX_SCHEMA_VERSION);
+}
@@ -111,6 +111,22 @@ describe("classifyParserHealth", () => {
     expect(health.canRetry).toBe(true);
   });
 
+  it("points a duplicate upload at the catalog parsed instead", () => {
+    const health = classifyParserHealth(
+      catalog({
+        parse_status: "superseded",
+        parse_summary: { message: "The same PDF was uploaded again as catalog c2." },
+      }),
+      parserJob({ status: "superseded" }),
+      { now },
+    );
+
+    expect(health.kind).toBe("superseded");
+    expect(health.message).toBe("The same PDF was uploaded again as catalog c2.");
+    expect(health.nextAction).toBe("none");
+    expect(health.canRetry).toBe(false);
+  });
+
   it("marks complete catalogs ready for review", () => {
     const health = classifyParserHealth(
       catalog({ parse_status: "needs_review", parse_summary: { progress_percent: 100 } }),
@@ -6,12 +6,14 @@ export type ParserHealthKind =
   | "processing"
   | "stalled_processing"
   | "failed"
+  | "superseded"
   | "ready_for_review";
 
 export type ParserNextAction =
   | "wait_for_parser"
   | "retry_trigger"
-  | "review_catalog";
+  | "review_catalog"
+  | "none";
 
 export interface ParserHealth {
   kind: ParserHealthKind;
@@ -61,6 +63,18 @@ export function classifyParserHealth(
     fallbackProgress,
   );
 
+  if (catalog.parse_status === "superseded") {
+    return {
+      kind: "superseded",
+      label: "Duplicate upload",
+      badge: "complete",
+      message: String(summary.message ?? "The same PDF was uploaded again as another catalog."),
+      progressPercent,
+      nextAction: "none",
+      canRetry: false,
+    };
+  }
+
   if (catalog.parse_status === "failed" || parserJob?.status === "failed" || failedItems > 0) {
     return {
       kind: "failed",
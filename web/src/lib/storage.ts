@@ -1,4 +1,5 @@
 import { createSupabaseAdminClient } from "@/lib/supabase/server";
+import type { ProductSprite, SpriteOffset } from "@/lib/types";
 
 export function getPublicProductImageUrl(path: string) {
   const supabase = createSupabaseAdminClient();
@@ -6,6 +7,22 @@ export function getPublicProductImageUrl(path: string) {
   return data.publicUrl;
 }
 
+export function getProductSprite(
+  path: string | null | undefined,
+  offset: SpriteOffset | null | undefined,
+): ProductSprite | null {
+  if (!path || !offset) return null;
+  return {
+    url: getPublicProductImageUrl(path),
+    x: offset.x,
+    y: offset.y,
+    width: offset.w,
+    height: offset.h,
+    sheetWidth: offset.sheet_w,
+    sheetHeight: offset.sheet_h,
+  };
+}
+
 export async function uploadOrderCsv(args: {
   orderId: string;
   csv: string;
@@ -5,9 +5,10 @@ export type ParseStatus =
   | "processing"
   | "needs_review"
   | "failed"
-  | "complete";
+  | "complete"
+  | "superseded";
 
-export type ParserJobStatus = "queued" | "processing" | "success" | "failed";
+export type ParserJobStatus = "queued" | "processing" | "success" | "failed" | "superseded";
 
 export interface Profile {
   user_id: string;
@@ -27,10 +28,22 @@ export interface Catalog {
   published_at: string | null;
   baseline_catalog_id?: string | null;
   pdf_sha256?: string | null;
+  snapshot_path?: string | null;
+  snapshot_sha256?: string | null;
   deleted_at?: string | null;
   deleted_by?: string | null;
 }
 
+// Written by the parser worker: the item's cell in sprites/<sha256>.webp.
+export interface SpriteOffset {
+  x: number;
+  y: number;
+  w: number;
+  h: number;
+  sheet_w: number;
+  sheet_h: number;
+}
+
 export interface CatalogItem {
   id: string;
   catalog_id: string;
@@ -40,6 +53,8 @@ export interface CatalogItem {
   pack: string | null;
   category: string;
   image_storage_path: string;
+  sprite_path?: string | null;
+  sprite_offset?: SpriteOffset | null;
   parse_issues: string[];
   approved: boolean;
   signature?: string;
@@ -109,6 +124,9 @@ export interface ParserJob {
   progress_label?: string;
   parsed_pages?: number | null;
   total_pages?: number | null;
+  eta_seconds?: number | null;
+  fits_run_budget?: boolean | null;
+  superseded_by_job_id?: string | null;
 }
 
 export interface CatalogDeal {
@@ -129,6 +147,17 @@ export interface DealForOrder {
   ends_at: string;
 }
 
+// One product's cell in its page's sprite sheet, in sheet pixels.
+export interface ProductSprite {
+  url: string;
+  x: number;
+  y: number;
+  width: number;
+  height: number;
+  sheetWidth: number;
+  sheetHeight: number;
+}
+
 export interface ProductForOrder {
   sku: string;
   name: string;
@@ -136,6 +165,7 @@ export interface ProductForOrder {
   pack: string;
   category: string;
   imageUrl: string;
+  sprite?: ProductSprite | null;
   displayOrder: number;
   deals: DealForOrder[];
 }